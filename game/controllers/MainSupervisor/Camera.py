@@ -3,13 +3,16 @@ from __future__ import annotations
 from enum import Enum
 
 from controller import Node
+from FieldCache import FieldCache
 from Robot import Robot
 
-from typing import Sequence
-from typing import TYPE_CHECKING
+import numpy as np
+import numpy.typing as npt
+
+from typing import Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from Victim import VictimObject
+    from Victim import SignGeometry
 
 
 class FollowSide(Enum):
@@ -19,6 +22,100 @@ class FollowSide(Enum):
     LEFT = 4
 
 
+class SideRaster:
+    """Precomputed lookup raster of the side the automatic camera should
+    face, for every position in the arena.
+
+    Each cell holds the `FollowSide` value of the closest sign (victim or
+    hazard) within range of the cell's center that faces it, or 0 if no sign
+    is in range (i.e. the camera side shouldn't change). Only the area
+    around the signs is rasterised, anything outside it is out of range of
+    every sign.
+
+    Facing is checked in the horizontal plane (as if the robot were at the
+    height of each sign), so a lookup only depends on the robot's x, z
+    position.
+    """
+
+    # Camera side is left unchanged
+    NO_CHANGE: int = 0
+
+    def __init__(
+        self,
+        signs: SignGeometry,
+        radius: float = 0.20,
+        resolution: float = 0.01
+    ):
+        """Builds the side raster for a group of signs
+
+        Args:
+            signs (SignGeometry): Geometry of the victims/hazards to be
+            candidates to face towards
+            radius (float, optional): Distance a sign is faced from. Defaults
+            to 0.20.
+            resolution (float, optional): Raster cell size, in meters.
+            Defaults to 0.01.
+        """
+        self.resolution: float = resolution
+        self.origin: npt.NDArray = np.zeros(2)
+        self.raster: npt.NDArray = np.zeros((0, 0), dtype=np.int8)
+
+        if len(signs.signs) == 0:
+            return
+
+        planar: npt.NDArray = signs.positions[:, [0, 2]]
+        self.origin = planar.min(axis=0) - radius
+        shape: npt.NDArray = np.ceil(
+            (planar.max(axis=0) + radius - self.origin) / resolution
+        ).astype(int) + 1
+        self.raster = np.zeros(shape, dtype=np.int8)
+        closest: npt.NDArray = np.full(shape, np.inf)
+
+        sides: list[int] = [s.get_side().value for s in signs.signs]
+        window: int = int(np.ceil(radius / resolution)) + 1
+        for i, (pos, normal) in enumerate(zip(planar, signs.normals)):
+            # Cells within the window around the sign
+            cell: npt.NDArray = np.floor(
+                (pos - self.origin) / resolution).astype(int)
+            lo: npt.NDArray = np.maximum(cell - window, 0)
+            hi: npt.NDArray = np.minimum(cell + window + 1, shape)
+            xs: npt.NDArray = (self.origin[0] +
+                               (np.arange(lo[0], hi[0]) + 0.5) * resolution)
+            zs: npt.NDArray = (self.origin[1] +
+                               (np.arange(lo[1], hi[1]) + 0.5) * resolution)
+            dx: npt.NDArray = xs[:, None] - pos[0]
+            dz: npt.NDArray = zs[None, :] - pos[1]
+
+            distances: npt.NDArray = np.sqrt(dx**2 + dz**2)
+            facing: npt.NDArray = normal[0] * dx + normal[2] * dz > 0
+            # Earlier signs win ties, as with a stable sort by distance
+            nearer: npt.NDArray = ((distances <= radius) & facing &
+                                   (distances < closest[lo[0]:hi[0],
+                                                        lo[1]:hi[1]]))
+            closest[lo[0]:hi[0], lo[1]:hi[1]][nearer] = distances[nearer]
+            self.raster[lo[0]:hi[0], lo[1]:hi[1]][nearer] = sides[i]
+
+    def lookup(self, pos: list[float]) -> Optional[FollowSide]:
+        """Gets the side the camera should face at a position
+
+        Args:
+            pos (list[float]): Position to look up (e.g. the robot's)
+
+        Returns:
+            Optional[FollowSide]: Side to face, or None if the camera side
+            shouldn't change
+        """
+        x: int = int((pos[0] - self.origin[0]) // self.resolution)
+        z: int = int((pos[2] - self.origin[1]) // self.resolution)
+        if not (0 <= x < self.raster.shape[0] and
+                0 <= z < self.raster.shape[1]):
+            return None
+        side: int = int(self.raster[x, z])
+        if side == SideRaster.NO_CHANGE:
+            return None
+        return FollowSide(side)
+
+
 class Camera():
     """Camera class used to update view point angles for automatic camera
         movement
@@ -31,6 +128,7 @@ class Camera():
     ) -> None:
         self.wb_viewpoint_node: Node = node
         self.side: FollowSide = side
+        self._fields: FieldCache = FieldCache(node)
 
     def set_view_point(self, robot: Robot) -> None:
         """Set view point (camera) angle depending on robot position.
@@ -71,8 +169,8 @@ class Camera():
         else:
             return
         # Set position and rotation of camera
-        self.wb_viewpoint_node.getField('position').setSFVec3f(vp)
-        self.wb_viewpoint_node.getField('orientation').setSFRotation(vo)
+        self._fields.field('position').setSFVec3f(vp)
+        self._fields.field('orientation').setSFRotation(vo)
 
     def follow(self, follow_point: Robot, name: str) -> None:
         """Set the game camera to follow a robot, automatically
@@ -82,7 +180,7 @@ class Camera():
             follow_point (Robot): Simulation robot to follow 
             name (str): Webots robot node name
         """
-        self.wb_viewpoint_node.getField('follow').setSFString(name)
+        self._fields.set('follow', 'SFString', name)
         self.set_view_point(follow_point)
 
     def _update_view(self, side: FollowSide, follow_point: Robot) -> None:
@@ -100,27 +198,15 @@ class Camera():
     def rotate_to_victim(
         self,
         follow_point: Robot,
-        victim_list: Sequence[VictimObject]
+        sides: SideRaster
     ) -> None:
         """Orients the camera to face the closest victim to the follow point
 
         Args:
             follow_point (Robot): Simulation robot to rotate the camera around
-            victim_list (Sequence[VictimObject]): Sequence of VictimObjects
-            to be candidates to face towards
+            sides (SideRaster): Precomputed sides to face, from the
+            victims/hazards to be candidates to face towards
         """
-
-        near_victims: Sequence[VictimObject] = [
-            h for h in victim_list
-            if h.check_position(follow_point.position, 0.20) and
-            h.on_same_side(follow_point)
-        ]
-
-        if len(near_victims) > 0:
-            if (len(near_victims) > 1):
-                # Sort by closest
-                near_victims.sort(
-                    key=lambda v: v.get_distance(follow_point.position)
-                )
-            side: FollowSide = near_victims[0].get_side()
+        side: Optional[FollowSide] = sides.lookup(follow_point.position)
+        if side is not None:
             self._update_view(side, follow_point)
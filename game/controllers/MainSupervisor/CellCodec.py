@@ -0,0 +1,247 @@
+"""Compact integer encoding of Erebus map matrix cells"""
+
+from typing import Optional
+from typing import Union
+
+import numpy as np
+import numpy.typing as npt
+
+
+class CellCodec:
+    """Converts Erebus map matrix cells between their string form (e.g. '1',
+    'b', 'HU') and a compact uint16 code.
+
+    Each map feature is a single bit, so cells holding multiple signs are a
+    bitwise OR of their features. Victims given in either order (e.g. 'HU' and
+    'UH') therefore encode to the same value, and cells can be compared with
+    plain equality. Room connection tiles are the OR of the two room bits
+    they connect, and room 4 area tiles ('*') are the room 4 bit alone.
+
+    Cells that can't be represented by feature bits (e.g. repeated victims
+    like 'HH', three or more signs, or unknown values) are given escape codes
+    from the top of the uint16 range. Escape codes are allocated per codec
+    instance, so matrices that are compared must be encoded with the same
+    codec.
+    """
+
+    EMPTY: int = 0
+    WALL: int = 1 << 0
+    HOLE: int = 1 << 1
+    SWAMP: int = 1 << 2
+    CHECKPOINT: int = 1 << 3
+    START: int = 1 << 4
+    ROOM_1: int = 1 << 5
+    ROOM_2: int = 1 << 6
+    ROOM_3: int = 1 << 7
+    ROOM_4: int = 1 << 8
+    VICTIM_H: int = 1 << 9
+    VICTIM_U: int = 1 << 10
+    VICTIM_S: int = 1 << 11
+    HAZARD_F: int = 1 << 12
+    HAZARD_P: int = 1 << 13
+    HAZARD_C: int = 1 << 14
+    HAZARD_O: int = 1 << 15
+
+    ROOMS: int = ROOM_1 | ROOM_2 | ROOM_3 | ROOM_4
+
+    # Legacy room 4 marker ('20'), ignored when scoring
+    LEGACY_ROOM_4: int = 0xFFFF
+    # Code used for cells that couldn't be given an escape code
+    UNMATCHED: int = 0xFF00
+
+    # Escape codes are allocated downwards from here. No two feature cell
+    # combination can reach this range
+    _ESCAPE_START: int = 0xFFFE
+
+    _CELLS: dict[str, int] = {
+        '0': EMPTY,
+        '1': WALL,
+        '2': HOLE,
+        '3': SWAMP,
+        '4': CHECKPOINT,
+        '5': START,
+        'b': ROOM_1 | ROOM_2,
+        'y': ROOM_1 | ROOM_3,
+        'g': ROOM_1 | ROOM_4,
+        'p': ROOM_2 | ROOM_3,
+        'o': ROOM_2 | ROOM_4,
+        'r': ROOM_3 | ROOM_4,
+        '*': ROOM_4,
+        'H': VICTIM_H,
+        'U': VICTIM_U,
+        'S': VICTIM_S,
+        'F': HAZARD_F,
+        'P': HAZARD_P,
+        'C': HAZARD_C,
+        'O': HAZARD_O,
+    }
+
+    _CODES: dict[int, str] = {code: cell for cell, code in _CELLS.items()}
+
+    # Single char cell codes by ascii code point, -1 for unknown chars
+    _ASCII: npt.NDArray = np.full(128, -1, dtype=np.int32)
+    _ASCII[[ord(cell) for cell in _CELLS]] = list(_CELLS.values())
+
+    def __init__(self):
+        self._escapes: dict[str, int] = {}
+        self._escape_cells: dict[int, str] = {}
+
+    @staticmethod
+    def _canonical(cell: str) -> str:
+        """Gets the key used to look up a cell. Two char cells are equal in
+        either order, so their chars are sorted.
+        """
+        if len(cell) == 2:
+            return ''.join(sorted(cell))
+        return cell
+
+    def encode_cell(self, cell: str) -> int:
+        """Encode a single map matrix cell
+
+        Args:
+            cell (str): Map matrix cell in string form
+
+        Returns:
+            int: Cell code
+        """
+        code: Optional[int] = self._CELLS.get(cell)
+        if code is not None:
+            return code
+
+        key: str = self._canonical(cell)
+        if key == '02':
+            return self.LEGACY_ROOM_4
+
+        # Two distinct features can be OR'd together, as long as the result
+        # is unambiguous (i.e. only one of them uses the room bits)
+        if len(key) == 2 and key[0] != key[1]:
+            a: Optional[int] = self._CELLS.get(key[0])
+            b: Optional[int] = self._CELLS.get(key[1])
+            if a and b and not (a & self.ROOMS and b & self.ROOMS):
+                return a | b
+
+        if key not in self._escapes:
+            code = self._ESCAPE_START - len(self._escapes)
+            if code <= self.UNMATCHED:
+                return self.UNMATCHED
+            self._escapes[key] = code
+            self._escape_cells[code] = cell
+        return self._escapes[key]
+
+    def decode_cell(self, code: int) -> str:
+        """Decode a single cell code to its string form. Cells holding
+        multiple features are decoded in a canonical order, so e.g. 'UH' is
+        decoded as 'HU'.
+
+        Args:
+            code (int): Cell code
+
+        Returns:
+            str: Map matrix cell in string form, '?' for unmatched cells
+        """
+        code = int(code)
+        if code in self._CODES:
+            return self._CODES[code]
+        if code == self.LEGACY_ROOM_4:
+            return '20'
+        if code in self._escape_cells:
+            return self._escape_cells[code]
+        if code == self.UNMATCHED:
+            return '?'
+
+        cell: str = ''
+        rooms: int = code & self.ROOMS
+        if rooms:
+            cell += self._CODES[rooms]
+        for bit in range(16):
+            feature: int = code & ~self.ROOMS & (1 << bit)
+            if feature:
+                cell += self._CODES[feature]
+        return cell
+
+    def encode(self, matrix: Union[list, npt.NDArray]) -> npt.NDArray:
+        """Encode a map matrix. Single char cells are looked up by their code
+        point, and every other distinct cell value is only encoded once.
+
+        Args:
+            matrix (Union[list, npt.NDArray]): Map matrix in string form
+
+        Returns:
+            npt.NDArray: uint16 matrix of cell codes, the same shape as the
+            input matrix
+        """
+        cells: npt.NDArray = np.ascontiguousarray(matrix, dtype=str)
+        codes: npt.NDArray = np.empty(cells.shape, dtype=np.uint16)
+        if cells.size == 0:
+            return codes
+
+        # View each cell as its unicode code points
+        points: npt.NDArray = cells.view(np.uint32).reshape(*cells.shape, -1)
+        first: npt.NDArray = points[..., 0]
+        single: npt.NDArray = (first < len(self._ASCII)) & (first != 0)
+        if points.shape[-1] > 1:
+            single &= ~points[..., 1:].any(axis=-1)
+        single_codes: npt.NDArray = self._ASCII[first[single]]
+        codes[single] = single_codes
+
+        # Anything else (multi sign or unknown cells) is encoded per value
+        rest: npt.NDArray = ~single
+        rest[single] = single_codes < 0
+        if rest.any():
+            values, inverse = np.unique(cells[rest], return_inverse=True)
+            value_codes: npt.NDArray = np.array(
+                [self.encode_cell(v) for v in values], dtype=np.uint16)
+            codes[rest] = value_codes[inverse.ravel()]
+        return codes
+
+    def decode(self, codes: npt.NDArray) -> npt.NDArray:
+        """Decode a matrix of cell codes back to its string form
+
+        Args:
+            codes (npt.NDArray): Matrix of cell codes
+
+        Returns:
+            npt.NDArray: Map matrix in string form
+        """
+        codes = np.asarray(codes)
+        values, inverse = np.unique(codes, return_inverse=True)
+        cells: npt.NDArray = np.array([self.decode_cell(v) for v in values],
+                                      dtype=str)
+        return cells[inverse].reshape(codes.shape)
+
+    def features(self, codes: npt.NDArray) -> npt.NDArray:
+        """Gets the feature bits held by each cell code. Escaped cells are
+        given the OR of their (known) chars' features, and the legacy room 4
+        marker and unmatched cells hold no features.
+
+        Args:
+            codes (npt.NDArray): Cell codes
+
+        Returns:
+            npt.NDArray: uint16 feature bits of each cell code
+        """
+        codes = np.asarray(codes, dtype=np.uint16)
+        features: npt.NDArray = np.where(codes < self.UNMATCHED, codes, 0)
+        features = features.astype(np.uint16)
+        for code, cell in self._escape_cells.items():
+            bits: int = 0
+            for c in cell:
+                bits |= self._CELLS.get(c, 0)
+            features[codes == code] = bits
+        return features
+
+    def isdigit(self, codes: npt.NDArray) -> npt.NDArray:
+        """Gets which cell codes represent a purely numeric cell (e.g. '0',
+        '1', '20'), the equivalent of `str.isdigit` on the string form
+
+        Args:
+            codes (npt.NDArray): Matrix of cell codes
+
+        Returns:
+            npt.NDArray: Boolean mask of numeric cells
+        """
+        digits: list[int] = [self._CELLS[str(i)] for i in range(6)]
+        digits += [self.LEGACY_ROOM_4]
+        digits += [code for code, cell in self._escape_cells.items()
+                   if cell.isdigit()]
+        return np.isin(codes, digits)
@@ -1,10 +1,40 @@
-from typing import Optional
+import atexit
+import os
+import sys
+import time
+
+from threading import Lock
+from typing import Any, Callable, Optional, Union
 
 class Console:
     """Simple helper class to print formatted Erebus text to the console
+
+    Output is buffered in memory and written in batches, either once the
+    buffer is full, once `FLUSH_INTERVAL` has passed (checked on each log and
+    each `Console.poll`), or immediately for errors. Colour codes are only
+    written if the output is a terminal or the Webots console, and messages
+    below `Console.LEVEL` are dropped.
     """
     DEBUG_MODE: bool = False
 
+    # Log levels
+    LEVEL_DEBUG: int = 10
+    LEVEL_INFO: int = 20
+    LEVEL_WARN: int = 30
+    LEVEL_ERROR: int = 40
+
+    # Minimum level of messages displayed. Debug messages also need
+    # DEBUG_MODE enabled
+    LEVEL: int = LEVEL_DEBUG
+
+    # Maximum number of buffered chars before the buffer is flushed
+    BUFFER_SIZE: int = 16384
+    # Maximum time (in seconds) output is buffered for
+    FLUSH_INTERVAL: float = 0.1
+
+    # Whether colour codes are written, None to detect from the output
+    COLOR: Optional[bool] = None
+
     _PREFIX_DEBUG: str = "EREBUS DEBUG"
     _PREFIX_PASS: str = "EREBUS PASS"
     _PREFIX_FAIL: str = "EREBUS FAIL"
@@ -41,6 +71,12 @@ class Console:
 
     _COLOR_CODE_PREFIX: str = "\033"
     _RESET: str = "\033[0m"
+
+    _detected_color: Optional[bool] = None
+    _buffer: list[str] = []
+    _buffered: int = 0
+    _last_flush: float = time.monotonic()
+    _lock: Lock = Lock()
     
     @staticmethod
     def update_debug_mode(state: bool) -> None:
@@ -57,6 +93,16 @@ class Console:
         else:
             Console.log_warn("Erebus debug logging disabled")
 
+    @staticmethod
+    def debug_enabled() -> bool:
+        """Returns whether debug logging is enabled. Used to skip building
+        debug only output (e.g. diagnostic loops) when it won't be displayed.
+
+        Returns:
+            bool: True if debug logging is enabled
+        """
+        return Console.DEBUG_MODE
+
     @staticmethod
     def log_err(msg: str, sep: Optional[str] = "\n", end = "\n") -> None:
         """Log error messages, displayed in red.
@@ -71,7 +117,8 @@ class Console:
             end (str, optional): String appended to the last value. 
             Defaults to "\\n".
         """
-        Console._log(Console._PREFIX_ERROR, msg, Console._COLOR_ERROR, sep, end)
+        Console._log(Console.LEVEL_ERROR, Console._PREFIX_ERROR, msg,
+                     Console._COLOR_ERROR, sep, end)
 
     @staticmethod
     def log_fail(msg: str, sep: Optional[str] = "\n", end = "\n") -> None:
@@ -87,7 +134,8 @@ class Console:
             end (str, optional): String appended to the last value. 
             Defaults to "\\n".
         """
-        Console._log(Console._PREFIX_FAIL, msg, Console._COLOR_ERROR, sep, end)
+        Console._log(Console.LEVEL_ERROR, Console._PREFIX_FAIL, msg,
+                     Console._COLOR_ERROR, sep, end)
 
     @staticmethod
     def log_pass(msg: str, sep: Optional[str] = "\n", end = "\n") -> None:
@@ -103,7 +151,8 @@ class Console:
             end (str, optional): String appended to the last value. 
             Defaults to "\\n".
         """
-        Console._log(Console._PREFIX_PASS, msg, Console._COLOR_SUCC, sep, end)
+        Console._log(Console.LEVEL_INFO, Console._PREFIX_PASS, msg,
+                     Console._COLOR_SUCC, sep, end)
 
     @staticmethod
     def log_succ(msg: str, sep: Optional[str] = "\n", end = "\n") -> None:
@@ -119,7 +168,8 @@ class Console:
             end (str, optional): String appended to the last value. 
             Defaults to "\\n".
         """
-        Console._log(Console._PREFIX_SUCC, msg, Console._COLOR_SUCC, sep, end)
+        Console._log(Console.LEVEL_INFO, Console._PREFIX_SUCC, msg,
+                     Console._COLOR_SUCC, sep, end)
 
     @staticmethod
     def log_warn(msg: str, sep: Optional[str] = "\n", end = "\n") -> None:
@@ -135,7 +185,8 @@ class Console:
             end (str, optional): String appended to the last value. 
             Defaults to "\\n".
         """
-        Console._log(Console._PREFIX_WARN, msg, Console._COLOR_WARN, sep, end)
+        Console._log(Console.LEVEL_WARN, Console._PREFIX_WARN, msg,
+                     Console._COLOR_WARN, sep, end)
 
     @staticmethod
     def log_info(msg: str, sep: Optional[str] = "\n", end = "\n") -> None:
@@ -151,7 +202,8 @@ class Console:
             end (str, optional): String appended to the last value. 
             Defaults to "\\n".
         """
-        Console._log(Console._PREFIX_INFO, msg, Console._COLOR_INFO, sep, end)
+        Console._log(Console.LEVEL_INFO, Console._PREFIX_INFO, msg,
+                     Console._COLOR_INFO, sep, end)
 
     @staticmethod
     def log_controller(msg: str, sep: Optional[str] = "\n", end = "\n") -> None:
@@ -169,31 +221,111 @@ class Console:
             end (str, optional): String appended to the last value. 
             Defaults to "\\n".
         """
-        Console._log(Console._PREFIX_CONTROLLER, msg.strip(), 
-                     Console._COLOR_CONTROLLER, sep, end)
+        Console._log(Console.LEVEL_INFO, Console._PREFIX_CONTROLLER,
+                     msg.strip(), Console._COLOR_CONTROLLER, sep, end)
 
     @staticmethod
-    def log_debug(msg: str, sep: Optional[str] = "\n", end = "\n") -> None:
+    def log_debug(
+        msg: Union[str, Callable[[], str]],
+        *args: Any,
+        sep: Optional[str] = "\n",
+        end = "\n"
+    ) -> None:
         """Log debug messages, displayed in yellow. 
 
-        These are only displayed if debug logging is enabled.
+        These are only displayed if debug logging is enabled. The message is
+        only formatted when it is displayed, so pass any values as deferred
+        args (or the message as a callable), rather than formatting it first.
 
-        Example output: [EREBUS WARNING] We're warning you!
+        Unlike the other log functions, `sep` and `end` are keyword only, as
+        any other positional args are formatted into the message.
+
+        Example output: [EREBUS DEBUG] Received 3 packets
+
+        Example usage:
+            Console.log_debug("Received %d packets", count)
+            Console.log_debug(lambda: f"Stopped for {robot.time_stopped()}s")
 
         Args:
-            msg (str): Message to display
+            msg (Union[str, Callable[[], str]]): Message to display, a
+            %-style format string if args are given, or a callable returning
+            the message
+            *args (Any): Values formatted into the message
             sep (Optional[str], optional): Separator used to split the message. If
             the value is None, separations are ignored.
             Defaults to "\\n".
             end (str, optional): String appended to the last value. 
             Defaults to "\\n".
         """
-        if Console.DEBUG_MODE:
-            Console._log(Console._PREFIX_DEBUG, msg, Console._COLOR_DEBUG, 
-                         sep, end)
+        if not Console.DEBUG_MODE:
+            return
+        if callable(msg):
+            msg = msg()
+        elif args:
+            msg = msg % args
+        Console._log(Console.LEVEL_DEBUG, Console._PREFIX_DEBUG, msg,
+                     Console._COLOR_DEBUG, sep, end)
+
+    @staticmethod
+    def set_level(level: int) -> None:
+        """Sets the minimum level of messages displayed
+
+        Args:
+            level (int): Minimum log level (e.g. `Console.LEVEL_WARN`)
+        """
+        Console.LEVEL = level
+
+    @staticmethod
+    def _use_color() -> bool:
+        """Returns whether colour codes should be written to stdout. The
+        Webots console displays colour codes, even though it isn't a terminal.
+        """
+        if Console.COLOR is not None:
+            return Console.COLOR
+        if Console._detected_color is None:
+            try:
+                is_tty: bool = sys.stdout.isatty()
+            except (AttributeError, ValueError):
+                is_tty = False
+            Console._detected_color = "NO_COLOR" not in os.environ and (
+                is_tty or "WEBOTS_HOME" in os.environ)
+        return Console._detected_color
+
+    @staticmethod
+    def flush() -> None:
+        """Writes all buffered output
+        """
+        with Console._lock:
+            Console._flush()
+
+    @staticmethod
+    def poll() -> None:
+        """Writes buffered output if it has been buffered for longer than the
+        flush interval. Should be called regularly (e.g. every simulation
+        step), so output isn't held back while nothing is being logged.
+        """
+        if (Console._buffered and
+                time.monotonic() - Console._last_flush >= Console.FLUSH_INTERVAL):
+            Console.flush()
+
+    @staticmethod
+    def _flush() -> None:
+        Console._last_flush = time.monotonic()
+        if not Console._buffer:
+            return
+        text: str = ''.join(Console._buffer)
+        Console._buffer.clear()
+        Console._buffered = 0
+        try:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+        except (OSError, ValueError):
+            # Output closed (e.g. at interpreter shutdown)
+            pass
 
     @staticmethod
     def _log(
+        level: int,
         prefix: str, 
         msg: str, 
         color: str,
@@ -201,22 +333,41 @@ class Console:
         end: str
     ) -> None:
         """Log messages, with a specified prefix and color. Lines are separated
-        into individual prints via the separator
+        via the separator, and are buffered to be written together.
 
         Example output: [EREBUS WARNING] We're warning you!
 
         Args:
+            level (int): Log level of the message
             msg (str): Message to display
             sep (Optional[str]): Separator used to split the message. If
             the value is None, separations are ignored.
             end (str): String appended to the last value.
         """
+        if level < Console.LEVEL:
+            return
         if sep is None:
             lines: list[str] = [msg]
         else:
             lines: list[str] = msg.split(sep)
-        for line in lines:
-            # TODO remove colour prefix for stdout isn't a terminal...
-            print(
-                f"{Console._COLOR_CODE_PREFIX}[{Console._COLORS[color]}m[{prefix}] {line}{Console._RESET}",
-                end=end)
+
+        if Console._use_color():
+            start: str = (f"{Console._COLOR_CODE_PREFIX}"
+                          f"[{Console._COLORS[color]}m[{prefix}] ")
+            stop: str = f"{Console._RESET}{end}"
+        else:
+            start = f"[{prefix}] "
+            stop = end
+        text: str = ''.join(f"{start}{line}{stop}" for line in lines)
+
+        with Console._lock:
+            Console._buffer.append(text)
+            Console._buffered += len(text)
+            if (level >= Console.LEVEL_ERROR or
+                    Console._buffered >= Console.BUFFER_SIZE or
+                    time.monotonic() - Console._last_flush >=
+                    Console.FLUSH_INTERVAL):
+                Console._flush()
+
+
+atexit.register(Console.flush)
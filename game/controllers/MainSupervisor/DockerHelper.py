@@ -138,5 +138,5 @@ def print_stdout(out) -> None:
         out (IO[bytes]): Popen subprocess stdout bytes buffer
     """
     for line in iter(out.readline, b''):
-        print(line.decode())
+        Console.log_controller(line.decode(errors="replace"), sep=None)
     out.close()
\ No newline at end of file
@@ -0,0 +1,237 @@
+"""Structured match event logs. Every scoring event of a match is written as
+a JSON Lines record to `logs/events/<log name>.jsonl`, along with a small
+`<log name>.summary.json` index of the match. The index is written when the
+match starts, so the world and robot of every match are known, and is
+completed when it ends.
+
+Event logs can be aggregated across many matches without loading them all
+into memory, using the completed summary indexes where available and
+streaming the event records of matches that didn't finish (e.g. a killed
+supervisor).
+
+Example:
+    python EventLog.py ../../logs/events -o results.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+
+from enum import Enum
+from typing import Any, Iterable, Iterator, Optional, TextIO
+
+# Version of the event record and summary layout
+VERSION: int = 1
+
+EVENTS_EXT: str = ".jsonl"
+SUMMARY_EXT: str = ".summary.json"
+
+
+class EventKind(Enum):
+    """Kinds of scoring event"""
+    CHECKPOINT = "checkpoint"
+    VICTIM = "victim"
+    VICTIM_TYPE = "victim type"
+    HAZARD = "hazard"
+    HAZARD_TYPE = "hazard type"
+    MISIDENTIFICATION = "misidentification"
+    LACK_OF_PROGRESS = "lack of progress"
+    MAP_BONUS = "map bonus"
+    EXIT_BONUS = "exit bonus"
+    OTHER = "other"
+
+
+def create_summary(
+    world: str,
+    robot: str,
+    max_time: int,
+    start_time: str
+) -> dict[str, Any]:
+    """Creates an empty match summary
+
+    Args:
+        world (str): World name
+        robot (str): Robot (team) name
+        max_time (int): World max game time, in seconds
+        start_time (str): ISO format wall clock time the match started
+
+    Returns:
+        dict[str, Any]: Match summary
+    """
+    return {
+        "version": VERSION,
+        "world": world,
+        "robot": robot,
+        "max_time": max_time,
+        "start_time": start_time,
+        "end_time": None,
+        "complete": False,
+        "score": 0.0,
+        "sim_time": 0.0,
+        "real_time": 0.0,
+        "events": 0,
+        "counts": {},
+        "points": {},
+    }
+
+
+def update_summary(summary: dict[str, Any], record: dict[str, Any]) -> None:
+    """Adds an event record to a match summary
+
+    Args:
+        summary (dict[str, Any]): Match summary to update
+        record (dict[str, Any]): Event record
+    """
+    kind: str = record["kind"]
+    summary["events"] += 1
+    summary["counts"][kind] = summary["counts"].get(kind, 0) + 1
+    summary["points"][kind] = round(
+        summary["points"].get(kind, 0.0) + record["points"], 2)
+    summary["score"] = record["score"]
+    summary["sim_time"] = record["sim_time"]
+    summary["real_time"] = record["real_time"]
+
+
+def iter_events(path: str) -> Iterator[dict[str, Any]]:
+    """Streams the event records of a match event log. A partially written
+    last line (e.g. from a killed supervisor) is skipped.
+
+    Args:
+        path (str): Event log (.jsonl) path
+
+    Yields:
+        Iterator[dict[str, Any]]: Event records, in the order they happened
+    """
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def iter_matches(log_dir: str) -> Iterator[dict[str, Any]]:
+    """Streams the summaries of every match in an event log directory. Matches
+    without a completed summary index (that didn't finish) are summarised
+    from their event records, keeping the world, robot and times from their
+    index if there is one.
+
+    Args:
+        log_dir (str): Event log directory
+
+    Yields:
+        Iterator[dict[str, Any]]: Match summary, with its log name
+    """
+    names: set[str] = set()
+    for entry in os.scandir(log_dir):
+        for ext in (EVENTS_EXT, SUMMARY_EXT):
+            if entry.name.endswith(ext):
+                names.add(entry.name[:-len(ext)])
+
+    for name in sorted(names):
+        summary: Optional[dict[str, Any]] = None
+        try:
+            with open(os.path.join(log_dir, name + SUMMARY_EXT), 'r') as f:
+                summary = json.load(f)
+        except (OSError, ValueError):
+            summary = None
+
+        if summary is None or not summary.get("complete"):
+            header: dict[str, Any] = summary or {}
+            summary = create_summary(header.get("world", ""),
+                                     header.get("robot", ""),
+                                     header.get("max_time", 0),
+                                     header.get("start_time", ""))
+            events_path: str = os.path.join(log_dir, name + EVENTS_EXT)
+            if os.path.exists(events_path):
+                for record in iter_events(events_path):
+                    update_summary(summary, record)
+        summary["name"] = name
+        yield summary
+
+
+def aggregate(matches: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """Aggregates match summaries, in a single pass
+
+    Args:
+        matches (Iterable[dict[str, Any]]): Match summaries
+
+    Returns:
+        dict[str, Any]: Number of matches (and complete matches), score
+        statistics, and event counts and points by kind, overall and by
+        world
+    """
+    result: dict[str, Any] = {"matches": 0, "complete": 0, "worlds": {}}
+
+    def add(totals: dict[str, Any], match: dict[str, Any]) -> None:
+        totals["matches"] = totals.get("matches", 0) + 1
+        totals["total_score"] = round(
+            totals.get("total_score", 0.0) + match["score"], 2)
+        totals["max_score"] = max(totals.get("max_score", match["score"]),
+                                  match["score"])
+        for key in ("counts", "points"):
+            values: dict[str, float] = totals.setdefault(key, {})
+            for kind, value in match[key].items():
+                values[kind] = round(values.get(kind, 0) + value, 2)
+
+    for match in matches:
+        add(result, match)
+        result["complete"] += bool(match.get("complete"))
+        add(result["worlds"].setdefault(match.get("world") or "unknown", {}),
+            match)
+
+    for totals in [result, *result["worlds"].values()]:
+        if totals.get("matches"):
+            totals["mean_score"] = round(
+                totals["total_score"] / totals["matches"], 2)
+    return result
+
+
+def write_matches(matches: Iterable[dict[str, Any]], out: TextIO) -> int:
+    """Streams match summaries to a file as JSON Lines
+
+    Args:
+        matches (Iterable[dict[str, Any]]): Match summaries
+        out (TextIO): Output file
+
+    Returns:
+        int: Number of matches written
+    """
+    count: int = 0
+    for match in matches:
+        out.write(json.dumps(match) + '\n')
+        count += 1
+    return count
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Aggregate Erebus match event logs")
+    parser.add_argument("log_dir", help="Event log directory")
+    parser.add_argument("-o", "--output",
+                        help="Output file. Defaults to stdout")
+    parser.add_argument("-m", "--matches", action="store_true",
+                        help="Output each match summary as JSON Lines, "
+                        "instead of the aggregate")
+    args = parser.parse_args(argv)
+
+    out: TextIO = sys.stdout
+    if args.output is not None:
+        out = open(args.output, 'w')
+    try:
+        if args.matches:
+            write_matches(iter_matches(args.log_dir), out)
+        else:
+            json.dump(aggregate(iter_matches(args.log_dir)), out, indent=4)
+            out.write('\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
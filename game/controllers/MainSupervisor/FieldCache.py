@@ -0,0 +1,137 @@
+"""Cache of Webots field handles and supervisor owned field values"""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from controller import Node
+from controller import Field
+
+
+class FieldCache:
+    """Write through cache of a Webots node's fields.
+
+    Field handles are resolved by name once per node. Values of fields only
+    ever changed by the supervisor itself (e.g. a victim's `found` flag) can
+    be read through a local shadow copy, which is kept up to date by writing
+    them through `set`. Fields that Webots changes (e.g. a robot's
+    translation) should only have their handle cached, via `field`.
+
+    Cache hits and misses of all field caches are counted, separately for
+    field handles and shadow values, for checking how many controller API
+    calls are being saved.
+    """
+
+    field_hits: int = 0
+    field_misses: int = 0
+    value_hits: int = 0
+    value_misses: int = 0
+
+    def __init__(self, node: Optional[Node]):
+        """Creates a new field cache for a node
+
+        Args:
+            node (Optional[Node]): Webots node to cache the fields of. Fields
+            can't be accessed if None.
+        """
+        self.node: Optional[Node] = node
+        self._fields: dict[str, Field] = {}
+        self._values: dict[str, Any] = {}
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        """Resets the hit/miss counters of all field caches
+        """
+        cls.field_hits = 0
+        cls.field_misses = 0
+        cls.value_hits = 0
+        cls.value_misses = 0
+
+    @classmethod
+    def get_stats(cls) -> str:
+        """Gets a summary of the hit/miss counters of all field caches
+
+        Returns:
+            str: Hit/miss summary
+        """
+        def summary(hits: int, misses: int) -> str:
+            total: int = hits + misses
+            rate: float = hits / total * 100 if total else 0
+            return f"{hits} hits, {misses} misses ({rate:.1f}% hit rate)"
+
+        return (f"Field cache: handles "
+                f"{summary(cls.field_hits, cls.field_misses)}, values "
+                f"{summary(cls.value_hits, cls.value_misses)}")
+
+    def field(self, name: str) -> Field:
+        """Gets a field handle, resolving it by name on first use. Fields the
+        node doesn't have are cached as None too, so they aren't looked up
+        again.
+
+        Args:
+            name (str): Field name
+
+        Returns:
+            Field: Webots field handle, None if the node has no such field
+        """
+        if name in self._fields:
+            FieldCache.field_hits += 1
+        else:
+            FieldCache.field_misses += 1
+            self._fields[name] = self.node.getField(name)
+        return self._fields[name]
+
+    def get(self, name: str, field_type: str) -> Any:
+        """Gets the value of a supervisor owned field. The value is only read
+        from Webots on first use, and from the shadow copy after that.
+
+        Args:
+            name (str): Field name
+            field_type (str): Webots field type (e.g. `SFBool`, `SFVec3f`)
+
+        Returns:
+            Any: Field value
+        """
+        if name in self._values:
+            FieldCache.value_hits += 1
+        else:
+            FieldCache.value_misses += 1
+            self._values[name] = getattr(self.field(name), f"get{field_type}")()
+        value: Any = self._values[name]
+        return list(value) if isinstance(value, list) else value
+
+    def set(self, name: str, field_type: str, value: Any) -> None:
+        """Sets the value of a field, writing it through to Webots and the
+        shadow copy
+
+        Args:
+            name (str): Field name
+            field_type (str): Webots field type (e.g. `SFBool`, `SFVec3f`)
+            value (Any): Value to set
+        """
+        getattr(self.field(name), f"set{field_type}")(value)
+        self._values[name] = list(value) if isinstance(value, list) else value
+
+    def seed(self, name: str, value: Any) -> None:
+        """Sets the shadow copy of a supervisor owned field's value, without
+        reading or writing it in Webots. Only use with values known to match
+        the world (e.g. from a compiled world bundle).
+
+        Args:
+            name (str): Field name
+            value (Any): Field value
+        """
+        self._values[name] = list(value) if isinstance(value, list) else value
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Discards shadow values, so they are read from Webots on next use.
+        Use if a field may have been changed outside of the supervisor.
+
+        Args:
+            name (Optional[str], optional): Field to invalidate, or None for
+            all of the node's fields. Defaults to None.
+        """
+        if name is None:
+            self._values.clear()
+        else:
+            self._values.pop(name, None)
@@ -0,0 +1,107 @@
+"""Background thread writing log files, so file I/O never blocks the
+simulation loop"""
+
+from __future__ import annotations
+
+import os
+import queue
+
+from threading import Thread
+from typing import Callable, Optional, Union
+
+from ConsoleLog import Console
+
+# File contents to write, or a function building them (run on the writer
+# thread)
+LogText = Union[str, Callable[[], str]]
+
+
+class LogWriter:
+    """Queue of log file writes, handled in order by a single writer thread.
+
+    Appends are flushed to the file once they are written, so a log file
+    always holds everything queued before it, even if the supervisor is
+    killed. Whole file writes go to a temporary file first, and then replace
+    the log file, so a log is never left half written.
+    """
+
+    def __init__(self):
+        # Jobs of (mode, file path, text)
+        self._queue: queue.Queue[tuple[str, str, LogText]] = queue.Queue()
+        self._thread: Optional[Thread] = None
+
+    def _start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = Thread(target=self._run, name="LogWriter")
+            self._thread.daemon = True  # thread dies with the program
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            mode, path, text = self._queue.get()
+            try:
+                if mode == 'flush':
+                    text()  # type: ignore
+                else:
+                    self._write(mode, path, text)
+            finally:
+                self._queue.task_done()
+
+    @staticmethod
+    def _write(mode: str, path: str, text: LogText) -> None:
+        try:
+            if callable(text):
+                text = text()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if mode == 'a':
+                with open(path, 'a') as f:
+                    f.write(text)
+            else:
+                tmp_path: str = f"{path}.tmp"
+                with open(tmp_path, 'w') as f:
+                    f.write(text)
+                os.replace(tmp_path, path)
+        except Exception as e:
+            Console.log_err(f"Couldn't write log file {path}. Most likely, "
+                            f"the log dir is missing")
+            Console.log_err(f"\t{e}")
+
+    def append(self, path: str, text: LogText) -> None:
+        """Queues text to be appended to a log file
+
+        Args:
+            path (str): Log file path
+            text (LogText): Text to append
+        """
+        self._start()
+        self._queue.put(('a', path, text))
+
+    def write(self, path: str, text: LogText) -> None:
+        """Queues a log file to be (over)written
+
+        Args:
+            path (str): Log file path
+            text (LogText): File contents
+        """
+        self._start()
+        self._queue.put(('w', path, text))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits for all queued writes to be written
+
+        Args:
+            timeout (Optional[float], optional): Maximum time to wait, in
+            seconds. Defaults to None (no limit).
+
+        Returns:
+            bool: True if all queued writes were written
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return self._queue.unfinished_tasks == 0
+        # Wait on a marker job, so the wait can time out
+        done: queue.Queue[bool] = queue.Queue()
+        self._queue.put(('flush', '', lambda: done.put(True)))
+        try:
+            return done.get(timeout=timeout)
+        except queue.Empty:
+            return False
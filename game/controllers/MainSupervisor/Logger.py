@@ -1,107 +1,229 @@
-from ast import List
+from __future__ import annotations
+
+import atexit
 import os
 import datetime
+import json
+
+from typing import Any, Optional, TYPE_CHECKING
 
-from ConsoleLog import Console
-from Robot import Robot
-from RobotWindowSender import RWSender
+import EventLog
+from LogWriter import LogWriter
 from Tools import get_file_path
 
+if TYPE_CHECKING:
+    from Robot import Robot
+    from RobotWindowSender import RWSender
+
 
 class Logger:
+    """Writes the game log and robot window debug log files. Log events are
+    streamed to the log files as they happen, via a background writer
+    thread, so the logs are complete up to the last event even if the
+    supervisor is killed mid match.
+    """
+
+    _writer: LogWriter = LogWriter()
+
+    # Log files of the current match, None if no match has started
+    _game_log_path: Optional[str] = None
+    _rws_log_path: Optional[str] = None
+    _events_path: Optional[str] = None
+    _summary_path: Optional[str] = None
+    _summary: Optional[dict[str, Any]] = None
 
     @staticmethod
-    def _create_robot_log_str(robot: Robot, max_time: int) -> str:
-        """Create log text for robot log file
+    def _get_log_path(
+        dir_path: str,
+        dir_rel_path: str,
+        prefix: str,
+        file_date: datetime.datetime,
+        ext: str = ".txt"
+    ) -> str:
+        """Gets a log file path, named using a date and time
+
+        Args:
+            dir_path (str): Log directory path
+            dir_rel_path (str): Log directory path, relative to the
+            controller directory
+            prefix (str): Log file name prefix
+            file_date (datetime.datetime): Date and time to name the file with
+            ext (str, optional): File extension. Defaults to ".txt".
+
+        Returns:
+            str: Log file path
         """
-        # Get robot events
-        events: str = robot.get_log_str()
+        log_dir_path: str = get_file_path(dir_path, dir_rel_path)
+        file_name: str = file_date.strftime(f"{prefix} %m-%d-%y %H,%M,%S")
+        return os.path.join(log_dir_path, f"{file_name}{ext}")
 
+    @staticmethod
+    def _create_robot_log_str(
+        name: str,
+        max_time: int,
+        score: str,
+        events: list[tuple[str, str]]
+    ) -> str:
+        """Create log text for robot log file
+        """
         log_str = (
             f"MAX_GAME_DURATION: {int(max_time/60)}:00\n"
-            f"ROBOT_0_SCORE: {round(robot.get_score(), 2)}\n\n"
-            f"ROBOT_0: {robot.name}\n"
-            f"{events}"
+            f"ROBOT_0_SCORE: {score}\n\n"
+            f"ROBOT_0: {name}\n"
+            f"{Logger._create_events_str(events)}"
         )
 
         return log_str
 
     @staticmethod
-    def _write_robot_history_log(robot: Robot, max_time: int) -> None:
-        """Write robot history log file to the project's log directory
+    def _create_events_str(events: list[tuple[str, str]]) -> str:
+        """Create log text for robot history events
+        """
+        return ''.join(Logger._create_event_str(e) for e in events)
 
-        Args:
-            robot (Robot): Robot object
-            max_time (int): The current world's max game time 
+    @staticmethod
+    def _create_event_str(event: tuple[str, str]) -> str:
+        """Create log text for a single robot history event
         """
-        # Get log text
-        log_str: str = Logger._create_robot_log_str(robot, max_time)
-        # Get relative path to logs dir
-        log_dir_path: str = get_file_path("logs/", "../../logs/")
+        return f"{event[0]} {event[1]}\n"
 
-        # Create file name using date and time
-        file_date: datetime.datetime = datetime.datetime.now()
-        file_name: str = file_date.strftime("gameLog %m-%d-%y %H,%M,%S")
-
-        # Get log file path
-        log_file_path: str = os.path.join(log_dir_path, f"{file_name}.txt")
-
-        try:
-            # Create log directory if it doesn't exist
-            os.makedirs(log_dir_path, exist_ok=True)
-            with open(log_file_path, "w") as f:
-                f.write(log_str)
-        except Exception as e:
-            Console.log_err(f"Couldn't write log file. Most likely, the log "
-                            f"dir: {log_dir_path} is missing")
-            Console.log_err(f"\t{e}")
-            
     @staticmethod
-    def _create_rws_log_str(rws: RWSender) -> str:
+    def _create_rws_log_str(records: list[str]) -> str:
         """Create log text for robot window log file
         """
-        return '\n'.join(str(record) for record in rws.log_history)
-    
+        return ''.join(f"{record}\n" for record in records)
+
     @staticmethod
-    def _write_rws_log(rws: RWSender) -> None:
-        """Write debug log for messages sent between the robot window and
-        the Erebus engine/supervisor
+    def start_log(
+        robot: Robot,
+        rws: RWSender,
+        max_time: int,
+        world: str = ""
+    ) -> None:
+        """Starts the log files for a new match. The game log is written with
+        the events so far, and following events are appended as they happen.
+        An incomplete match summary index is written for the event log.
 
         Args:
+            robot (Robot): Game robot object
             rws (RWSender): Supervisor's robot window sender object
+            max_time (int): The current world's max game time
+            world (str, optional): The current world's name. Defaults to "".
         """
-        # Get log text
-        log_str: str = Logger._create_rws_log_str(rws)
-        # Get relative path to logs dir
-        log_dir_path: str = get_file_path("logs/debug/", "../../logs/debug/")
-
-        # Create file name using date and time
         file_date: datetime.datetime = datetime.datetime.now()
-        file_name: str = file_date.strftime("rwsLog %m-%d-%y %H,%M,%S")
-
-        # Get log file path
-        log_file_path: str = os.path.join(log_dir_path, f"{file_name}.txt")
-
-        try:
-            # Create log directory if it doesn't exist
-            os.makedirs(log_dir_path, exist_ok=True)
-            with open(log_file_path, "w") as f:
-                f.write(log_str)
-        except Exception as e:
-            Console.log_err(f"Couldn't write log file. Most likely, the log "
-                            f"dir: {log_dir_path} is missing")
-            Console.log_err(f"\t{e}")
-    
+        Logger._game_log_path = Logger._get_log_path(
+            "logs/", "../../logs/", "gameLog", file_date)
+        Logger._rws_log_path = Logger._get_log_path(
+            "logs/debug/", "../../logs/debug/", "rwsLog", file_date)
+        Logger._events_path = Logger._get_log_path(
+            "logs/events/", "../../logs/events/", "gameLog", file_date,
+            EventLog.EVENTS_EXT)
+        Logger._summary_path = Logger._get_log_path(
+            "logs/events/", "../../logs/events/", "gameLog", file_date,
+            EventLog.SUMMARY_EXT)
+        Logger._summary = EventLog.create_summary(
+            world, robot.name, max_time, file_date.isoformat())
+        # Index the match as it starts, so it can still be aggregated by world
+        # and robot if the supervisor is killed before it finishes
+        Logger._writer.write(Logger._summary_path,
+                             json.dumps(Logger._summary, indent=4))
+
+        name: str = robot.name
+        events: list[tuple[str, str]] = list(robot.history.master_history)
+        Logger._writer.write(
+            Logger._game_log_path,
+            lambda: Logger._create_robot_log_str(name, max_time,
+                                                 "IN PROGRESS", events))
+        records: list[str] = list(rws.log_history)
+        Logger._writer.write(Logger._rws_log_path,
+                             lambda: Logger._create_rws_log_str(records))
+
+    @staticmethod
+    def log_event(event: tuple[str, str]) -> None:
+        """Appends a robot history event to the current game log
+
+        Args:
+            event (tuple[str, str]): Event record, in the form (game time,
+            event data)
+        """
+        if Logger._game_log_path is not None:
+            Logger._writer.append(Logger._game_log_path,
+                                  Logger._create_event_str(event))
+
+    @staticmethod
+    def log_rws(record: str) -> None:
+        """Appends a robot window message record to the current robot window
+        debug log
+
+        Args:
+            record (str): Robot window message record
+        """
+        if Logger._rws_log_path is not None:
+            Logger._writer.append(Logger._rws_log_path, f"{record}\n")
+
+    @staticmethod
+    def log_match_event(record: dict[str, Any]) -> None:
+        """Appends a scoring event record to the current match event log
+
+        Args:
+            record (dict[str, Any]): Event record (see `Robot.increase_score`)
+        """
+        if Logger._events_path is None or Logger._summary is None:
+            return
+        EventLog.update_summary(Logger._summary, record)
+        Logger._writer.append(Logger._events_path, json.dumps(record) + '\n')
+
     @staticmethod
     def write_log(robot: Robot, rws: RWSender, max_time: int) -> None:
-        """Write log files for the robot history events, and the debug
-        robot window log files for recording messages sent between
-        the robot window and the Erebus supervisor
+        """Finishes the log files of the match, writing the final score to
+        the game log. The files are written in the background, use
+        `Logger.flush` to wait for them.
 
         Args:
             robot (Robot): Game robot object
             rws (RWSender): Supervisor's robot window sender object
             max_time (int): The current world's max game time
         """
-        Logger._write_robot_history_log(robot, max_time)
-        Logger._write_rws_log(rws)
+        if Logger._game_log_path is None:
+            Logger.start_log(robot, rws, max_time)
+
+        name: str = robot.name
+        score: str = str(round(robot.get_score(), 2))
+        events: list[tuple[str, str]] = list(robot.history.master_history)
+        Logger._writer.write(
+            Logger._game_log_path,  # type: ignore
+            lambda: Logger._create_robot_log_str(name, max_time, score,
+                                                 events))
+        # The match's logs are finished, later messages (e.g. the robot
+        # window being told the game ended) aren't part of them
+        Logger._game_log_path = None
+        Logger._rws_log_path = None
+
+        # Index the match's event log
+        if Logger._summary is not None and Logger._summary_path is not None:
+            Logger._summary["robot"] = name
+            Logger._summary["score"] = round(robot.get_score(), 2)
+            Logger._summary["end_time"] = (
+                datetime.datetime.now().isoformat())
+            Logger._summary["complete"] = True
+            Logger._writer.write(Logger._summary_path,
+                                 json.dumps(Logger._summary, indent=4))
+        Logger._events_path = None
+        Logger._summary_path = None
+        Logger._summary = None
+
+    @staticmethod
+    def flush(timeout: Optional[float] = None) -> bool:
+        """Waits for all log files to be written
+
+        Args:
+            timeout (Optional[float], optional): Maximum time to wait, in
+            seconds. Defaults to None (no limit).
+
+        Returns:
+            bool: True if all log files were written
+        """
+        return Logger._writer.flush(timeout)
+
+
+atexit.register(Logger.flush, 5.0)
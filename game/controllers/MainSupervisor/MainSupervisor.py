@@ -15,6 +15,7 @@ import json
 import time
 import subprocess
 import requests as req
+import numpy.typing as npt
 
 from controller import Supervisor
 from controller import Emitter
@@ -25,18 +26,22 @@ import ControllerUploader
 
 from Tools import *
 from ConsoleLog import Console
+from EventLog import EventKind
 from Logger import Logger
 from ProtoGenerator import generate_robot_proto
 from MapAnswer import MapAnswer, pretty_print_map
 from Config import Config
 from Camera import *
+from FieldCache import FieldCache
+from ReceiverPump import ReceiverPump
 from Tile import *
 from Victim import *
 from Robot import *
 from Recorder import Recorder
 from Test import TestRunner
 from RobotWindowSender import RWSender
-from ThumbnailWriter import export_map_to_img
+from ThumbnailWriter import export_map_to_img, get_thumbnail_path
+from WorldBundle import WorldBundle
 from DockerHelper import run_docker_container
 
 from typing import Sequence, cast
@@ -116,20 +121,39 @@ class Erebus(Supervisor):
         self._max_real_world_time: int = int(max(self.max_time + 60,
                                                 self.max_time * 1.25))
 
+        # Load the compiled world bundle, if the world hasn't changed since
+        # it was last compiled
+        bundle: Optional[WorldBundle] = WorldBundle.load(self.getWorldPath(),
+                                                         self.version)
+
         # Init tile and victim managers
-        self.tile_manager: TileManager = TileManager(self)
-        self.victim_manager: VictimManager = VictimManager(self)
+        self.tile_manager: TileManager = TileManager(self, bundle)
+        self.victim_manager: VictimManager = VictimManager(self, bundle)
 
         cam_side: FollowSide = FollowSide.BOTTOM
         if len(custom_world_data) > 1:
             cam_side = FollowSide[custom_world_data[1].upper()]
         self._camera: Camera = Camera(self.getFromDef("Viewpoint"), cam_side)
+        self._camera_sides: SideRaster = SideRaster(
+            self.victim_manager.sign_geometry)
 
         # Typing casts have to be used here to get proper type hints. Webots
         # returns Devices from `getDevice`, but e.g. an Emitter or Receiver
         # dont inherit from Device...
         self._receiver: Receiver = cast(Receiver, self.getDevice('receiver'))
         self._receiver.enable(Erebus.TIME_STEP)
+        self._receiver_pump: ReceiverPump = ReceiverPump(self._receiver)
+        for kind, handler in (
+            (ReceiverPump.EXIT, self._handle_exit),
+            (ReceiverPump.MAP, self._handle_map),
+            (ReceiverPump.LOP, self._handle_lop),
+            (ReceiverPump.GAME_INFO, self._handle_game_info),
+            (ReceiverPump.VICTIM, self._handle_victim),
+            (ReceiverPump.MAP_DATA, self._handle_map_data),
+            (ReceiverPump.TEST_STAGE, self._handle_test_packet),
+            (ReceiverPump.UNKNOWN, self._handle_unknown),
+        ):
+            self._receiver_pump.register(kind, handler)
 
         self.emitter: Emitter = cast(Emitter, self.getDevice('emitter'))
 
@@ -139,12 +163,13 @@ class Erebus(Supervisor):
         self.robot_obj.controller.reset_file()
         self.robot_obj.reset_proto()
 
-        # Calculate the solution arrays for the map layout
-        self._map_ans = MapAnswer.from_supervisor(self)
-        map_ans: Optional[list[list]] = self._map_ans.generateAnswer()
-        if map_ans is None:
-            raise Exception("Critical error: Could not generate answer matrix")
-        self._map_sol: list[list] = map_ans
+        # Calculate the solution arrays for the map layout, and export the
+        # answer map to an image used within the world selector UI
+        if bundle is None:
+            bundle = self._compile_world()
+        else:
+            bundle.export_thumbnail(get_thumbnail_path(self.getWorldPath()))
+        self._map_sol: npt.NDArray = bundle.answer
 
         # Init test runner to run (unit) tests
         self._test_runner: TestRunner = TestRunner(self)
@@ -154,13 +179,33 @@ class Erebus(Supervisor):
         self._remote_enabled: bool = False
         self._update_remote_enabled()
 
-        # Export the answer map to an image used within the world selector UI
-        export_map_to_img(self, self._map_sol)
-        
         self.rws.send("currentWorld", self._get_current_world())
 
         self.rws.send("update", f"0,0,{self.max_time},0")
 
+    def _compile_world(self) -> WorldBundle:
+        """Compiles the current world into a world bundle, generating the map
+        answer matrix and world thumbnail
+
+        Raises:
+            Exception: Raised if the map answer matrix couldn't be generated
+
+        Returns:
+            WorldBundle: Compiled world bundle
+        """
+        map_ans: MapAnswer = MapAnswer.from_supervisor(self)
+        answer: Optional[list[list]] = map_ans.generateAnswer()
+        if answer is None:
+            raise Exception("Critical error: Could not generate answer matrix")
+
+        export_map_to_img(self, answer)
+        thumbnail_path: str = get_thumbnail_path(self.getWorldPath())
+
+        return WorldBundle.compile(
+            self.getWorldPath(), self.version, answer,
+            self.tile_manager, self.victim_manager, thumbnail_path
+        )
+
     def wwiReceiveText(self) -> Optional[str]:
         """
         Allow a robot controller to receive a message sent from a JavaScript
@@ -179,13 +224,16 @@ class Erebus(Supervisor):
             try:
                 return text.decode()
             except:
-                Console.log_debug(f"<wwiReceiveText> failed to decode {text}")
+                Console.log_debug("<wwiReceiveText> failed to decode %s", text)
                 pass
 
     def _game_init(self) -> None:
         """Initialises Erebus' initial game state. This should be run on the 
         first frame of simulation run time.
         """
+        # Only count field cache hits/misses of this match
+        FieldCache.reset_stats()
+
         # If recording
         if self.config.recording:
             Recorder.start_recording(self)
@@ -201,6 +249,13 @@ class Erebus(Supervisor):
         # Set robots starting position in world
         self.robot_obj.set_start_pos(self.tile_manager.start_tile)
         self.robot_obj.in_simulation = True
+        # Only track the robot's motion from the start of the match
+        self.robot_obj.trajectory.clear()
+        self.tile_manager.transitions.reset()
+        # Start streaming game events to the log files
+        Logger.start_log(
+            self.robot_obj, self.rws, self.max_time,
+            os.path.splitext(os.path.basename(self.getWorldPath()))[0])
         self.robot_obj.set_max_velocity(self.DEFAULT_MAX_MULT)
         # Reset physics
         self.robot_obj.reset_physics()
@@ -213,7 +268,7 @@ class Erebus(Supervisor):
             Recorder.reset_countdown(self)
             
         # Enqueue warning if debug mode is on when game the starts
-        if Console.DEBUG_MODE:
+        if Console.debug_enabled():
             self.robot_obj.history.enqueue("WARNING: Debug mode is on. This "
                                            "should not be on during competitions.")
 
@@ -253,7 +308,8 @@ class Erebus(Supervisor):
             suffix = "(via UI)"
         
         # Update history with event
-        self.robot_obj.increase_score(f"Lack of Progress {suffix}", -5)
+        self.robot_obj.increase_score(f"Lack of Progress {suffix}", -5,
+                                      kind=EventKind.LACK_OF_PROGRESS)
 
         # Update the camera position since the robot has now suddenly moved
         if self.config.automatic_camera and self._camera.wb_viewpoint_node:
@@ -339,7 +395,8 @@ class Erebus(Supervisor):
         """Apply the map multiplier from the robot's map score to the score
         """
         score_change: float = self.robot_obj.get_score() * self.robot_obj.map_score_percent
-        self.robot_obj.increase_score("Map Bonus", score_change)
+        self.robot_obj.increase_score("Map Bonus", score_change,
+                                      kind=EventKind.MAP_BONUS)
 
     def _process_robot_json(self, json_data: str) -> None:
         """Process custom robot json data to generate a new robot proto file.
@@ -351,6 +408,28 @@ class Erebus(Supervisor):
         if generate_robot_proto(robot_json):
             self.rws.send("loaded1")
 
+    @property
+    def real_time_elapsed(self) -> float:
+        """Real world time elapsed in the match, in seconds"""
+        return self._real_time_elapsed
+
+    def step(self, duration: int) -> int:
+        """Steps the Webots simulation, invalidating the robot's state
+        snapshot so it is read again for the new step, and writing any
+        console output that has been buffered for long enough
+
+        Args:
+            duration (int): Duration to step, in milliseconds
+
+        Returns:
+            int: -1 if Webots is terminating the controller, otherwise 0
+        """
+        result: int = super().step(duration)
+        if hasattr(self, "robot_obj"):
+            self.robot_obj.invalidate_state()
+        Console.poll()
+        return result
+
     def wait(self, sec: float) -> None:
         """Waits for x amount of seconds, while still stepping the Webots
         simulation to avoid simulation pauses
@@ -404,6 +483,8 @@ class Erebus(Supervisor):
         if self.robot_obj.in_simulation:
             # Write to a log file to write game events to file
             Logger.write_log(self.robot_obj, self.rws, self.max_time)
+        # Loading a world closes the supervisor, so wait for the logs
+        Logger.flush(timeout=5.0)
         path: str = get_file_path("worlds", "../../worlds")
         path = os.path.join(path, world)
         self.worldLoad(path)
@@ -455,88 +536,85 @@ class Erebus(Supervisor):
         est_vic_pos = robot_message[0]
         est_vic_type = robot_message[1]
 
-        iterator: Sequence[VictimObject] = self.victim_manager.victims
+        geometry: SignGeometry = self.victim_manager.victim_geometry
         name: str = 'Victim'
+        kind: EventKind = EventKind.VICTIM
+        type_kind: EventKind = EventKind.VICTIM_TYPE
         correct_type_bonus: int = 10
         misidentification: bool = True
 
         if est_vic_type.lower() in list(map(to_lower, HazardMap.HAZARD_TYPES)):
-            iterator = self.victim_manager.hazards
+            geometry = self.victim_manager.hazard_geometry
             name = 'Hazard'
+            kind = EventKind.HAZARD
+            type_kind = EventKind.HAZARD_TYPE
             correct_type_bonus = 20
 
-        # Get nearby victim/hazards that are within range (as per the rules)
-        nearby_map_issues: Sequence[VictimObject] = [
-            h for h in iterator
-            if h.check_position(self.robot_obj.position) and
-            h.check_position(est_vic_pos) and
-            h.on_same_side(self.robot_obj) and
-            not h.identified
-        ]
-
-        Console.log_debug(f"--- Victim Data ---")
-        for h in iterator:
-            Console.log_debug("===")
-            Console.log_debug(
-                f"Position {self.robot_obj.position}")
-            Console.log_debug(
-                f"Distance {h.get_distance(self.robot_obj.position)}/0.09")
-            Console.log_debug(
-                f"In range: ({h.check_position(self.robot_obj.position)})")
-            Console.log_debug(f"Est pos: {est_vic_pos}")
-            Console.log_debug(
-                f"Est distance {h.get_distance(est_vic_pos)}/0.09")
-            Console.log_debug(
-                f"Est distance in range: {h.check_position(est_vic_pos)}")
-            Console.log_debug(
-                f"On same side: {h.on_same_side(self.robot_obj)}")
-            Console.log_debug(f"Identified: {h.identified}")
-            Console.log_debug("===")
-        Console.log_debug(f"Nearby issues: {len(nearby_map_issues)}")
-        Console.log_debug(f"--- ----------- ---")
+        # Get nearby victim/hazards that are within range (as per the rules),
+        # checking every sign at once
+        robot_pos: list[float] = self.robot_obj.position
+        robot_distances: npt.NDArray = geometry.get_distances(robot_pos)
+        est_distances: npt.NDArray = geometry.get_distances(est_vic_pos)
+        same_side: npt.NDArray = geometry.on_same_side(robot_pos)
+        in_range: npt.NDArray = np.flatnonzero((robot_distances <= 0.09) &
+                                               (est_distances <= 0.09) &
+                                               same_side)
+        nearby: list[int] = [i for i in in_range
+                             if not geometry.signs[i].identified]
+
+        if Console.debug_enabled():
+            Console.log_debug(f"--- Victim Data ---")
+            for i, h in enumerate(geometry.signs):
+                Console.log_debug("===")
+                Console.log_debug(f"Position {robot_pos}")
+                Console.log_debug(f"Distance {robot_distances[i]}/0.09")
+                Console.log_debug(
+                    f"In range: ({robot_distances[i] <= 0.09})")
+                Console.log_debug(f"Est pos: {est_vic_pos}")
+                Console.log_debug(f"Est distance {est_distances[i]}/0.09")
+                Console.log_debug(
+                    f"Est distance in range: {est_distances[i] <= 0.09}")
+                Console.log_debug(f"On same side: {same_side[i]}")
+                Console.log_debug(f"Identified: {h.identified}")
+                Console.log_debug("===")
+            Console.log_debug(f"Nearby issues: {len(nearby)}")
+            Console.log_debug(f"--- ----------- ---")
 
         # Award points based on correct victim identifications etc.
-        if len(nearby_map_issues) > 0:
+        if len(nearby) > 0:
             misidentification: bool = False
 
             # TODO should it take the nearest, or perhaps also account
             # for which victim type was trying to be identified?
 
             # Take the nearest map issue by distance to the estimated coordinate
-            distances: list[float] = [h.get_distance(est_vic_pos)
-                                      for h in nearby_map_issues]
-
-            nearby_issue: VictimObject = nearby_map_issues[np.argmin(
-                distances)]
+            nearby_issue: VictimObject = geometry.signs[
+                nearby[np.argmin(est_distances[nearby])]]
 
             # Get points scored depending on the type of victim
-            grid: int = self.tile_manager.coord2grid(
-                nearby_issue.wb_translation_field.getSFVec3f(),
-                self)
-
-            room_num: int = (
-                self.getFromDef("WALLTILES")
-                .getField("children")
-                .getMFNode(grid)  # type: ignore
-                .getField("room")
-                .getSFInt32() - 1
-            )
+            multiplier: float = self.tile_manager.get_room_multiplier(
+                nearby_issue.position)
 
-            Console.log_debug(f"Victim type est. {est_vic_type.lower()} vs "
-                              f"{nearby_issue.simple_victim_type.lower()}")
+            Console.log_debug(
+                lambda: f"Victim type est. {est_vic_type.lower()} vs "
+                        f"{nearby_issue.simple_victim_type.lower()}")
 
             # Update score and history
             if est_vic_type.lower() == nearby_issue.simple_victim_type.lower():
                 self.robot_obj.increase_score(
                     f"Successful {name} Type Correct Bonus",
                     correct_type_bonus,
-                    multiplier=self.tile_manager.ROOM_MULT[room_num]
+                    multiplier=multiplier,
+                    kind=type_kind,
+                    position=nearby_issue.position
                 )
 
             self.robot_obj.increase_score(
                 f"Successful {name} Identification",
                 nearby_issue.score_worth,
-                multiplier=self.tile_manager.ROOM_MULT[room_num]
+                multiplier=multiplier,
+                kind=kind,
+                position=nearby_issue.position
             )
 
             self.robot_obj.victim_identified = True
@@ -544,91 +622,174 @@ class Erebus(Supervisor):
 
         if misidentification:
             self.robot_obj.increase_score(f"Misidentification of {name}",
-                                          -5)
+                                          -5,
+                                          kind=EventKind.MISIDENTIFICATION)
 
-    def _process_message(self, robot_message: list[Any]) -> None:
-        """Processes the messages recieved from the competitor's robot's emitter
-        as specified in the simulation rules
+    def _handle_test_packet(self, received_data: bytes) -> None:
+        """Passes a packet received from the test controller to the test
+        runner, processing it as map data if it isn't test stage data
 
         Args:
-            robot_message (list[Any]): The competitor's robot message data 
+            received_data (bytes): Raw packet bytes
         """
-        Console.log_debug(
-            f"Robot Stopped for {self.robot_obj.time_stopped()}s")
-        
-        # Process exit commands
-        if robot_message[0] == 'E':
-            # TODO check this is inline with rules
-            # Check robot position is on starting tile
-            if self.tile_manager.start_tile.check_position(self.robot_obj.position):
-                if self.robot_obj.victim_identified:
-                    self.robot_obj.increase_score("Exit Bonus",
-                                                  self.robot_obj.get_score() * 0.1)
-                else:
-                    self.robot_obj.history.enqueue("No Exit Bonus")
-            # Update score and history
-            self._add_map_multiplier()
-            self._robot_quit(False)
-            
-            self.rws.send("ended")
-            self._game_state = GameState.MATCH_FINISHED
-            self._last_frame = True
-        # Process map scoring commands
-        elif robot_message[0] == 'M':
-            try:
-                # If map_data submitted
-                if self.robot_obj.map_data.size == 0:
-                    Console.log_err("Please send your map data before hand.")
-                    return
-                # If not previously evaluated
-                if self.robot_obj.sent_maps:
-                    Console.log_err(f"The map has already been evaluated.")
-                    return
-                
-                if Console.DEBUG_MODE:
-                    Console.log_debug("Map solution matrix:")
-                    pretty_print_map(self._map_sol)
-                    Console.log_debug("Submitted map matrix")
-                    pretty_print_map(self.robot_obj.map_data)
-
-                map_score: float = MapScorer.calculateScore(
-                    self._map_sol, self.robot_obj.map_data
-                )
+        if not self._test_runner.get_stage(received_data):
+            self._handle_map_data(received_data)
 
-                self.robot_obj.history.enqueue(
-                    f"Map Correctness {str(round(map_score * 100,2))}%"
-                )
+    def _match_in_progress(self) -> bool:
+        """Checks if the match hasn't ended, so robot messages should still be
+        handled
 
-                # Add percent
-                self.robot_obj.map_score_percent = map_score
-                self.robot_obj.sent_maps = True
-                self.robot_obj.map_data = np.array([])
-
-            except Exception as e:
-                Console.log_err("Map scoring error, please check your code.")
-                Console.log_err(str(e))
-        # Process robot relocation commands
-        elif robot_message[0] == 'L':
-            self.relocate_robot()
-            self.robot_obj.reset_time_stopped()
-        # Process game info commands
-        elif robot_message[0] == 'G':
-            # Send game info in format:
-            # (G, score, game time left, real time left)
-            self.emitter.send(
-                struct.pack(
-                    "c f i i",
-                    bytes("G", "utf-8"),
-                    round(self.robot_obj.get_score(), 2),
-                    self.max_time - int(self.time_elapsed),
-                    self._max_real_world_time - int(self._real_time_elapsed)
-                )
+        Returns:
+            bool: True if the robot is in the simulation and the match hasn't
+            finished
+        """
+        return (self.robot_obj.in_simulation and
+                self._game_state != GameState.MATCH_FINISHED)
+
+    def _handle_exit(self, received_data: bytes) -> None:
+        """Processes an exit command from the competitor's robot, giving the
+        exit bonus if on the start tile and ending the match
+
+        Args:
+            received_data (bytes): Raw packet bytes
+        """
+        # TODO check this is inline with rules
+        # Check robot position is on starting tile
+        if self.tile_manager.is_start_tile(self.robot_obj.position):
+            if self.robot_obj.victim_identified:
+                self.robot_obj.increase_score("Exit Bonus",
+                                              self.robot_obj.get_score() * 0.1,
+                                              kind=EventKind.EXIT_BONUS)
+            else:
+                self.robot_obj.history.enqueue("No Exit Bonus")
+        # Update score and history
+        self._add_map_multiplier()
+        self._robot_quit(False)
+
+        self.rws.send("ended")
+        self._game_state = GameState.MATCH_FINISHED
+        self._last_frame = True
+
+    def _handle_map(self, received_data: bytes) -> None:
+        """Processes a map scoring command from the competitor's robot,
+        scoring the map data previously sent
+
+        Args:
+            received_data (bytes): Raw packet bytes
+        """
+        try:
+            # If map_data submitted
+            if self.robot_obj.map_data.size == 0:
+                Console.log_err("Please send your map data before hand.")
+                return
+            # If not previously evaluated
+            if self.robot_obj.sent_maps:
+                Console.log_err(f"The map has already been evaluated.")
+                return
+
+            if Console.debug_enabled():
+                Console.log_debug("Map solution matrix:")
+                pretty_print_map(self._map_sol)
+                Console.log_debug("Submitted map matrix")
+                pretty_print_map(self.robot_obj.map_data)
+
+            map_score, breakdown = MapScorer.calculateScoreBreakdown(
+                self._map_sol, self.robot_obj.map_data
+            )
+
+            self.robot_obj.history.enqueue(
+                f"Map Correctness {str(round(map_score * 100,2))}%"
+            )
+            # The breakdown is too long for the robot window history, so
+            # it is only written to the game log
+            self.robot_obj.history.log(
+                f"Map Breakdown {MapScorer.format_breakdown(breakdown)}"
+            )
+
+            # Add percent
+            self.robot_obj.map_score_percent = map_score
+            self.robot_obj.sent_maps = True
+            self.robot_obj.map_data = np.array([])
+
+        except Exception as e:
+            Console.log_err("Map scoring error, please check your code.")
+            Console.log_err(str(e))
+
+    def _handle_lop(self, received_data: bytes) -> None:
+        """Processes a lack of progress command from the competitor's robot,
+        relocating it to its last checkpoint
+
+        Args:
+            received_data (bytes): Raw packet bytes
+        """
+        self.relocate_robot()
+        self.robot_obj.reset_time_stopped()
+
+    def _handle_game_info(self, received_data: bytes) -> None:
+        """Processes a game info command from the competitor's robot, sending
+        back the current score and time left
+
+        Args:
+            received_data (bytes): Raw packet bytes
+        """
+        # Send game info in format:
+        # (G, score, game time left, real time left)
+        self.emitter.send(
+            struct.pack(
+                "c f i i",
+                bytes("G", "utf-8"),
+                round(self.robot_obj.get_score(), 2),
+                self.max_time - int(self.time_elapsed),
+                self._max_real_world_time - int(self._real_time_elapsed)
             )
+        )
+
+    def _handle_victim(self, received_data: bytes) -> None:
+        """Processes a victim identification packet from the competitor's
+        robot, running victim detection if the robot has been stopped for 1
+        second
 
-        # If robot stopped for 1 second, run victim detection 
-        elif self.robot_obj.time_stopped() >= 1.0:
+        Args:
+            received_data (bytes): Raw packet bytes, packed as 'i i c'
+            (est. x position (cm), est. z position (cm), est. victim type)
+        """
+        try:
+            x, z, victim_type = struct.unpack('i i c', received_data)
+            robot_message: list[Any] = [(x / 100, 0, z / 100),
+                                        victim_type.decode("utf-8")]
+        except Exception as e:
+            Console.log_err("Incorrect data format sent")
+            Console.log_err(str(e))
+            return
+        Console.log_debug("Robot Message: %s", robot_message)
+        Console.log_debug(
+            lambda: f"Robot Stopped for {self.robot_obj.time_stopped()}s")
+
+        # If robot stopped for 1 second, run victim detection
+        if self.robot_obj.stopped_for(1.0):
             self._detect_victim(robot_message)
 
+    def _handle_map_data(self, received_data: bytes) -> None:
+        """Stores map data sent by the competitor's robot, to be scored on
+        the next map scoring command
+
+        Args:
+            received_data (bytes): Raw packet bytes
+        """
+        try:
+            self.robot_obj.map_data = MapScorer.decode_map_data(received_data)
+        except Exception as e:
+            Console.log_err("Incorrect data format sent")
+            Console.log_err(str(e))
+
+    def _handle_unknown(self, received_data: bytes) -> None:
+        """Reports an unrecognised command from the competitor's robot
+
+        Args:
+            received_data (bytes): Raw packet bytes
+        """
+        Console.log_err(f"Unknown command sent: {received_data!r}")
+
     def _process_rw_message(self, message: str) -> None:
         """Processes messages received from the MainSupervisor's robot window
 
@@ -653,6 +814,7 @@ class Erebus(Supervisor):
                 if self._game_state == GameState.MATCH_NOT_STARTED:
                     self._game_state = GameState.MATCH_RUNNING
                     self._run_tests = True
+                    self._receiver_pump.test_stages = True
                     self.config.disable_lop = True
                     self.simulation_mode = self.SIMULATION_MODE_FAST
 
@@ -691,6 +853,7 @@ class Erebus(Supervisor):
                 # which only seems to be read and interpreted once per game, so
                 # if we load a new robot file, the new changes won't come into
                 # place until the world is reset!
+                Logger.flush(timeout=5.0)
                 self.worldReload()
 
             # Unload the robot controller
@@ -829,6 +992,8 @@ class Erebus(Supervisor):
         if self._last_frame == True:
             self._last_frame = None
             self._game_state = GameState.MATCH_FINISHED
+            Console.log_debug(FieldCache.get_stats)
+            Console.log_debug(self._receiver_pump.get_stats)
             if self.config.recording:
                 Recorder.stop_recording(self)
 
@@ -836,6 +1001,9 @@ class Erebus(Supervisor):
         if self._first_frame and self._game_state == GameState.MATCH_RUNNING:
             self._game_init()
 
+        if self.robot_obj.in_simulation:
+            self.robot_obj.update_trajectory()
+
         if self._run_tests:
             self._test_runner.run()
 
@@ -845,38 +1013,24 @@ class Erebus(Supervisor):
 
             # Automatic camera movement
             if self.config.automatic_camera and self._camera.wb_viewpoint_node:
-                all_hazards: Sequence[VictimObject] = (
-                    self.victim_manager.victims + self.victim_manager.hazards
-                )
-                self._camera.rotate_to_victim(self.robot_obj, all_hazards)
+                self._camera.rotate_to_victim(self.robot_obj,
+                                              self._camera_sides)
 
-            self.tile_manager.check_checkpoints()
-            self.tile_manager.check_swamps()
+            # Checkpoints and swamps are only checked when the robot moves
+            # onto a new tile
+            self.tile_manager.transitions.update(self.robot_obj.trajectory.tile)
 
-            # If receiver has got a message
-            if self._receiver.getQueueLength() > 0:
-                # Get receiver data
-                received_data = self._receiver.getBytes()
-                
-                # Process robot messages
-                test_msg = False
-                if self._run_tests:
-                    test_msg = self._test_runner.get_stage(received_data)
-                    self._receiver.nextPacket()
-                if not test_msg:
-                    self.robot_obj.set_message(received_data)
-                    self._receiver.nextPacket()
-
-                # If data received from competitor's robot
-                if self.robot_obj.message != []:
-                    robot_message: list[Any] = self.robot_obj.message
-                    Console.log_debug(f"Robot Message: {robot_message}")
-                    self.robot_obj.message = []
-                    self._process_message(robot_message)
+            # Handle every message received from the robot since last step,
+            # until one ends the match
+            self._receiver_pump.pump(self._match_in_progress)
 
             if self._game_state == GameState.MATCH_RUNNING:
                 # Relocate robot if stationary for 20 sec
-                if self.robot_obj.time_stopped() >= 20:
+                if self.robot_obj.stopped_for(20):
+                    Console.log_debug(
+                        lambda: "Lack of progress, moved "
+                        f"{self.robot_obj.trajectory.distance_travelled(20):.3f}"
+                        "m in the last 20s")
                     if not self.config.disable_lop:
                         self.relocate_robot()
                     self.robot_obj.reset_time_stopped()
@@ -927,7 +1081,7 @@ class Erebus(Supervisor):
         # Get the message in from the robot window(if there is one)
         message: Optional[str] = self.wwiReceiveText()
         while message not in ['', None]:
-            Console.log_debug(f"Received wwi message: {message}")
+            Console.log_debug("Received wwi message: %s", message)
             self._process_rw_message(message)  # type: ignore
             message = self.wwiReceiveText()
 
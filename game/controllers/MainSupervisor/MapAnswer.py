@@ -1,62 +1,141 @@
-from typing import Union
+from typing import Optional, Union
 import numpy as np
 import numpy.typing as npt
 import json
 import math
 
-def pretty_print_map(map: Union[list, npt.NDArray]) -> None:
+from CellCodec import CellCodec
+from ConsoleLog import Console
+
+def pretty_print_map(
+    map: Union[list, npt.NDArray],
+    codec: Optional[CellCodec] = None
+) -> None:
     """Print a formatted view of an Erebus map matrix
 
     Args:
-        map (Union[list, npt.NDArray]): Erebus map matrix to print
+        map (Union[list, npt.NDArray]): Erebus map matrix to print, either in
+        string form or encoded
+        codec (Optional[CellCodec], optional): Codec used to encode the map,
+        if it is encoded. Defaults to None.
     """
-    for m in map:
-        for mm in m:
-            # Default (for victims)
-            color = Color.CYAN
-            bkg = Color.BG_WHITE
-            if mm == '0': #Normal
-                color = Color.WHITE
-                bkg = Color.BG_DEFAULT
-            elif mm == '1': #Walls
-                bkg = Color.BG_WHITE
-                color = Color.BLACK
-            elif mm == '2': #Holes
-                bkg = Color.BG_WHITE
-                color = Color.BOLD
-            elif mm == '3': #Swamps
-                color = Color.YELLOW
-                bkg = Color.BG_DEFAULT
-            elif mm == '4': #Checkpoints
-                color = Color.UNDERLINE
-                bkg = Color.BG_DEFAULT
-            elif mm == '5': #Stating tile
-                color = Color.GREEN
-                bkg = Color.BG_DEFAULT
-            elif mm == 'b': #1 to 2
-                color = Color.BLUE
-                bkg = Color.BG_DEFAULT
-            elif mm == 'y': #1 to 3
-                color = Color.YELLOW
-                bkg = Color.BG_DEFAULT
-            elif mm == 'g': #1 to 4
-                color = Color.GREEN
-                bkg = Color.BG_DEFAULT
-            elif mm == 'p': #2 to 3
-                color = Color.MAGENTA
-                bkg = Color.BG_DEFAULT
-            elif mm == 'o': #2 to 4
-                color = Color.RED
-                bkg = Color.BG_YELLOW
-            elif mm == 'r': #3 to 4
-                color = Color.RED
-                bkg = Color.BG_DEFAULT
-            else: #Victims
-                color = Color.CYAN
-                bkg = Color.BG_WHITE
+    if codec is None:
+        codes: npt.NDArray = CellCodec().encode(map)
+    else:
+        codes = np.asarray(map)
+        map = codec.decode(codes)
+
+    # Colour and background for each cell type. Victims/hazards default to
+    # cyan on white
+    colors: dict[int, tuple[str, str]] = {
+        CellCodec.EMPTY: (Color.WHITE, Color.BG_DEFAULT),
+        CellCodec.WALL: (Color.BLACK, Color.BG_WHITE),
+        CellCodec.HOLE: (Color.BOLD, Color.BG_WHITE),
+        CellCodec.SWAMP: (Color.YELLOW, Color.BG_DEFAULT),
+        CellCodec.CHECKPOINT: (Color.UNDERLINE, Color.BG_DEFAULT),
+        CellCodec.START: (Color.GREEN, Color.BG_DEFAULT),
+        CellCodec.ROOM_1 | CellCodec.ROOM_2: (Color.BLUE, Color.BG_DEFAULT),
+        CellCodec.ROOM_1 | CellCodec.ROOM_3: (Color.YELLOW, Color.BG_DEFAULT),
+        CellCodec.ROOM_1 | CellCodec.ROOM_4: (Color.GREEN, Color.BG_DEFAULT),
+        CellCodec.ROOM_2 | CellCodec.ROOM_3: (Color.MAGENTA, Color.BG_DEFAULT),
+        CellCodec.ROOM_2 | CellCodec.ROOM_4: (Color.RED, Color.BG_YELLOW),
+        CellCodec.ROOM_3 | CellCodec.ROOM_4: (Color.RED, Color.BG_DEFAULT),
+    }
+
+    # Keep the map after any buffered console output
+    Console.flush()
+    for cells, row in zip(map, codes):
+        for mm, code in zip(cells, row):
+            color, bkg = colors.get(code, (Color.CYAN, Color.BG_WHITE))
             print(f'{bkg}{color}{mm}{Color.RESET}', end='')
         print('')
 
+def _wall_stamps(z: int, x: int, size: int) -> npt.NDArray:
+    """Creates the 5x5 tile stamps for every combination of walls around a
+    square area of a tile
+
+    Args:
+        z (int): Top row of the area within the tile
+        x (int): Left column of the area within the tile
+        size (int): Width/height of the area
+
+    Returns:
+        npt.NDArray: (16, 25) boolean stamps, indexed by a bit mask of the
+        walls present (see `_wall_bits`)
+    """
+    stamps = np.zeros((16, 5, 5), dtype=bool)
+    end = size - 1
+    for walls in range(16):
+        if walls & 1: # Top
+            stamps[walls, z, x:x+size] = True
+        if walls & 2: # Right
+            stamps[walls, z:z+size, x+end] = True
+        if walls & 4: # Bottom
+            stamps[walls, z+end, x:x+size] = True
+        if walls & 8: # Left
+            stamps[walls, z:z+size, x] = True
+    return stamps.reshape(16, 25)
+
+def _wall_bits(walls: list[int]) -> int:
+    """Gets the wall stamp index of a set of walls
+
+    Args:
+        walls (list[int]): Top, right, bottom and left wall values
+
+    Returns:
+        int: Bit mask of the walls present
+    """
+    bits = 0
+    for i, wall in enumerate(walls):
+        if wall > 0:
+            bits |= 1 << i
+    return bits
+
+def _curve_stamps(z: int, x: int) -> tuple[npt.NDArray, npt.NDArray]:
+    """Creates the 5x5 tile stamps for each curve variant within a quarter of
+    a half tile. Each curve cuts off one corner of the quarter, walling the
+    rest of that corner's row and column.
+
+    Args:
+        z (int): Top row of the quarter within the tile
+        x (int): Left column of the quarter within the tile
+
+    Returns:
+        tuple[npt.NDArray, npt.NDArray]: (5, 25) boolean stamps of the cells
+        set as walls and the cells cleared, for curve values 0 (none) to 4
+    """
+    set_stamps = np.zeros((5, 5, 5), dtype=bool)
+    clear_stamps = np.zeros((5, 5, 5), dtype=bool)
+    for variant, (cz, cx) in enumerate([(0, 2), (2, 2), (2, 0), (0, 0)], 1):
+        set_stamps[variant, z+cz, x:x+3] = True
+        set_stamps[variant, z:z+3, x+cx] = True
+        set_stamps[variant, z+cz, x+cx] = False
+        clear_stamps[variant, z+cz, x+cx] = True
+    return set_stamps.reshape(5, 25), clear_stamps.reshape(5, 25)
+
+# Cell offsets of a 5x5 tile stamp, and the stamp indices of the floor
+# marking cells
+_STAMP_ROWS, _STAMP_COLS = (a.ravel() for a in np.indices((5, 5)))
+_STAMP_FLOOR = [6, 8, 16, 18]
+
+# Top left of each quarter of a half tile (tile1 to tile4)
+_QUARTERS = [(0, 0), (0, 2), (2, 0), (2, 2)]
+
+_OUTER_WALL_STAMPS = _wall_stamps(0, 0, 5)
+_QUARTER_WALL_STAMPS = np.array([_wall_stamps(z, x, 3) for z, x in _QUARTERS])
+_CURVE_SET, _CURVE_CLEAR = (np.array(s) for s in
+                            zip(*[_curve_stamps(z, x) for z, x in _QUARTERS]))
+
+# Codes of room connection tiles, by tile colour
+_TILE_COLORS = {
+    (0.0, 0.8, 0.0): CellCodec.ROOM_1 | CellCodec.ROOM_4, # Green, 1 to 4
+    (0.1, 0.1, 0.9): CellCodec.ROOM_1 | CellCodec.ROOM_2, # Blue, 1 to 2
+    (0.3, 0.1, 0.6): CellCodec.ROOM_2 | CellCodec.ROOM_3, # Purple, 2 to 3
+    (0.9, 0.1, 0.1): CellCodec.ROOM_3 | CellCodec.ROOM_4, # Red, 3 to 4
+    (0.9, 0.6, 0.1): CellCodec.ROOM_2 | CellCodec.ROOM_4, # Orange, 2 to 4
+    (0.9, 0.9, 0.1): CellCodec.ROOM_1 | CellCodec.ROOM_3, # Yellow, 1 to 3
+}
+
 class MapAnswer:
     @classmethod
     def from_supervisor(cls, supervisor):
@@ -89,6 +168,13 @@ class MapAnswer:
 
         return cls(tiles, victims, hazards)
     
+    @classmethod
+    def from_world(cls, path):
+        # Parse the world file directly, without a running supervisor
+        from WorldParser import World
+        world = World(path)
+        return cls(world.get_tiles(), world.get_victims(), world.get_hazards())
+
     @classmethod
     def from_dict(cls, dict):
         tiles = []
@@ -113,7 +199,8 @@ class MapAnswer:
         zPos = [t.zPos for t in tiles]
         x_size = max(xPos) - min(xPos) + 1
         z_size = max(zPos) - min(zPos) + 1
-        self.answerMatrix = [[0] * (x_size * 4 + 1) for _ in range(z_size * 4 + 1)]
+        self.answerShape = (z_size * 4 + 1, x_size * 4 + 1)
+        self.answerMatrix = [['0'] * self.answerShape[1] for _ in range(self.answerShape[0])]
 
         self.xStart = -(tiles[0].width * (0.3 * tiles[0].xScale) / 2.0) -0.06
         self.zStart = -(tiles[0].height * (0.3 * tiles[0].zScale) / 2.0) -0.06
@@ -141,287 +228,89 @@ class MapAnswer:
         with open(path, 'w', encoding='utf-8') as f:
             json.dump(self.to_dict(), f, ensure_ascii=False, indent=4)
 
-    def setAnswer(self,z,x,k):
-        if self.answerMatrix[z][x] == '*':
-            return
-        self.answerMatrix[z][x] = k
+    def _stamp_tiles(self) -> npt.NDArray:
+        """Applies the walls, curves and floor markings of every tile to an
+        encoded answer matrix, using precompiled 5x5 stamps
+
+        Returns:
+            npt.NDArray: Encoded answer matrix (see `CellCodec`)
+        """
+        codes = np.zeros(self.answerShape, dtype=np.uint16)
+
+        # Compile each tile down to its stamp indices and floor marking
+        z_pos, x_pos, room4, walls, marks = [], [], [], [], []
+        half, quarter_walls, curves = [], [], []
+        for i, tile in enumerate(self.tiles):
+            z_pos.append(tile.zPos)
+            x_pos.append(tile.xPos)
+            room4.append(tile.room == 4)
+            walls.append((tile.topWall > 0) | (tile.rightWall > 0) << 1 |
+                         (tile.bottomWall > 0) << 2 | (tile.leftWall > 0) << 3)
+            if tile.type == "halfTile":
+                half.append(i)
+                quarter_walls += [_wall_bits(tile.tile1Walls),
+                                  _wall_bits(tile.tile2Walls),
+                                  _wall_bits(tile.tile3Walls),
+                                  _wall_bits(tile.tile4Walls)]
+                curves += [c if 1 <= c <= 4 else 0 for c in tile.curve]
+
+            # Floor markings, in order of precedence (last wins)
+            mark = CellCodec.EMPTY
+            if tile.trap: mark = CellCodec.HOLE
+            if tile.swamp: mark = CellCodec.SWAMP
+            if tile.checkpoint: mark = CellCodec.CHECKPOINT
+            if tile.start: mark = CellCodec.START
+            marks.append(_TILE_COLORS.get(tuple(tile.tileColor), mark))
+
+        # Flat answer matrix index of each tile's 5x5 cell block
+        rows = 4 * np.array(z_pos)[:, None] + _STAMP_ROWS
+        cols = 4 * np.array(x_pos)[:, None] + _STAMP_COLS
+        cells = np.ravel_multi_index((rows, cols), self.answerShape)
+        room4 = np.array(room4, dtype=bool)
+
+        # Value each tile leaves in its cells: 1 for walls, 0 for cells
+        # cleared by a curve, -1 for untouched cells. Curves are applied in
+        # order, after all straight walls
+        wall_stamps = _OUTER_WALL_STAMPS[walls]
+        if len(half) > 0:
+            quarter_walls = np.reshape(quarter_walls, (-1, 4))
+            for quarter in range(4):
+                wall_stamps[half] |= _QUARTER_WALL_STAMPS[quarter][
+                    quarter_walls[:, quarter]]
+        stamps = np.where(wall_stamps, 1, -1).astype(np.int8)
+
+        if len(half) > 0:
+            curves = np.reshape(curves, (-1, 4))
+            half_stamps = stamps[half]
+            for quarter in range(4):
+                half_stamps[_CURVE_SET[quarter][curves[:, quarter]]] = 1
+                half_stamps[_CURVE_CLEAR[quarter][curves[:, quarter]]] = 0
+            stamps[half] = half_stamps
+        stamps[room4] = -1
+
+        # Tiles share their border cells, so the last tile (in tile order) to
+        # touch a cell sets its value
+        touched = stamps >= 0
+        written_cells = cells[touched][::-1]
+        written_values = stamps[touched][::-1]
+        written_cells, last = np.unique(written_cells, return_index=True)
+        codes.flat[written_cells] = written_values[last] * CellCodec.WALL
+
+        # Room 4 area can't be overwritten by any other tile
+        codes.flat[cells[room4]] = CellCodec.ROOM_4
+
+        marks = np.array(marks, dtype=np.uint16)
+        marked = (marks != CellCodec.EMPTY) & ~room4
+        floor = cells[marked][:, _STAMP_FLOOR]
+        codes.flat[floor.ravel()] = np.repeat(marks[marked], floor.shape[1])
+
+        return codes
 
     def generateAnswer(self, debug = False):
         # try:
-            for tile in self.tiles:
-                x = 4*tile.xPos
-                z = 4*tile.zPos
-                room = tile.room
-
-                # Room 4
-                # self.answerMatrix[z+a][x+b] = '*'
-                if room == 4:
-                    for a in range(5):
-                        for b in range(5):
-                            self.answerMatrix[z+a][x+b] = '*'
-                    continue
-
-                # Wall
-                if tile.topWall > 0:
-                    self.setAnswer(z, x, 1)
-                    self.setAnswer(z, x+1, 1)
-                    self.setAnswer(z, x+2, 1)
-                    self.setAnswer(z, x+3, 1)
-                    self.setAnswer(z, x+4, 1)
-                if tile.bottomWall > 0:
-                    self.setAnswer(z+4, x, 1)
-                    self.setAnswer(z+4, x+1, 1)
-                    self.setAnswer(z+4, x+2, 1)
-                    self.setAnswer(z+4, x+3, 1)
-                    self.setAnswer(z+4, x+4, 1)
-                if tile.rightWall > 0:
-                    self.setAnswer(z, x+4, 1)
-                    self.setAnswer(z+1, x+4, 1)
-                    self.setAnswer(z+2, x+4, 1)
-                    self.setAnswer(z+3, x+4, 1)
-                    self.setAnswer(z+4, x+4, 1)
-                if tile.leftWall > 0:
-                    self.setAnswer(z, x, 1)
-                    self.setAnswer(z+1, x, 1)
-                    self.setAnswer(z+2, x, 1)
-                    self.setAnswer(z+3, x, 1)
-                    self.setAnswer(z+4, x, 1)
-                
-                ## Half wall
-                if tile.type == "halfTile":
-                    if tile.tile1Walls[0] > 0:
-                        self.setAnswer(z, x, 1)
-                        self.setAnswer(z, x+1, 1)
-                        self.setAnswer(z, x+2, 1)
-                    if tile.tile1Walls[1] > 0:
-                        self.setAnswer(z, x+2, 1)
-                        self.setAnswer(z+1, x+2, 1)
-                        self.setAnswer(z+2, x+2, 1)
-                    if tile.tile1Walls[2] > 0:
-                        self.setAnswer(z+2, x, 1)
-                        self.setAnswer(z+2, x+1, 1)
-                        self.setAnswer(z+2, x+2, 1)
-                    if tile.tile1Walls[3] > 0:
-                        self.setAnswer(z, x, 1)
-                        self.setAnswer(z+1, x, 1)
-                        self.setAnswer(z+2, x, 1)
-                    if tile.tile2Walls[0] > 0:
-                        self.setAnswer(z, x+2, 1)
-                        self.setAnswer(z, x+3, 1)
-                        self.setAnswer(z, x+4, 1)
-                    if tile.tile2Walls[1] > 0:
-                        self.setAnswer(z, x+4, 1)
-                        self.setAnswer(z+1, x+4, 1)
-                        self.setAnswer(z+2, x+4, 1)
-                    if tile.tile2Walls[2] > 0:
-                        self.setAnswer(z+2, x+2, 1)
-                        self.setAnswer(z+2, x+3, 1)
-                        self.setAnswer(z+2, x+4, 1)
-                    if tile.tile2Walls[3] > 0:
-                        self.setAnswer(z, x+2, 1)
-                        self.setAnswer(z+1, x+2, 1)
-                        self.setAnswer(z+2, x+2, 1)
-                    if tile.tile3Walls[0] > 0:
-                        self.setAnswer(z+2, x, 1)
-                        self.setAnswer(z+2, x+1, 1)
-                        self.setAnswer(z+2, x+2, 1)
-                    if tile.tile3Walls[1] > 0:
-                        self.setAnswer(z+2, x+2, 1)
-                        self.setAnswer(z+3, x+2, 1)
-                        self.setAnswer(z+4, x+2, 1)
-                    if tile.tile3Walls[2] > 0:
-                        self.setAnswer(z+4, x, 1)
-                        self.setAnswer(z+4, x+1, 1)
-                        self.setAnswer(z+4, x+2, 1)
-                    if tile.tile3Walls[3] > 0:
-                        self.setAnswer(z+2, x, 1)
-                        self.setAnswer(z+3, x, 1)
-                        self.setAnswer(z+4, x, 1)
-                    if tile.tile4Walls[0] > 0:
-                        self.setAnswer(z+2, x+2, 1)
-                        self.setAnswer(z+2, x+3, 1)
-                        self.setAnswer(z+2, x+4, 1)
-                    if tile.tile4Walls[1] > 0:
-                        self.setAnswer(z+2, x+4, 1)
-                        self.setAnswer(z+3, x+4, 1)
-                        self.setAnswer(z+4, x+4, 1)
-                    if tile.tile4Walls[2] > 0:
-                        self.setAnswer(z+4, x+2, 1)
-                        self.setAnswer(z+4, x+3, 1)
-                        self.setAnswer(z+4, x+4, 1)
-                    if tile.tile4Walls[3] > 0:
-                        self.setAnswer(z+2, x+2, 1)
-                        self.setAnswer(z+3, x+2, 1)
-                        self.setAnswer(z+4, x+2, 1)
-            
-                
-                    # Curved walls
-                    # Left top
-                    lt = tile.curve[0]
-                    if lt == 1:
-                        self.setAnswer(z, x, 1)
-                        self.setAnswer(z, x+1, 1)
-                        self.setAnswer(z, x+2, 0)
-                        self.setAnswer(z+1, x+2, 1)
-                        self.setAnswer(z+2, x+2, 1)
-                    if lt == 2:
-                        self.setAnswer(z+2, x, 1)
-                        self.setAnswer(z+2, x+1, 1)
-                        self.setAnswer(z+2, x+2, 0)
-                        self.setAnswer(z+1, x+2, 1)
-                        self.setAnswer(z, x+2, 1)
-                    if lt == 3:
-                        self.setAnswer(z, x, 1)
-                        self.setAnswer(z+1, x, 1)
-                        self.setAnswer(z+2, x, 0)
-                        self.setAnswer(z+2, x+1, 1)
-                        self.setAnswer(z+2, x+2, 1)
-                    if lt == 4:
-                        self.setAnswer(z+2, x, 1)
-                        self.setAnswer(z+1, x, 1)
-                        self.setAnswer(z, x, 0)
-                        self.setAnswer(z, x+1, 1)
-                        self.setAnswer(z, x+2, 1)
-                    
-                    # Right top
-                    rt = tile.curve[1]
-                    if rt == 1:
-                        self.setAnswer(z, x+2, 1)
-                        self.setAnswer(z, x+3, 1)
-                        self.setAnswer(z, x+4, 0)
-                        self.setAnswer(z+1, x+4, 1)
-                        self.setAnswer(z+2, x+4, 1)
-                    if rt == 2:
-                        self.setAnswer(z+2, x+2, 1)
-                        self.setAnswer(z+2, x+3, 1)
-                        self.setAnswer(z+2, x+4, 0)
-                        self.setAnswer(z+1, x+4, 1)
-                        self.setAnswer(z, x+4, 1)
-                    if rt == 3:
-                        self.setAnswer(z, x+2, 1)
-                        self.setAnswer(z+1, x+2, 1)
-                        self.setAnswer(z+2, x+2, 0)
-                        self.setAnswer(z+2, x+3, 1)
-                        self.setAnswer(z+2, x+4, 1)
-                    if rt == 4:
-                        self.setAnswer(z+2, x+2, 1)
-                        self.setAnswer(z+1, x+2, 1)
-                        self.setAnswer(z, x+2, 0)
-                        self.setAnswer(z, x+3, 1)
-                        self.setAnswer(z, x+4, 1)
-                    
-                    # Left bottom
-                    lb = tile.curve[2]
-                    if lb == 1:
-                        self.setAnswer(z+2, x, 1)
-                        self.setAnswer(z+2, x+1, 1)
-                        self.setAnswer(z+2, x+2, 0)
-                        self.setAnswer(z+3, x+2, 1)
-                        self.setAnswer(z+4, x+2, 1)
-                    if lb == 2:
-                        self.setAnswer(z+4, x, 1)
-                        self.setAnswer(z+4, x+1, 1)
-                        self.setAnswer(z+4, x+2, 0)
-                        self.setAnswer(z+3, x+2, 1)
-                        self.setAnswer(z+2, x+2, 1)
-                    if lb == 3:
-                        self.setAnswer(z+2, x, 1)
-                        self.setAnswer(z+3, x, 1)
-                        self.setAnswer(z+4, x, 0)
-                        self.setAnswer(z+4, x+1, 1)
-                        self.setAnswer(z+4, x+2, 1)
-                    if lb == 4:
-                        self.setAnswer(z+4, x, 1)
-                        self.setAnswer(z+3, x, 1)
-                        self.setAnswer(z+2, x, 0)
-                        self.setAnswer(z+2, x+1, 1)
-                        self.setAnswer(z+2, x+2, 1)
-                    
-                    # Right bottom
-                    rb = tile.curve[3]
-                    if rb == 1:
-                        self.setAnswer(z+2, x+2, 1)
-                        self.setAnswer(z+2, x+3, 1)
-                        self.setAnswer(z+2, x+4, 0)
-                        self.setAnswer(z+3, x+4, 1)
-                        self.setAnswer(z+4, x+4, 1)
-                    if rb == 2:
-                        self.setAnswer(z+4, x+2, 1)
-                        self.setAnswer(z+4, x+3, 1)
-                        self.setAnswer(z+4, x+4, 0)
-                        self.setAnswer(z+3, x+4, 1)
-                        self.setAnswer(z+2, x+4, 1)
-                    if rb == 3:
-                        self.setAnswer(z+2, x+2, 1)
-                        self.setAnswer(z+3, x+2, 1)
-                        self.setAnswer(z+4, x+2, 0)
-                        self.setAnswer(z+4, x+3, 1)
-                        self.setAnswer(z+4, x+4, 1)
-                    if rb == 4:
-                        self.setAnswer(z+4, x+2, 1)
-                        self.setAnswer(z+3, x+2, 1)
-                        self.setAnswer(z+2, x+2, 0)
-                        self.setAnswer(z+2, x+3, 1)
-                        self.setAnswer(z+2, x+4, 1)
-
-                if tile.trap:
-                    self.answerMatrix[z+1][x+1] = 2
-                    self.answerMatrix[z+1][x+3] = 2
-                    self.answerMatrix[z+3][x+1] = 2
-                    self.answerMatrix[z+3][x+3] = 2
-                if tile.swamp:
-                    self.answerMatrix[z+1][x+1] = 3
-                    self.answerMatrix[z+1][x+3] = 3
-                    self.answerMatrix[z+3][x+1] = 3
-                    self.answerMatrix[z+3][x+3] = 3
-                if tile.checkpoint:
-                    self.answerMatrix[z+1][x+1] = 4
-                    self.answerMatrix[z+1][x+3] = 4
-                    self.answerMatrix[z+3][x+1] = 4
-                    self.answerMatrix[z+3][x+3] = 4
-                if tile.start:
-                    self.answerMatrix[z+1][x+1] = 5
-                    self.answerMatrix[z+1][x+3] = 5
-                    self.answerMatrix[z+3][x+1] = 5
-                    self.answerMatrix[z+3][x+3] = 5
-                
-                if tile.tileColor == [0.0, 0.8, 0.0]: # Green
-                    # 1 to 4
-                    self.answerMatrix[z+1][x+1] = 'g'
-                    self.answerMatrix[z+1][x+3] = 'g'
-                    self.answerMatrix[z+3][x+1] = 'g'
-                    self.answerMatrix[z+3][x+3] = 'g'
-                elif tile.tileColor == [0.1, 0.1, 0.9]: # Blue
-                    # 1 to 2
-                    self.answerMatrix[z+1][x+1] = 'b'
-                    self.answerMatrix[z+1][x+3] = 'b'
-                    self.answerMatrix[z+3][x+1] = 'b'
-                    self.answerMatrix[z+3][x+3] = 'b'
-                elif tile.tileColor == [0.3, 0.1, 0.6]: # Purple
-                    # 2 to 3
-                    self.answerMatrix[z+1][x+1] = 'p'
-                    self.answerMatrix[z+1][x+3] = 'p'
-                    self.answerMatrix[z+3][x+1] = 'p'
-                    self.answerMatrix[z+3][x+3] = 'p'
-                elif tile.tileColor == [0.9, 0.1, 0.1]: # Red
-                    # 3 to 4
-                    self.answerMatrix[z+1][x+1] = 'r'
-                    self.answerMatrix[z+1][x+3] = 'r'
-                    self.answerMatrix[z+3][x+1] = 'r'
-                    self.answerMatrix[z+3][x+3] = 'r'
-                elif tile.tileColor == [0.9, 0.6, 0.1]: # Orange
-                    # 2 to 4
-                    self.answerMatrix[z+1][x+1] = 'o'
-                    self.answerMatrix[z+1][x+3] = 'o'
-                    self.answerMatrix[z+3][x+1] = 'o'
-                    self.answerMatrix[z+3][x+3] = 'o'
-                elif tile.tileColor == [0.9, 0.9, 0.1]: # Yellow
-                    # 1 to 3
-                    self.answerMatrix[z+1][x+1] = 'y'
-                    self.answerMatrix[z+1][x+3] = 'y'
-                    self.answerMatrix[z+3][x+1] = 'y'
-                    self.answerMatrix[z+3][x+3] = 'y'
-            
+            codes = self._stamp_tiles()
+            self.answerMatrix = CellCodec().decode(codes).tolist()
+
             # Victims & Hazards
             signs = self.victims + self.hazards
 
@@ -506,16 +395,14 @@ class MapAnswer:
                         row_temp += 2
 
 
-                # Concatenate if victims on either side of the wall
-                if self.answerMatrix[row_temp][col_temp] != '*':
-                    if type(self.answerMatrix[row_temp][col_temp]) == str:
-                        self.answerMatrix[row_temp][col_temp] += victimType
-                    else:
+                # Concatenate if victims on either side of the wall (or on a
+                # room connection tile), otherwise replace the cell
+                cell = self.answerMatrix[row_temp][col_temp]
+                if cell != '*':
+                    if cell.isdigit():
                         self.answerMatrix[row_temp][col_temp] = victimType
-                    
-            
-            for i in range(len(self.answerMatrix)):
-                self.answerMatrix[i] = list(map(str, self.answerMatrix[i]))
+                    else:
+                        self.answerMatrix[row_temp][col_temp] += victimType
             
             # DO NOT PRINT MAP PROGRAMMATICALLY
             if debug:
@@ -3,15 +3,51 @@
 # to teams for the outputted map
 # matrix.
 
+import struct
+
 import numpy as np
 import numpy.typing as npt
 
 from typing import Optional
 from typing import Union
+from typing import cast
 
 from MapAnswer import Color
+from CellCodec import CellCodec
 from ConsoleLog import Console
 
+# Submission alignment modes:
+#   - ALIGN_START: align via the start tile ('5'), the first one found if
+#     there are multiple
+#   - ALIGN_FALLBACK: align via the start tile if both maps hold exactly one
+#     start tile (a start tile is marked by up to 4 '5' cells), otherwise via
+#     map feature cross-correlation
+#   - ALIGN_BEST: try both, keeping whichever alignment scores highest
+ALIGN_START: str = "start"
+ALIGN_FALLBACK: str = "fallback"
+ALIGN_BEST: str = "best"
+ALIGN_MODES: list[str] = [ALIGN_START, ALIGN_FALLBACK, ALIGN_BEST]
+
+# Map feature categories reported in the score breakdown, along with the
+# feature bit of each. Connection tiles and room 4 area cells are
+# categorised by their room bits.
+_CATEGORY_BITS: list[tuple[str, int]] = [
+    ("wall", CellCodec.WALL),
+    ("hole", CellCodec.HOLE),
+    ("swamp", CellCodec.SWAMP),
+    ("checkpoint", CellCodec.CHECKPOINT),
+    ("start", CellCodec.START),
+    ("victim H", CellCodec.VICTIM_H),
+    ("victim U", CellCodec.VICTIM_U),
+    ("victim S", CellCodec.VICTIM_S),
+    ("hazard F", CellCodec.HAZARD_F),
+    ("hazard P", CellCodec.HAZARD_P),
+    ("hazard C", CellCodec.HAZARD_C),
+    ("hazard O", CellCodec.HAZARD_O),
+]
+MAP_CATEGORIES: list[str] = ([name for name, _ in _CATEGORY_BITS] +
+                             ["connection", "room 4"])
+
 
 def pretty_print_correct_matrix(
     map: Union[list, npt.NDArray], 
@@ -25,6 +61,8 @@ def pretty_print_correct_matrix(
         correct_map (Union[list, npt.NDArray]): Binary matrix representing which
         map features are correct (1 for correct, 0 for incorrect)
     """
+    # Keep the map after any buffered console output
+    Console.flush()
     for i in range(len(map)):
         for j in range(len(map[0])):
             bg: str = Color.BG_RED
@@ -40,18 +78,73 @@ def _get_start_instance(matrix: npt.NDArray) -> Optional[npt.NDArray]:
     tile char '5'.
 
     Args:
-        matrix (npt.NDArray): Map matrix
+        matrix (npt.NDArray): Encoded map matrix
 
     Returns:
         Optional[npt.NDArray]: Matrix coordinate of the first occurrence 
         of the start tile char '5'. None if no start tile char was found.
     """
-    n, m = matrix.shape
-    for y in range(n):
-        for x in range(m):
-            if matrix[y, x] == '5':
-                return np.array([y, x])
-    return None
+    starts: npt.NDArray = np.flatnonzero(matrix == CellCodec.START)
+    if len(starts) == 0:
+        return None
+    return np.array(np.unravel_index(starts[0], matrix.shape))
+
+
+def _count_start_tiles(matrix: npt.NDArray) -> int:
+    """Counts the start tiles marked in a map matrix. A start tile is marked
+    by the '5' cells on its floor (4 in a generated answer), at most 2 cells
+    apart, so start cells within 2 cells of each other are counted as one
+    tile.
+
+    Args:
+        matrix (npt.NDArray): Encoded map matrix
+
+    Returns:
+        int: Number of start tiles
+    """
+    cells: list[tuple[int, int]] = list(
+        zip(*np.nonzero(matrix == CellCodec.START)))
+    tiles: int = 0
+    unvisited: set[tuple[int, int]] = set(cells)
+    for cell in cells:
+        if cell not in unvisited:
+            continue
+        tiles += 1
+        unvisited.discard(cell)
+        stack: list[tuple[int, int]] = [cell]
+        while stack:
+            y, x = stack.pop()
+            near: list[tuple[int, int]] = [
+                c for c in unvisited
+                if abs(c[0] - y) <= 2 and abs(c[1] - x) <= 2]
+            unvisited.difference_update(near)
+            stack += near
+    return tiles
+
+
+def _in_shift_window(
+    answer_shape: tuple[int, ...],
+    sub_shape: tuple[int, ...],
+    dy: int,
+    dx: int,
+) -> bool:
+    """Checks if a shift keeps the answer within the window a submission is
+    allowed to be shifted over: the submission padded by its own size on
+    every side (3n x 3m). Alignments outside of it score 0.
+
+    Args:
+        answer_shape (tuple[int, ...]): Answer matrix shape
+        sub_shape (tuple[int, ...]): Submission matrix shape
+        dy (int): Shift by y direction
+        dx (int): Shift by x direction
+
+    Returns:
+        bool: True if the shift is within the window
+    """
+    n, m = sub_shape
+    an, am = answer_shape
+    return (0 <= n - dy and n - dy + an <= 3 * n and
+            0 <= m - dx and m - dx + am <= 3 * m)
 
 
 def _shift_matrix(
@@ -59,15 +152,21 @@ def _shift_matrix(
     sub_matrix: npt.NDArray,
     dy: int,
     dx: int,
+    out: Optional[npt.NDArray] = None,
 ) -> npt.NDArray:
-    """Shifts the submission matrix by a given x,y amount. The matrix size stays
-    the same and empty space from the shift is filled with 0s.
+    """Shifts the submission matrix by a given x,y amount, into a matrix the
+    same shape as the answer matrix. Only the window of the submission 
+    overlapping the answer is copied, and any empty space from the shift is 
+    filled with empty cells.
 
     Args:
-        answer_matrix (npt.NDArray): Answer matrix
-        sub_matrix (npt.NDArray): Submission matrix to be shifted
-        dy (int): Shift by x direction
-        dx (int): Shift by y direction
+        answer_matrix (npt.NDArray): Encoded answer matrix
+        sub_matrix (npt.NDArray): Encoded submission matrix to be shifted
+        dy (int): Shift by y direction
+        dx (int): Shift by x direction
+        out (Optional[npt.NDArray], optional): Answer shaped buffer to write
+        the shifted matrix into. A new matrix is allocated if None. 
+        Defaults to None.
 
     Returns:
         npt.NDArray: Shifted matrix
@@ -75,30 +174,36 @@ def _shift_matrix(
     n, m = sub_matrix.shape
     an, am = answer_matrix.shape
 
-    big_sub_matrix = np.full((n * 3, m * 3), '0', dtype=sub_matrix.dtype)
-    big_sub_matrix[n:2*n, m:2*m] = sub_matrix
+    if out is None:
+        out = np.full((an, am), CellCodec.EMPTY, dtype=sub_matrix.dtype)
+    else:
+        out.fill(CellCodec.EMPTY)
 
-    x = m - (dx)
-    y = n - (dy)
-    return big_sub_matrix[y:y+an, x:x+am]
+    # Bounds of the submission window within the answer matrix
+    y0, y1 = max(dy, 0), min(an, n + dy)
+    x0, x1 = max(dx, 0), min(am, m + dx)
+    if y0 < y1 and x0 < x1:
+        out[y0:y1, x0:x1] = sub_matrix[y0 - dy:y1 - dy, x0 - dx:x1 - dx]
+    return out
 
 
-def _align(
+def _start_shift(
     answer_matrix: npt.NDArray,
     sub_matrix: npt.NDArray,
 ) -> npt.NDArray:
-    """Aligns the sub_matrix with the answer_matrix via the start tile
+    """Gets the shift aligning the sub_matrix with the answer_matrix via the
+    start tile
 
     Args:
-        answer_matrix (npt.NDArray): Answer matrix to align to
-        sub_matrix (npt.NDArray): Submission matrix to align
+        answer_matrix (npt.NDArray): Encoded answer matrix to align to
+        sub_matrix (npt.NDArray): Encoded submission matrix to align
 
     Raises:
         Exception: No starting tile found in the answer matrix
         Exception: No starting tile found in the submitted map
 
     Returns:
-        npt.NDArray: Shifted matrix aligned via the start tile of the two matrices
+        npt.NDArray: y,x shift aligning the start tile of the two matrices
     """
     ans_con_pos = _get_start_instance(answer_matrix)
     if ans_con_pos is None:
@@ -107,9 +212,180 @@ def _align(
     if sub_con_pos is None:
         raise Exception("No starting tile('5') was found on the submitted map")
 
-    d_pos: npt.NDArray = ans_con_pos - sub_con_pos
+    return ans_con_pos - sub_con_pos
+
+
+def _align(
+    answer_matrix: npt.NDArray,
+    sub_matrix: npt.NDArray,
+    out: Optional[npt.NDArray] = None,
+) -> npt.NDArray:
+    """Aligns the sub_matrix with the answer_matrix via the start tile
+
+    Args:
+        answer_matrix (npt.NDArray): Encoded answer matrix to align to
+        sub_matrix (npt.NDArray): Encoded submission matrix to align
+        out (Optional[npt.NDArray], optional): Answer shaped buffer to write
+        the aligned matrix into. Defaults to None.
+
+    Raises:
+        Exception: No starting tile found in the answer matrix
+        Exception: No starting tile found in the submitted map
+
+    Returns:
+        npt.NDArray: Shifted matrix aligned via the start tile of the two matrices
+    """
+    d_pos: npt.NDArray = _start_shift(answer_matrix, sub_matrix)
+    return _shift_matrix(answer_matrix, sub_matrix, *d_pos, out=out)
+
+
+def _fft_length(n: int) -> int:
+    """Gets the smallest FFT friendly length (only having prime factors 2, 3
+    and 5) of at least n. FFTs of lengths with large prime factors are slow.
+
+    Args:
+        n (int): Minimum length
+
+    Returns:
+        int: FFT length
+    """
+    best: int = 1 << max(n - 1, 0).bit_length()
+    p5: int = 1
+    while p5 < best:
+        p35: int = p5
+        while p35 < best:
+            length: int = p35
+            while length < n:
+                length *= 2
+            best = min(best, length)
+            p35 *= 3
+        p5 *= 5
+    return best
+
+
+def _correlation_shifts(
+    answer_matrices: npt.NDArray,
+    sub_matrix: npt.NDArray,
+) -> npt.NDArray:
+    """Finds the shift of the sub_matrix that best aligns it with each of a
+    stack of answer matrices, by the number of matching non empty cells.
+
+    Every shift is scored at once with an FFT cross-correlation of one-hot
+    planes (one per cell value found in both matrices, e.g. the wall plane),
+    so this is O(N log N) in the padded map size rather than O(N^2).
 
-    return _shift_matrix(answer_matrix, sub_matrix, *d_pos)
+    Args:
+        answer_matrices (npt.NDArray): (k, n, m) stack of encoded answer
+        matrices to align to
+        sub_matrix (npt.NDArray): Encoded submission matrix to align
+
+    Returns:
+        npt.NDArray: (k, 2) y,x shifts for each answer matrix
+    """
+    k, n, m = answer_matrices.shape
+    p, q = sub_matrix.shape
+    # Pad to at least the full correlation size, so shifts don't wrap around
+    shape: tuple[int, int] = (_fft_length(n + p - 1), _fft_length(m + q - 1))
+
+    values: npt.NDArray = np.intersect1d(answer_matrices, sub_matrix)
+    values = values[values != CellCodec.EMPTY]
+    if len(values) == 0:
+        return np.zeros((k, 2), dtype=int)
+
+    ans_planes: npt.NDArray = (
+        answer_matrices[:, np.newaxis] == values[:, np.newaxis, np.newaxis]
+    ).astype(np.float32)
+    sub_planes: npt.NDArray = (
+        sub_matrix == values[:, np.newaxis, np.newaxis]
+    ).astype(np.float32)
+
+    # Correlation is linear, so the planes can be summed in the frequency
+    # domain and only one inverse transform is needed per answer matrix
+    spectrum: npt.NDArray = (
+        np.fft.rfft2(ans_planes, s=shape) *
+        np.conj(np.fft.rfft2(sub_planes, s=shape))
+    ).sum(axis=1)
+    correlation: npt.NDArray = np.fft.irfft2(spectrum, s=shape)
+
+    # Index (i, j) of the correlation is the shift (i, j), with negative
+    # shifts wrapped around to the end
+    best: npt.NDArray = correlation.reshape(k, -1).argmax(axis=1)
+    dy, dx = np.unravel_index(best, shape)
+    dy = np.where(dy >= n, dy - shape[0], dy)
+    dx = np.where(dx >= m, dx - shape[1], dx)
+    return np.stack([dy, dx], axis=1)
+
+
+def _compare_cells(
+    answer_matrix: npt.NDArray,
+    sub_matrix: npt.NDArray,
+) -> tuple[npt.NDArray, npt.NDArray, npt.NDArray]:
+    """Compares every cell of two equally shaped encoded map matrices at once
+
+    A cell is ignored if both matrices are empty ('0') there, or the answer
+    holds the legacy room 4 marker ('20'). Cells holding two victims (one on
+    either side of a wall) encode to the same value in either order, so all
+    cells are compared with plain equality.
+
+    Args:
+        answer_matrix (npt.NDArray): Encoded answer matrix to check against
+        sub_matrix (npt.NDArray): Encoded submission matrix to compare
+
+    Returns:
+        tuple[npt.NDArray, npt.NDArray, npt.NDArray]: Boolean masks of the
+        correct, incorrect and ignored cells
+    """
+    ignored: npt.NDArray = (
+        ((answer_matrix == CellCodec.EMPTY) & (sub_matrix == CellCodec.EMPTY)) |
+        (answer_matrix == CellCodec.LEGACY_ROOM_4)
+    )
+    equal: npt.NDArray = answer_matrix == sub_matrix
+
+    return equal & ~ignored, ~equal & ~ignored, ignored
+
+
+def _calculate_batch_completeness(
+    answer_matrices: npt.NDArray,
+    sub_matrices: npt.NDArray,
+    padding: Optional[npt.NDArray] = None,
+) -> tuple[npt.NDArray, npt.NDArray]:
+    """
+    Calculate the completeness scores of a stack of matrices, compared to a
+    stack of answer matrices of the same shape, in a single pass
+
+    Args:
+        answer_matrices (npt.NDArray): (k, n, m) stack of encoded answer
+        matrices to check against
+        sub_matrices (npt.NDArray): (k, n, m) stack of encoded matrices to
+        compare
+        padding (Optional[npt.NDArray], optional): Boolean (k, n, m) mask of
+        padding cells that aren't part of the answer, and so are ignored.
+        Defaults to None.
+
+    Returns:
+        tuple[npt.NDArray, npt.NDArray]: tuple of the k completeness scores
+        and the (k, n, m) stack of correct/incorrect map feature positions
+    """
+    correct, incorrect, ignored = _compare_cells(answer_matrices, sub_matrices)
+    if padding is not None:
+        correct &= ~padding
+        incorrect &= ~padding
+        ignored |= padding
+
+    # Correct matrix used to store positions of correctly identified map 
+    # positions (1 for correct, 0 for incorrect and 2 for ignored)
+    correct_matrices: npt.NDArray = np.where(ignored, 2, correct.astype(int))
+
+    num_correct: npt.NDArray = np.count_nonzero(correct, axis=(1, 2))
+    num_total: npt.NDArray = num_correct + np.count_nonzero(incorrect,
+                                                            axis=(1, 2))
+
+    # Calculate completeness as a ratio of the correct count over the sum of
+    # the correct count and incorrect count
+    scores: npt.NDArray = np.divide(num_correct, num_total,
+                                    out=np.zeros(len(num_total)),
+                                    where=num_total > 0)
+    return scores, correct_matrices
 
 
 def _calculate_completeness(
@@ -121,88 +397,298 @@ def _calculate_completeness(
     another
 
     Args:
-        answer_matrix (npt.NDArray): answer matrix to check against
-        subMatrix (npt.NDArray): matrix to compare
+        answer_matrix (npt.NDArray): encoded answer matrix to check against
+        subMatrix (npt.NDArray): encoded matrix to compare
 
     Returns:
         tuple[float, npt.NDArray]: tuple of completeness score and matrix of 
         correct/incorrect map feature positions 
     """
-    correct: int = 0
-    incorrect: int = 0
-
     if answer_matrix.shape != sub_matrix.shape:
         return 0, np.array([])
-    
-    # Correct matrix used to store positions of correctly identified map 
-    # positions
-    correct_matrix: npt.NDArray = np.full(sub_matrix.shape, 0)
-
-    for i in range(len(answer_matrix)):
-        for j in range(len(answer_matrix[0])):
-            # If the cells are equal
-            if not ((sub_matrix[i][j] == '0' and answer_matrix[i][j] == '0') or
-                    answer_matrix[i][j] == '20'):
-                if sub_matrix[i][j] == answer_matrix[i][j]:
-                    correct += 1
-                    correct_matrix[i][j] = 1
-                # if a victim is on either side of the wall
-                elif len(answer_matrix[i][j]) == 2:
-                    if (sub_matrix[i][j] == answer_matrix[i][j] or
-                            sub_matrix[i][j] == answer_matrix[i][j][::-1]):
-                        correct += 1
-                        correct_matrix[i][j] = 1
-                    else:
-                        incorrect += 1
-                else:
-                    incorrect += 1
-            else:
-                correct_matrix[i][j] = 2
 
-    # Calculate completeness as a ratio of the correct count over the sum of
-    # the correct count and incorrect count
-    return (correct / (correct + incorrect)), correct_matrix
+    scores, correct_matrices = _calculate_batch_completeness(
+        answer_matrix[np.newaxis], sub_matrix[np.newaxis])
+    return float(scores[0]), correct_matrices[0]
+
+
+def _categorise(features: npt.NDArray) -> npt.NDArray:
+    """Gets which map categories each set of cell features belongs to
+
+    Args:
+        features (npt.NDArray): 1D array of cell feature bits
+
+    Returns:
+        npt.NDArray: (n, len(MAP_CATEGORIES)) boolean category membership
+    """
+    rooms: npt.NDArray = features & CellCodec.ROOMS
+    columns: list[npt.NDArray] = [(features & bit) != 0
+                                  for _, bit in _CATEGORY_BITS]
+    # Connection tiles hold two room bits, room 4 area cells just one
+    columns.append((rooms & (rooms - 1)) != 0)
+    columns.append(rooms == CellCodec.ROOM_4)
+    return np.stack(columns, axis=1)
+
+
+def _calculate_breakdown(
+    answer_matrix: npt.NDArray,
+    sub_matrix: npt.NDArray,
+    correct_matrix: npt.NDArray,
+    codec: CellCodec,
+) -> dict[str, dict[str, int]]:
+    """Calculates a per map category confusion summary of an aligned
+    submission. Cells are counted by each distinct (answer, submission) cell
+    pair, so categorising only has to be done once per pair.
+
+    Args:
+        answer_matrix (npt.NDArray): Encoded answer matrix
+        sub_matrix (npt.NDArray): Encoded submission matrix, aligned with the
+        answer matrix
+        correct_matrix (npt.NDArray): Matrix of correct/incorrect map feature
+        positions (1 for correct, 0 for incorrect and 2 for ignored)
+        codec (CellCodec): Codec the matrices were encoded with
+
+    Returns:
+        dict[str, dict[str, int]]: For each of `MAP_CATEGORIES`, the number of
+        `correct` and `missed` answer cells of that category, and the number
+        of `extra` submitted cells of that category where the answer has none
+    """
+    scored: npt.NDArray = correct_matrix != 2
+    pairs: npt.NDArray = ((answer_matrix[scored].astype(np.uint32) << 16) |
+                          sub_matrix[scored])
+    pairs, counts = np.unique(pairs, return_counts=True)
+    answers: npt.NDArray = (pairs >> 16).astype(np.uint16)
+    subs: npt.NDArray = (pairs & 0xFFFF).astype(np.uint16)
+
+    equal: npt.NDArray = (answers == subs)[:, np.newaxis]
+    ans_categories: npt.NDArray = _categorise(codec.features(answers))
+    sub_categories: npt.NDArray = _categorise(codec.features(subs))
+
+    correct: npt.NDArray = counts @ (ans_categories & equal)
+    missed: npt.NDArray = counts @ (ans_categories & ~equal)
+    extra: npt.NDArray = counts @ (sub_categories & ~ans_categories)
+
+    return {
+        name: {"correct": int(correct[i]), "missed": int(missed[i]),
+               "extra": int(extra[i])}
+        for i, name in enumerate(MAP_CATEGORIES)
+    }
+
+
+def format_breakdown(breakdown: dict[str, dict[str, int]]) -> str:
+    """Formats a map score breakdown as a single line summary, e.g.
+    `wall 120/130 (+2 extra) | victim H 1/2`. Categories not present in either
+    map are left out.
+
+    Args:
+        breakdown (dict[str, dict[str, int]]): Map score breakdown
+
+    Returns:
+        str: Breakdown summary
+    """
+    parts: list[str] = []
+    for name, counts in breakdown.items():
+        total: int = counts["correct"] + counts["missed"]
+        if total == 0 and counts["extra"] == 0:
+            continue
+        part: str = f"{name} {counts['correct']}/{total}"
+        if counts["extra"] > 0:
+            part += f" (+{counts['extra']} extra)"
+        parts.append(part)
+    return " | ".join(parts)
+
+
+def _dihedral_stack(
+    matrix: npt.NDArray,
+    mirror: bool = False,
+) -> tuple[npt.NDArray, npt.NDArray]:
+    """Stacks the 4 90 degree rotations of a matrix (and optionally the mirror
+    images of each rotation) into a single 3D array. Matrices are padded to
+    a common square shape, anchored at the top left corner.
+
+    Args:
+        matrix (npt.NDArray): Matrix to transform
+        mirror (bool, optional): Whether to also include mirrored 
+        transforms. Defaults to False.
+
+    Returns:
+        tuple[npt.NDArray, npt.NDArray]: (k, s, s) stack of transformed 
+        matrices, and a boolean mask of the padding cells in the stack
+    """
+    transforms: list[npt.NDArray] = [np.rot90(matrix, k=i, axes=(1, 0))
+                                     for i in range(4)]
+    if mirror:
+        transforms += [np.fliplr(t) for t in transforms]
+
+    size: int = max(matrix.shape)
+    stack: npt.NDArray = np.full((len(transforms), size, size),
+                                 CellCodec.EMPTY, dtype=matrix.dtype)
+    padding: npt.NDArray = np.ones(stack.shape, dtype=bool)
+    for i, transform in enumerate(transforms):
+        n, m = transform.shape
+        stack[i, :n, :m] = transform
+        padding[i, :n, :m] = False
+    return stack, padding
+
+
+def _get_alignment_shifts(
+    answers: npt.NDArray,
+    shapes: list[tuple[int, ...]],
+    sub_matrix: npt.NDArray,
+    align: str,
+) -> tuple[npt.NDArray, list[npt.NDArray]]:
+    """Gets the candidate shifts to align the submission with each answer
+    transform
+
+    Args:
+        answers (npt.NDArray): (k, s, s) stack of encoded answer transforms
+        shapes (list[tuple[int, ...]]): Unpadded shape of each transform
+        sub_matrix (npt.NDArray): Encoded submission matrix to align
+        align (str): Alignment mode, one of `ALIGN_MODES`
+
+    Raises:
+        ValueError: Invalid alignment mode
+        Exception: No starting tile found, when aligning via the start tile
+
+    Returns:
+        tuple[npt.NDArray, list[npt.NDArray]]: Answer transform index and y,x
+        shift of each candidate alignment
+    """
+    if align not in ALIGN_MODES:
+        raise ValueError(f"Invalid alignment mode: {align}")
+
+    # Every answer transform holds the same number of start tiles
+    ans_starts: int = _count_start_tiles(answers[0])
+    sub_starts: int = _count_start_tiles(sub_matrix)
+
+    if align == ALIGN_START:
+        use_start, use_correlation = True, False
+    elif align == ALIGN_FALLBACK:
+        use_start = ans_starts == 1 and sub_starts == 1
+        use_correlation = not use_start
+    else:
+        use_start = ans_starts > 0 and sub_starts > 0
+        use_correlation = True
+
+    indices: list[int] = []
+    shifts: list[npt.NDArray] = []
+    if use_start:
+        for i, (n, m) in enumerate(shapes):
+            indices.append(i)
+            shifts.append(_start_shift(answers[i, :n, :m], sub_matrix))
+    if use_correlation:
+        indices += range(len(answers))
+        shifts += list(_correlation_shifts(answers, sub_matrix))
+    return np.array(indices), shifts
 
 
 def _calculate_map_completeness(
     answer_matrix: npt.NDArray,
     sub_matrix: npt.NDArray,
-) -> float:
+    codec: CellCodec,
+    mirror: bool = False,
+    align: str = ALIGN_FALLBACK,
+    breakdown: bool = False,
+) -> tuple[float, Optional[dict[str, dict[str, int]]]]:
     """
     Calculate completeness of submitted map area matrix. 4x 90 degree rotations
     are tried to account for the submission matrix being submitted in the wrong
-    orientation.
+    orientation. All rotations (and candidate alignments) are scored together
+    in one batch. Alignments shifting the answer outside of the submission
+    padded by its own size on every side score 0, as they always have.
 
     Args:
-        answer_matrix (int): specifies which map to score
-        sub_matrix (npt.NDArray): team submitted array
+        answer_matrix (npt.NDArray): encoded answer matrix to score against
+        sub_matrix (npt.NDArray): encoded team submitted array
+        codec (CellCodec): codec the matrices were encoded with
+        mirror (bool, optional): Whether to also try mirror images of each
+        rotation, to tolerate mirrored submissions. Defaults to False.
+        align (str, optional): How to align the submission with the answer,
+        one of `ALIGN_MODES`. Defaults to ALIGN_FALLBACK.
+        breakdown (bool, optional): Whether to also calculate the per map
+        category breakdown of the best scoring alignment. Defaults to False.
 
     Returns:
-        float: completeness score
+        tuple[float, Optional[dict[str, dict[str, int]]]]: completeness score,
+        and the score breakdown if requested
     """
-    completeness_list: list[float] = []
+    answers, padding = _dihedral_stack(answer_matrix, mirror)
+    shapes: list[tuple[int, ...]] = [
+        answer_matrix.shape if i % 2 == 0 else answer_matrix.shape[::-1]
+        for i in range(len(answers))
+    ]
+    indices, shifts = _get_alignment_shifts(answers, shapes, sub_matrix,
+                                            align)
+
+    # Shift the submission for each candidate alignment, writing straight
+    # into one reused answer shaped buffer
+    aligned: npt.NDArray = np.full((len(indices), *answers.shape[1:]),
+                                   CellCodec.EMPTY, dtype=sub_matrix.dtype)
+    outside: npt.NDArray = np.zeros(len(indices), dtype=bool)
+    for j, (i, shift) in enumerate(zip(indices, shifts)):
+        n, m = shapes[i]
+        if not _in_shift_window((n, m), sub_matrix.shape, *shift):
+            outside[j] = True
+            continue
+        _shift_matrix(answers[i, :n, :m], sub_matrix, *shift,
+                      out=aligned[j, :n, :m])
+
+    scores, correct_matrices = _calculate_batch_completeness(
+        answers[indices], aligned, padding[indices])
+    scores[outside] = 0
+
+    if Console.debug_enabled():
+        for j, i in enumerate(indices):
+            n, m = shapes[i]
+            Console.log_debug(f"Printing aligned correct matrix for "
+                              f"{'mirrored ' if i >= 4 else ''}rotation "
+                              f"{(i % 4) * 90} degrees, shifted by "
+                              f"{tuple(shifts[j])} with score {scores[j]}")
+            pretty_print_correct_matrix(codec.decode(aligned[j, :n, :m]),
+                                        correct_matrices[j, :n, :m])
 
-    for i in range(0, 4):
-        answer_matrix = np.rot90(answer_matrix, k=i, axes=(1, 0))
-        aligned_sub_matrix = _align(answer_matrix, sub_matrix)
+    # Return the highest score
+    best: int = int(scores.argmax())
+    if not breakdown:
+        return float(scores[best]), None
+    return float(scores[best]), _calculate_breakdown(
+        answers[indices[best]], aligned[best], correct_matrices[best], codec)
 
-        completeness, correct_matrix = _calculate_completeness(answer_matrix, 
-                                                      aligned_sub_matrix)
-        completeness_list.append(completeness)
-        
-        if Console.DEBUG_MODE and len(correct_matrix) > 0:
-            Console.log_debug(f"Printing aligned correct matrix for rotation "
-                              f"{i * 90} degrees with score {completeness}")
-            pretty_print_correct_matrix(aligned_sub_matrix, correct_matrix)
-            
 
-    # Return the highest score
-    return max(completeness_list)
+def decode_map_data(data: bytes) -> npt.NDArray:
+    """Decode a map matrix sent by a competitor's robot. The format sent
+    should be:
+
+        data = b'_____ _________________'
+                 ^          ^
+               shape     map data
+
+    where shape is two packed integers, and map data is the comma separated
+    matrix cells.
+
+    Args:
+        data (bytes): Map data bytes
+
+    Raises:
+        struct.error: Raised if the shape data is malformed
+        ValueError: Raised if the map data doesn't match the given shape
+
+    Returns:
+        npt.NDArray: Submitted map matrix
+    """
+    # Shape data should be two bytes (2 integers)
+    shape: tuple[int, int] = struct.unpack('2i', data[:8])
+    # Get map data
+    map_data: list[str] = data[8:].decode('utf-8').split(',')
+    # Reshape data using the shape data given
+    return np.array(map_data).reshape(shape)
 
 
 def calculateScore(
     answer_matrices: Union[list, npt.NDArray],
-    sub_matrix: Union[list, npt.NDArray]
+    sub_matrix: Union[list, npt.NDArray],
+    mirror: bool = False,
+    align: str = ALIGN_FALLBACK,
 ) -> float:
     """
     Calculate the quantifiable completeness score of a matrix, compared to
@@ -211,9 +697,53 @@ def calculateScore(
     Args:
         answer_matrix (Union[list, npt.NDArray]): answer matrix to check against
         subMatrix (Union[list, npt.NDArray]): matrix to compare
+        mirror (bool, optional): Whether to also accept mirror images of the
+        map. Defaults to False.
+        align (str, optional): How to align the submission with the answer,
+        one of `ALIGN_MODES`. By default the start tile is used, falling back
+        to aligning by map features when either map doesn't hold exactly one
+        start tile. Defaults to ALIGN_FALLBACK.
 
     Returns:
         float: completeness score
     """
-    return _calculate_map_completeness(np.array(answer_matrices), 
-                                       np.array(sub_matrix))
+    # Both matrices must share a codec, so escape codes for unusual cells
+    # (e.g. 'HH') match between them
+    codec: CellCodec = CellCodec()
+    score, _ = _calculate_map_completeness(codec.encode(answer_matrices),
+                                           codec.encode(sub_matrix),
+                                           codec,
+                                           mirror,
+                                           align)
+    return score
+
+
+def calculateScoreBreakdown(
+    answer_matrices: Union[list, npt.NDArray],
+    sub_matrix: Union[list, npt.NDArray],
+    mirror: bool = False,
+    align: str = ALIGN_FALLBACK,
+) -> tuple[float, dict[str, dict[str, int]]]:
+    """
+    Calculate the quantifiable completeness score of a matrix, compared to
+    another, along with a per map category breakdown of the best scoring
+    alignment, computed in the same pass
+
+    Args:
+        answer_matrix (Union[list, npt.NDArray]): answer matrix to check against
+        subMatrix (Union[list, npt.NDArray]): matrix to compare
+        mirror (bool, optional): Whether to also accept mirror images of the
+        map. Defaults to False.
+        align (str, optional): How to align the submission with the answer,
+        one of `ALIGN_MODES`. Defaults to ALIGN_FALLBACK.
+
+    Returns:
+        tuple[float, dict[str, dict[str, int]]]: completeness score, and for
+        each of `MAP_CATEGORIES` the number of `correct`, `missed` and `extra`
+        cells
+    """
+    codec: CellCodec = CellCodec()
+    score, breakdown = _calculate_map_completeness(
+        codec.encode(answer_matrices), codec.encode(sub_matrix), codec,
+        mirror, align, breakdown=True)
+    return score, cast(dict[str, dict[str, int]], breakdown)
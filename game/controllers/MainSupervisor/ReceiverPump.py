@@ -0,0 +1,144 @@
+"""Draining and dispatching of packets received from the competitor's robot"""
+
+from __future__ import annotations
+
+from typing import Callable, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from controller import Receiver
+
+
+class ReceiverPump:
+    """Drains every packet queued on a Webots receiver each step, classifying
+    each packet by its length and header and dispatching it to the handler
+    registered for its kind. Packets are handled in the order they were
+    received.
+
+    Counts of each packet kind, and the highest queue length seen, are kept
+    for diagnostics.
+    """
+
+    # Packet kinds
+    EXIT: str = "exit"
+    MAP: str = "map"
+    LOP: str = "lack of progress"
+    GAME_INFO: str = "game info"
+    VICTIM: str = "victim"
+    MAP_DATA: str = "map data"
+    TEST_STAGE: str = "test stage"
+    UNKNOWN: str = "unknown"
+    # Not a packet kind, counts packets discarded unhandled
+    DROPPED: str = "dropped"
+
+    # Single byte command packets
+    _COMMANDS: dict[bytes, str] = {
+        b'E': EXIT,
+        b'M': MAP,
+        b'L': LOP,
+        b'G': GAME_INFO,
+    }
+
+    def __init__(self, receiver: Receiver, test_stages: bool = False):
+        """Creates a new receiver pump
+
+        Args:
+            receiver (Receiver): Webots receiver to drain
+            test_stages (bool, optional): Whether to classify 8 byte packets
+            as test runner stage packets. Defaults to False.
+        """
+        self._receiver: Receiver = receiver
+        self.test_stages: bool = test_stages
+        self._handlers: dict[str, Callable[[bytes], None]] = {}
+
+        self.counts: dict[str, int] = {}
+        self.high_water: int = 0
+
+    def register(self, kind: str, handler: Callable[[bytes], None]) -> None:
+        """Registers the handler for a packet kind
+
+        Args:
+            kind (str): Packet kind (e.g. `ReceiverPump.VICTIM`)
+            handler (Callable[[bytes], None]): Function called with the raw
+            packet bytes
+        """
+        self._handlers[kind] = handler
+
+    def classify(self, data: bytes) -> str:
+        """Gets the kind of a packet, from its length and header
+
+        Args:
+            data (bytes): Raw packet bytes
+
+        Returns:
+            str: Packet kind
+        """
+        if len(data) == 1:
+            return self._COMMANDS.get(data, ReceiverPump.UNKNOWN)
+        # Victim identification packets are packed as 'i i c'
+        if len(data) == 9:
+            return ReceiverPump.VICTIM
+        if self.test_stages and len(data) == 8:
+            return ReceiverPump.TEST_STAGE
+        return ReceiverPump.MAP_DATA
+
+    def pump(
+        self,
+        should_continue: Optional[Callable[[], bool]] = None
+    ) -> int:
+        """Handles every packet waiting in the receiver queue
+
+        Args:
+            should_continue (Optional[Callable[[], bool]], optional): Checked
+            before each packet is handled. Once it returns False (e.g. a
+            handled packet ended the match), the remaining queued packets are
+            dropped without being handled. Defaults to None (handle every
+            packet).
+
+        Returns:
+            int: Number of packets handled
+        """
+        queued: int = self._receiver.getQueueLength()
+        self.high_water = max(self.high_water, queued)
+
+        handled: int = 0
+        while self._receiver.getQueueLength() > 0:
+            if should_continue is not None and not should_continue():
+                self.drop()
+                break
+            data: bytes = self._receiver.getBytes()
+            self._receiver.nextPacket()
+
+            kind: str = self.classify(data)
+            self.counts[kind] = self.counts.get(kind, 0) + 1
+            handler = self._handlers.get(kind)
+            if handler is not None:
+                handler(data)
+            handled += 1
+        return handled
+
+    def drop(self) -> int:
+        """Discards every packet waiting in the receiver queue, without
+        handling them
+
+        Returns:
+            int: Number of packets dropped
+        """
+        dropped: int = 0
+        while self._receiver.getQueueLength() > 0:
+            self._receiver.nextPacket()
+            dropped += 1
+        if dropped:
+            self.counts[ReceiverPump.DROPPED] = (
+                self.counts.get(ReceiverPump.DROPPED, 0) + dropped)
+        return dropped
+
+    def get_stats(self) -> str:
+        """Gets a summary of the packets handled
+
+        Returns:
+            str: Packet counts by kind and the queue length high water mark
+        """
+        counts: str = ", ".join(f"{kind}: {count}"
+                                for kind, count in self.counts.items())
+        return (f"Receiver: {counts or 'no packets'} "
+                f"(max queue length {self.high_water})")
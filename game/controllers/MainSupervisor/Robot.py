@@ -6,7 +6,6 @@ import datetime
 import os
 import shutil
 import filecmp
-import struct
 import numpy as np
 
 from controller import Supervisor
@@ -18,6 +17,10 @@ from ConsoleLog import Console
 from Tile import Checkpoint, StartTile, TileManager
 from Config import Config
 from ErebusObject import ErebusObject
+from EventLog import EventKind
+from Logger import Logger
+from FieldCache import FieldCache
+from Trajectory import Trajectory
 
 
 
@@ -78,9 +81,19 @@ class RobotHistory(ErebusObject, Queue):
         # Update list with data in format [game time, event data]
         record: tuple[str, str] = (minute, data)
         self.master_history.append(record)
+        Logger.log_event(record)
 
         return record
 
+    def log(self, data: str) -> None:
+        """Record game data within the game log only, without sending it to
+        the robot window history
+
+        Args:
+            data (str): Data to record
+        """
+        self._update_master_history(data)
+
     def enqueue(self, data: str):
         """Enqueue game data to the end of the robot's history queue, and update
         any relevant UI components.
@@ -103,6 +116,26 @@ class RobotHistory(ErebusObject, Queue):
             self._erebus.setLabel(2, history_label, 0.7, 0, 0.05, 0xfbc531, 0.2) # type: ignore
 
 
+class RobotState:
+    """Snapshot of the robot's physical state at one simulation step. Taken
+    once per step, so every supervisor check within a step shares the same
+    controller API reads.
+    """
+
+    def __init__(self, node: Node, translation: Field, rotation: Field):
+        """Snapshots the robot's state from its Webots node
+
+        Args:
+            node (Node): Webots robot node
+            translation (Field): Robot node's translation field
+            rotation (Field): Robot node's rotation field
+        """
+        self.position: list[float] = translation.getSFVec3f()
+        self.rotation: list[float] = rotation.getSFRotation()
+        self.velocity: list[float] = node.getVelocity()
+        self.stopped: bool = all(abs(ve) < 0.001 for ve in self.velocity)
+
+
 class Robot(ErebusObject):
     """Robot object used to store and process data about the competitor's
     robot in the simulation
@@ -119,6 +152,7 @@ class Robot(ErebusObject):
         self._wb_node: Node
         self.wb_translationField: Field
         self.wb_rotationField: Field
+        self._state: Optional[RobotState] = None
 
         self.name: str = "NO_TEAM_NAME"
         self.in_simulation: bool = False
@@ -130,11 +164,9 @@ class Robot(ErebusObject):
 
         self._score: float = 0
 
-        self._stopped: bool = False
-        self._robot_time_stopped: float = 0
-        self._stopped_time: Optional[float] = None
+        # Motion history, used for stop times
+        self.trajectory: Trajectory = Trajectory()
 
-        self.message: list[Any] = []
         self.map_data = np.array([])
         self.sent_maps: bool = False
         self.map_score_percent: float = 0
@@ -148,35 +180,57 @@ class Robot(ErebusObject):
             tuple[float,float, float]] = None
         self.visited_checkpoints: list = []
 
+    @property
+    def state(self) -> RobotState:
+        """Robot state for the current simulation step. The state is
+        snapshotted on first use, and kept until the simulation steps or the
+        robot is moved.
+        """
+        if self._state is None:
+            self._state = RobotState(self._wb_node, self.wb_translationField,
+                                     self.wb_rotationField)
+        return self._state
+
+    def invalidate_state(self) -> None:
+        """Discards the robot state snapshot, so it is read again from Webots
+        on next use
+        """
+        self._state = None
+
     @property
     def position(self) -> list[float]:
-        return self.wb_translationField.getSFVec3f()
+        return list(self.state.position)
 
     @position.setter
     def position(self, pos: list[float]) -> None:
         self.wb_translationField.setSFVec3f(pos)
+        self.invalidate_state()
+        self.trajectory.break_path()
 
     @property
     def rotation(self) -> list[float]:
-        return self.wb_rotationField.getSFRotation()
+        return list(self.state.rotation)
 
     @rotation.setter
     def rotation(self, pos: list[float]) -> None:
         self.wb_rotationField.setSFRotation(pos)
+        self.invalidate_state()
         
     @property
     def velocity(self) -> list[float]:
-        return self._wb_node.getVelocity()
+        return list(self.state.velocity)
         
     def reset_physics(self) -> None:
         """Stops the inertia of the robot and its descendants.
         """
         self._wb_node.resetPhysics()
+        self.invalidate_state()
         
     def remove_node(self) -> None:
         """Removes the robot from the Webots scene tree
         """
         self._wb_node.remove()
+        self.invalidate_state()
 
     def set_node(self, node: Node) -> None:
         """Sets the robot's webots node object
@@ -185,8 +239,12 @@ class Robot(ErebusObject):
             node (Node): Webots node object associated with the robot
         """
         self._wb_node: Node = node
-        self.wb_translationField: Field = self._wb_node.getField('translation')
-        self.wb_rotationField: Field = self._wb_node.getField('rotation')
+        self._fields: FieldCache = FieldCache(node)
+        self.wb_translationField: Field = self._fields.field('translation')
+        self.wb_rotationField: Field = self._fields.field('rotation')
+        self.invalidate_state()
+        # Motion of any previous node isn't this robot's
+        self.trajectory.clear()
 
     def set_max_velocity(self, vel: float) -> None:
         """Set the max angular velocity the robot can move at.
@@ -195,16 +253,17 @@ class Robot(ErebusObject):
             vel (float): Maximum angular velocity
         """
         # TODO this doesn't actually work...
-        self._wb_node.getField('wheel_mult').setSFFloat(vel)
-
-    def _is_stopped(self) -> bool:
-        """Returns whether the robot has stopped moving
+        self._fields.set('wheel_mult', 'SFFloat', vel)
 
-        Returns:
-            bool: True if the robot is not moving (still)
+    def update_trajectory(self) -> None:
+        """Records the robot's motion for the current simulation step. Should
+        be called once per step. Nothing is recorded if the simulation time
+        hasn't advanced (e.g. while paused).
         """
-        vel: list[float] = self._wb_node.getVelocity()
-        return all(abs(ve) < 0.001 for ve in vel)
+        state: RobotState = self.state
+        self.trajectory.push(self._erebus.getTime(), state.position,
+                             state.velocity, state.stopped,
+                             self._erebus.tile_manager.get_tile(state.position))
 
     def time_stopped(self) -> float:
         """Gets the amount of time the robot has been stopped for in seconds.
@@ -212,38 +271,31 @@ class Robot(ErebusObject):
         Returns:
             float: Time stopped, in seconds
         """
-        self._stopped = self._is_stopped()
+        return self.trajectory.time_stopped()
 
-        # if it isn't stopped yet
-        if self._stopped_time == None:
-            if self._stopped:
-                # get time the robot stopped
-                self._stopped_time = self._erebus.getTime()
-        else:
-            # if its stopped
-            if self._stopped:
-                # get current time
-                current_time: float = self._erebus.getTime()
-                # calculate the time the robot stopped
-                self._robot_time_stopped = current_time - self._stopped_time
-            else:
-                # if it's no longer stopped, reset variables
-                self._stopped_time = None
-                self._robot_time_stopped = 0.0
-        return self._robot_time_stopped
+    def stopped_for(self, seconds: float) -> bool:
+        """Checks if the robot has been stopped for at least some time
+
+        Args:
+            seconds (float): Time, in seconds
+
+        Returns:
+            bool: True if stopped for at least the given time
+        """
+        return self.trajectory.stopped_for(seconds)
 
     def reset_time_stopped(self) -> None:
         """Resets the amount of time recorded for being stopped
         """
-        self._robot_time_stopped = 0.0
-        self._stopped = False
-        self._stopped_time = None
+        self.trajectory.reset_stopped()
 
     def increase_score(
         self,
         message: str,
         score: float,
         multiplier: float = 1,
+        kind: EventKind = EventKind.OTHER,
+        position: Optional[list[float]] = None,
     ) -> None:
         """Increases the robots score. The primary method used to increase the
         robots competition score.
@@ -254,6 +306,11 @@ class Robot(ErebusObject):
             multiplier (float, optional): Score multiplier (`new_score = 
             score * multiplier`), used for room score multipliers.
             Defaults to 1.
+            kind (EventKind, optional): Kind of scoring event, for the match
+            event log. Defaults to EventKind.OTHER.
+            position (Optional[list[float]], optional): Position the points
+            were scored at (e.g. a victim's), for the match event log.
+            Defaults to the robot's position.
         """
         point: float = round(score * multiplier, 2)
         if point > 0.0:
@@ -263,6 +320,47 @@ class Robot(ErebusObject):
         self._score += point
         if self._score < 0:
             self._score = 0
+        self._log_score_event(kind, message, point, multiplier, position)
+
+    def _log_score_event(
+        self,
+        kind: EventKind,
+        message: str,
+        points: float,
+        multiplier: float,
+        position: Optional[list[float]]
+    ) -> None:
+        """Writes a scoring event to the match event log
+
+        Args:
+            kind (EventKind): Kind of scoring event
+            message (str): Event message
+            points (float): Points scored
+            multiplier (float): Score multiplier applied
+            position (Optional[list[float]]): Position the points were scored
+            at, or None for the robot's position
+        """
+        if position is None and self.in_simulation:
+            position = self.position
+
+        room: Optional[int] = None
+        if position is not None:
+            tile_manager: TileManager = self._erebus.tile_manager
+            if tile_manager.get_tile(position) is not None:
+                room = tile_manager.get_room(position)
+            position = [round(p, 4) for p in position]
+
+        Logger.log_match_event({
+            "sim_time": round(self.history.time_elapsed, 3),
+            "real_time": round(self._erebus.real_time_elapsed, 3),
+            "kind": kind.value,
+            "message": message,
+            "points": points,
+            "multiplier": multiplier,
+            "room": room,
+            "position": position,
+            "score": round(self._score, 2),
+        })
 
     def get_score(self) -> float:
         """Gets the robot's current score
@@ -272,21 +370,6 @@ class Robot(ErebusObject):
         """
         return self._score
 
-    def get_log_str(self) -> str:
-        """Gets a string of all events the robot has done during the simulation
-
-        Returns:
-            str: String of event records, separated by a new line. Each record
-            is in the form (minute, event message)
-        """
-        # Create a string of all events that the robot has done
-        history: list[tuple[str, str]] = self.history.master_history
-        log_str: str = ""
-        for event in history:
-            log_str += str(event[0]) + " " + event[1] + "\n"
-
-        return log_str
-    
     def set_start_pos(self, start_tile: StartTile) -> None:
         '''Set robot starting position'''
 
@@ -328,64 +411,6 @@ class Robot(ErebusObject):
         # Set robot rotation, rotating around y axis
         self.rotation = [0., 1., 0., direction]
 
-    def set_message(self, received_data: bytes) -> None:
-        """Formats received emitter/receiver packet data to a format useful
-        for the different message types available for the competitors to use
-
-        Args:
-            received_data (bytes): Byte data received from the competitor's
-            robot's emitter
-        """
-
-        # Get length of bytes
-        data_len: int = len(received_data)
-        Console.log_debug(f"Data: {received_data} with length {data_len}")
-        try:
-            if data_len == 1:
-                tup = struct.unpack('c', received_data)
-                self.message = [tup[0].decode("utf-8")]
-            # Victim identification bytes data should be of length = 9
-            elif data_len == 9:
-                # Unpack data
-                tup: tuple[Any, ...] = struct.unpack('i i c', received_data)
-
-                # Get data in format:
-                # (est. x position, est. z position, est. victim type)
-                x = tup[0]
-                z = tup[1]
-
-                estimated_victim_position: tuple[float, ...] = (x / 100,
-                                                                0,
-                                                                z / 100)
-
-                victimType = tup[2].decode("utf-8")
-
-                # Store data recieved
-                self.message = [estimated_victim_position, victimType]
-            else:
-                """
-                    For map data, the format sent should be:
-
-                    receivedData = b'_____ _________________'
-                                    ^          ^
-                                    shape     map data
-                """
-                # Shape data should be two bytes (2 integers)
-                shape_bytes: bytes = received_data[:8]  # Get shape of matrix
-                data_bytes: bytes = received_data[8::]  # Get data of matrix
-
-                # Get shape data
-                shape: tuple[int, int] = struct.unpack('2i', shape_bytes)
-                # Get map data
-                map_data = data_bytes.decode('utf-8').split(',')
-                # Reshape data using the shape data given
-                reshaped_data = np.array(map_data).reshape(shape)
-
-                self.map_data = reshaped_data
-        except Exception as e:
-            Console.log_err("Incorrect data format sent")
-            Console.log_err(str(e))
-
     def update_time_elapsed(self, time_elapsed: float) -> None:
         """Updates the robot's history with the current time elapsed. Used to
         keep the history's record timestamps up to date.
@@ -454,15 +479,13 @@ class Robot(ErebusObject):
             self.visited_checkpoints.append(checkpoint.center)
 
             # Update robot's points and history
-            grid: int = TileManager.coord2grid(checkpoint.center, self._erebus)
-            room_num: int = (
-                self._erebus.getFromDef("WALLTILES")
-                .getField("children")
-                .getMFNode(grid) # type: ignore
-                .getField("room").getSFInt32() - 1
+            multiplier: float = (
+                self._erebus.tile_manager.get_room_multiplier(
+                    checkpoint.center)
             )
-            self.increase_score("Found checkpoint", 10, 
-                                multiplier=TileManager.ROOM_MULT[room_num])
+            self.increase_score("Found checkpoint", 10, multiplier=multiplier,
+                                kind=EventKind.CHECKPOINT,
+                                position=list(checkpoint.center))
 
     def update_in_swamp(self, in_swamp: bool, default_multiplier: float) -> None:
         """Updates the game's timer countdown multiplier when in a swamp.
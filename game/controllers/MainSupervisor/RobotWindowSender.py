@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from collections import OrderedDict, deque
+from typing import Hashable, Optional, TYPE_CHECKING
+
 from ConsoleLog import Console
 from ErebusObject import ErebusObject
-
-from typing import TYPE_CHECKING
+from Logger import Logger
 
 if TYPE_CHECKING:
     from MainSupervisor import Erebus
@@ -13,17 +15,89 @@ class RWSender(ErebusObject):
     """Object for sending message to the robot window. Records history of 
     messages sent, in the case that they must be all re-sent (e.g. if the
     robot window is reloaded)  
+
+    The history is kept compacted: commands that set a piece of robot window
+    state (e.g. the score/time update) only keep their latest message, and
+    append-only messages (e.g. history updates) are kept up to a limit. So
+    re-sending the history takes one message per piece of state, rather than
+    one per message ever sent.
     """
 
-    def __init__(self, erebus: Erebus):
+    # Commands that set robot window state, mapped to the state they set. Only
+    # the latest message for each state is kept in the history. Commands are
+    # deliberately merged into one state where a later one fully replaces the
+    # effect of an earlier one:
+    #   - version: the version label (plain, latest, outdated or unreleased)
+    #   - controller0/1: a robot's loaded/unloaded controller buttons
+    #   - run: the run/pause buttons of a local controller run
+    #   - remote: the remote controller toggle
+    # Docker runs are kept as two states, so a replay still starts the run
+    # (runDockerPressed) before marking it as started (dockerSuccess).
+    _STATE_KEYS: dict[str, str] = {
+        "startup": "startup",
+        "update": "update",
+        "config": "config",
+        "currentWorld": "currentWorld",
+        "worlds": "worlds",
+        "ended": "ended",
+        "version": "version",
+        "latest": "version",
+        "outdated": "version",
+        "unreleased": "version",
+        "loaded0": "controller0",
+        "unloaded0": "controller0",
+        "loaded1": "controller1",
+        "unloaded1": "controller1",
+        "runPressed": "run",
+        "pausedPressed": "run",
+        "runDockerPressed": "runDocker",
+        "dockerSuccess": "dockerSuccess",
+        "remoteEnabled": "remote",
+        "remoteDisabled": "remote",
+        "robotInSimulation0": "robotInSimulation0",
+        "robotNotInSimulation0": "robotInSimulation0",
+    }
+
+    # Commands that set the state of one robot's controller, given by the
+    # robot id in their args. The latest message is kept per robot.
+    _ROBOT_STATE_KEYS: dict[str, str] = {
+        "loadControllerPressed,": "controllerPressed",
+        "unloadControllerPressed,": "controllerPressed",
+    }
+
+    def __init__(
+        self,
+        erebus: Erebus,
+        max_events: int = 1024,
+        max_log_records: int = 1024
+    ):
         """Initialises a new robot window message sensor object
 
         Args:
             erebus (Erebus): Erebus supervisor game object
+            max_events (int, optional): Maximum number of append-only messages
+            kept in the history. Defaults to 1024.
+            max_log_records (int, optional): Maximum number of recent records
+            kept for the debug log. Defaults to 1024.
         """
         super().__init__(erebus)
-        self.history: list[list[str]] = []
-        self.log_history: list[str] = []
+        # Messages to re-send, in the order they were (last) sent, keyed by
+        # the state they set or by a sequence number for append-only messages
+        self._history: OrderedDict[Hashable, tuple[str, str]] = OrderedDict()
+        self._event_keys: deque[int] = deque()
+        self._max_events: int = max_events
+        self._event_count: int = 0
+        # Recent debug log records. Records are streamed to the debug log
+        # file as they happen, these are only used to start a new log file
+        # with the messages sent before the match
+        self.log_history: deque[str] = deque(maxlen=max_log_records)
+
+    @property
+    def history(self) -> list[list[str]]:
+        """Messages that would be re-sent to the robot window, in order, each
+        as [command, args]
+        """
+        return [[command, args] for command, args in self._history.values()]
 
     def _update_log_history(self, command: str, args: str = '') -> None:
         """Update rws history for outputting to debug logs
@@ -33,7 +107,9 @@ class RWSender(ErebusObject):
             args (str, optional): Optional args associated with the robot window
             command. Defaults to ''.
         """
-        self.log_history.append(f"{command}\t{args}")
+        record: str = f"{command}\t{args}"
+        self.log_history.append(record)
+        Logger.log_rws(record)
 
     def update_history(self, command: str, args: str = '') -> None:
         """Updates the robot window message history
@@ -43,7 +119,20 @@ class RWSender(ErebusObject):
             args (str, optional): Optional args associated with the robot window
             command. Defaults to ''.
         """
-        self.history.append([command, args])
+        key: Optional[Hashable] = RWSender._STATE_KEYS.get(command)
+        if command in RWSender._ROBOT_STATE_KEYS:
+            key = (RWSender._ROBOT_STATE_KEYS[command], args)
+        if key is None:
+            key = self._event_count
+            self._event_count += 1
+            self._event_keys.append(key)
+            if len(self._event_keys) > self._max_events:
+                del self._history[self._event_keys.popleft()]
+        else:
+            # Replace the previous message setting the state, moving it to
+            # the end to keep it in order with the other messages
+            self._history.pop(key, None)
+        self._history[key] = (command, args)
         self._update_log_history(command, args)
         
     def update_received_history(self, command: str, args: str = '') -> None:
@@ -66,7 +155,7 @@ class RWSender(ErebusObject):
             command. Defaults to ''.
         """
         wwi_msg: str = f"{command},{args}"
-        Console.log_debug(f"Sent wwi message: {wwi_msg}")
+        Console.log_debug("Sent wwi message: %s", wwi_msg)
         self._erebus.wwiSendText(wwi_msg)
         self.update_history(command, args)
 
@@ -75,5 +164,5 @@ class RWSender(ErebusObject):
         case the browser window is reloaded, and thus the previous state
         must be recreated.
         """
-        for command, args in self.history:
+        for command, args in list(self._history.values()):
             self._erebus.wwiSendText(f"{command},{args}")
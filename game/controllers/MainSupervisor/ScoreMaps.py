@@ -0,0 +1,236 @@
+"""Command line tool to batch score submitted map matrices against world
+answers, without running Webots. Used to re-score competition rounds.
+
+Submissions are files holding the raw map data bytes a robot sends to the
+supervisor (packed shape, then comma separated cells). Submissions within a
+sub directory named after a world are scored against that world's answer,
+and submissions at the top level of the submissions directory are scored
+against every answer.
+
+Answers can be given as world files (.wbt), answer matrices saved as .npy
+(e.g. a compiled world bundle's `answer.npy`) or .json matrices.
+
+Example:
+    python ScoreMaps.py submissions/ ../../worlds/*.wbt -o scores.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import sys
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Optional, TextIO
+
+import numpy as np
+import numpy.typing as npt
+
+import MapScorer
+from ConsoleLog import Console
+
+# Answer matrices loaded by each worker process, keyed by world name
+_answers: dict[str, npt.NDArray] = {}
+_mirror: bool = False
+_align: str = MapScorer.ALIGN_FALLBACK
+
+
+def get_answer_name(path: str) -> str:
+    """Gets the world name of an answer file. Bundled answers are named after
+    their bundle directory.
+
+    Args:
+        path (str): Answer file path
+
+    Returns:
+        str: World name
+    """
+    name: str = os.path.splitext(os.path.basename(path))[0]
+    if name == "answer":
+        return os.path.basename(os.path.dirname(os.path.abspath(path)))
+    return name
+
+
+def load_answer(path: str) -> npt.NDArray:
+    """Loads an answer matrix from a world, .npy or .json file
+
+    Args:
+        path (str): Answer file path
+
+    Raises:
+        ValueError: Raised if the file type isn't supported, or an answer
+        couldn't be generated for a world
+
+    Returns:
+        npt.NDArray: Answer matrix
+    """
+    ext: str = os.path.splitext(path)[1]
+    if ext == ".wbt":
+        from WorldParser import World
+        answer: Optional[list[list[str]]] = (
+            World(path).to_map_answer().generateAnswer()
+        )
+        if answer is None:
+            raise ValueError(f"Could not generate answer matrix for {path}")
+        return np.array(answer)
+    if ext == ".npy":
+        return np.load(path)
+    if ext == ".json":
+        with open(path, 'r') as f:
+            return np.array(json.load(f))
+    raise ValueError(f"Unsupported answer file: {path}")
+
+
+def _init_worker(answer_paths: list[str], mirror: bool, align: str) -> None:
+    global _answers, _mirror, _align
+    _answers = {get_answer_name(p): load_answer(p) for p in answer_paths}
+    _mirror = mirror
+    _align = align
+
+
+def _score(job: tuple[str, str]) -> dict:
+    submission, world = job
+    row: dict = {"submission": submission, "world": world,
+                 "score": None, "error": None}
+    try:
+        with open(submission, 'rb') as f:
+            sub_matrix: npt.NDArray = MapScorer.decode_map_data(f.read())
+        row["score"] = MapScorer.calculateScore(_answers[world], sub_matrix,
+                                                _mirror, _align)
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+    return row
+
+
+def find_jobs(
+    submissions_dir: str,
+    worlds: list[str]
+) -> Iterator[tuple[str, str]]:
+    """Finds the (submission path, world name) pairs to score
+
+    Args:
+        submissions_dir (str): Directory of submission files
+        worlds (list[str]): World names of the loaded answers
+
+    Yields:
+        Iterator[tuple[str, str]]: Submission path and world name to score
+        it against
+    """
+    for entry in sorted(os.scandir(submissions_dir), key=lambda e: e.name):
+        if entry.is_file():
+            for world in worlds:
+                yield entry.path, world
+        elif entry.is_dir() and entry.name in worlds:
+            for sub in sorted(os.scandir(entry.path), key=lambda e: e.name):
+                if sub.is_file():
+                    yield sub.path, entry.name
+
+
+def score_submissions(
+    submissions_dir: str,
+    answer_paths: list[str],
+    mirror: bool = False,
+    align: str = MapScorer.ALIGN_FALLBACK,
+    max_workers: Optional[int] = None,
+) -> Iterator[dict]:
+    """Scores all submissions in a directory in a process pool. Answer
+    matrices are loaded once by each worker process.
+
+    Args:
+        submissions_dir (str): Directory of submission files
+        answer_paths (list[str]): Answer files to score against
+        mirror (bool, optional): Whether to also accept mirror images of the
+        map. Defaults to False.
+        align (str, optional): Submission alignment mode, one of
+        `MapScorer.ALIGN_MODES`. Defaults to MapScorer.ALIGN_FALLBACK.
+        max_workers (Optional[int], optional): Maximum number of worker
+        processes. Defaults to the number of processors.
+
+    Yields:
+        Iterator[dict]: Result row for each submission, in submission order,
+        holding the submission path, world name, score and any error
+    """
+    worlds: list[str] = [get_answer_name(p) for p in answer_paths]
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             initializer=_init_worker,
+                             initargs=(answer_paths, mirror, align)) as executor:
+        yield from executor.map(_score, find_jobs(submissions_dir, worlds),
+                                chunksize=16)
+
+
+def write_rows(rows: Iterator[dict], out: TextIO, format: str) -> int:
+    """Streams result rows to a file as they are scored
+
+    Args:
+        rows (Iterator[dict]): Result rows
+        out (TextIO): Output file
+        format (str): Output format, `csv` or `jsonl`
+
+    Returns:
+        int: Number of rows written
+    """
+    writer: Optional[csv.DictWriter] = None
+    count: int = 0
+    for row in rows:
+        if format == "csv":
+            if writer is None:
+                writer = csv.DictWriter(out, fieldnames=list(row.keys()))
+                writer.writeheader()
+            writer.writerow(row)
+        else:
+            out.write(json.dumps(row) + '\n')
+        out.flush()
+        count += 1
+    return count
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Batch score submitted Erebus map matrices")
+    parser.add_argument("submissions",
+                        help="Directory of submitted map data files")
+    parser.add_argument("answers", nargs='+',
+                        help="World (.wbt) or answer matrix (.npy/.json) "
+                        "files to score against")
+    parser.add_argument("-o", "--output",
+                        help="Output file. Defaults to stdout")
+    parser.add_argument("-f", "--format", choices=["csv", "jsonl"],
+                        help="Output format. Defaults to the output file "
+                        "extension, or csv")
+    parser.add_argument("-m", "--mirror", action="store_true",
+                        help="Also accept mirror images of the map")
+    parser.add_argument("-a", "--align", choices=MapScorer.ALIGN_MODES,
+                        default=MapScorer.ALIGN_FALLBACK,
+                        help="How submissions are aligned with the answer")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Number of worker processes")
+    args = parser.parse_args(argv)
+
+    format: str = args.format or (
+        "jsonl" if args.output and args.output.endswith(".jsonl") else "csv"
+    )
+
+    # Fail early on bad answers, rather than within every worker
+    for path in args.answers:
+        try:
+            load_answer(path)
+        except (OSError, ValueError) as e:
+            Console.log_err(f"Unable to load answer {path}: {e}")
+            return 1
+
+    rows: Iterator[dict] = score_submissions(args.submissions, args.answers,
+                                             args.mirror, args.align,
+                                             args.jobs)
+    if args.output is None:
+        write_rows(rows, sys.stdout, format)
+    else:
+        with open(args.output, 'w', newline='') as f:
+            count: int = write_rows(rows, f, format)
+        Console.log_info(f"Scored {count} submissions to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -239,18 +239,9 @@ class TestVictim(Test):
                              "the victim is too large (from rounding errors)")
             return True
 
-        grid: int = self._erebus.tile_manager.coord2grid(
-            self._victim.wb_translation_field.getSFVec3f(),
-            self._erebus
+        multiplier: float = self._erebus.tile_manager.get_room_multiplier(
+            self._victim.wb_translation_field.getSFVec3f()
         )
-        room_num: int = (
-            self._erebus.getFromDef("WALLTILES")
-            .getField("children")
-            .getMFNode(grid) # type: ignore
-            .getField("room")
-            .getSFInt32() - 1
-        )
-        multiplier: float = self._erebus.tile_manager.ROOM_MULT[room_num]
         
         # Test time stopped, if too short, no points should be awarded
         if (self._erebus.getTime() - self._start_time) < 1:
@@ -346,18 +337,8 @@ class TestCheckpoint(Test):
             self.set_test_report("Could not find checkpoint")
             return False
 
-        grid: int = self._erebus.tile_manager.coord2grid(
-            self._checkpoint.center, self._erebus)
-        room_num: int = (
-            self._erebus
-            .getFromDef("WALLTILES")
-            .getField("children")
-            .getMFNode(grid) # type: ignore
-            .getField("room")
-            .getSFInt32() - 1
-        )
-
-        multiplier = self._erebus.tile_manager.ROOM_MULT[room_num]
+        multiplier: float = self._erebus.tile_manager.get_room_multiplier(
+            self._checkpoint.center)
         return (self._erebus.robot_obj.get_score() ==
                 self._start_score + (10 * multiplier))
 
@@ -1,11 +1,28 @@
 from controller import Supervisor
 from Tools import get_file_path
+from CellCodec import CellCodec
 import os
 
 import numpy as np
+import numpy.typing as npt
 from PIL import Image
 
 
+def get_thumbnail_path(world_path: str) -> str:
+    """Gets the path of a world's thumbnail, used within the world selector UI
+
+    Args:
+        world_path (str): Path to the world .wbt file
+
+    Returns:
+        str: Path to the world thumbnail
+    """
+    path = get_file_path(
+        "plugins/robot_windows/MainSupervisorWindow/thumbnails",
+        "../../plugins/robot_windows/MainSupervisorWindow/thumbnails")
+    return os.path.join(path, os.path.split(world_path)[1][:-4]+'.png')
+
+
 def export_map_to_img(
     supervisor: Supervisor,
     map: list[list[str]]
@@ -16,27 +33,15 @@ def export_map_to_img(
         supervisor (Supervisor): Game supervisor
         map (list[list[str]]): Erebus map answer matrix
     """
-    img_array: list[int] = []
-
-    for row in map:
-        for element in row:
-            if element == '*':
-                img_array.append(128)
-            elif element == '1':
-                img_array.append(0)
-            elif element.isdigit():
-                img_array.append(255)
-            else:
-                img_array.append(0)
-
-    img_np_array = np.array(img_array)
-    img_np_array = np.reshape(img_np_array, (len(map), len(map[0])))
-    im = Image.fromarray(img_np_array.astype(np.uint8))
-
-    path = get_file_path(
-        "plugins/robot_windows/MainSupervisorWindow/thumbnails",
-        "../../plugins/robot_windows/MainSupervisorWindow/thumbnails")
-    path = os.path.join(path, 
-                        os.path.split(supervisor.getWorldPath())[1][:-4]+'.png')
-
-    im.save(path, 'png')
+    codec: CellCodec = CellCodec()
+    codes: npt.NDArray = codec.encode(map)
+
+    # Room 4 area is grey, walls and non numeric (e.g. victim) cells are black
+    # and all other floor cells white
+    img_np_array: npt.NDArray = np.zeros(codes.shape, dtype=np.uint8)
+    img_np_array[codec.isdigit(codes)] = 255
+    img_np_array[codes == CellCodec.WALL] = 0
+    img_np_array[codes == CellCodec.ROOM_4] = 128
+    im = Image.fromarray(img_np_array)
+
+    im.save(get_thumbnail_path(supervisor.getWorldPath()), 'png')
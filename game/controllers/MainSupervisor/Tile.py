@@ -1,17 +1,22 @@
 from __future__ import annotations
 
+import math
 from abc import ABC
 from abc import abstractmethod
-from controller import Supervisor
 from controller import Node
 
-from typing import TYPE_CHECKING
+import numpy as np
+import numpy.typing as npt
+
+from typing import Callable, Optional, TypeVar, TYPE_CHECKING
 
 from ConsoleLog import Console
 from ErebusObject import ErebusObject
+from FieldCache import FieldCache
 
 if TYPE_CHECKING:
     from MainSupervisor import Erebus
+    from WorldBundle import WorldBundle
 
 
 class Tile(ABC):
@@ -96,6 +101,7 @@ class StartTile(Tile):
     ) -> None:
         super().__init__(min, max, center)
         self._wb_node: Node = wb_node
+        self._fields: FieldCache = FieldCache(wb_node)
         
     def set_visible(self, visible: bool) -> None:
         """Sets the visibility of the start tile
@@ -104,7 +110,7 @@ class StartTile(Tile):
             visible (bool): True to show green start tile color, False to
             disable
         """
-        self._wb_node.getField("start").setSFBool(visible)
+        self._fields.set("start", "SFBool", visible)
         
     def is_wall_present(self, wall_name: str) -> bool:
         """Returns whether a wall on a specified side is present on the start 
@@ -120,7 +126,58 @@ class StartTile(Tile):
         if wall_name not in ["topWall", "rightWall", "bottomWall", "leftWall"]:
             Console.log_err(f"Invalid is_wall_present parameter: {wall_name}")
             return False
-        return self._wb_node.getField(wall_name).getSFInt32() != 0
+        return self._fields.get(wall_name, "SFInt32") != 0
+
+
+TileT = TypeVar("TileT", bound=Tile)
+
+# Called with the tile index exited, then the tile index entered. Indices are
+# None outside of the world grid
+TileTransitionCallback = Callable[[Optional[int], Optional[int]], None]
+
+
+class TileTransitions:
+    """Publishes the robot moving from one world tile to another, so checks
+    that only depend on the tile the robot is on run once on entry rather
+    than every step
+    """
+
+    def __init__(self) -> None:
+        self.tile: Optional[int] = None
+        self._published: bool = False
+        self._subscribers: list[TileTransitionCallback] = []
+
+    def subscribe(self, callback: TileTransitionCallback) -> None:
+        """Subscribes to tile transitions
+
+        Args:
+            callback (TileTransitionCallback): Function called with the tile
+            index exited and the tile index entered
+        """
+        self._subscribers.append(callback)
+
+    def update(self, tile: Optional[int]) -> None:
+        """Updates the tile the robot is on, notifying subscribers if it has
+        changed
+
+        Args:
+            tile (Optional[int]): World tile index the robot is on, or None if
+            outside of the world grid
+        """
+        if tile == self.tile and self._published:
+            return
+        exited: Optional[int] = self.tile
+        self.tile = tile
+        self._published = True
+        for callback in self._subscribers:
+            callback(exited, tile)
+
+    def reset(self) -> None:
+        """Forgets the robot's tile, so the next update is published even if
+        the tile hasn't changed (e.g. after a new robot is added)
+        """
+        self.tile = None
+        self._published = False
 
 
 class TileManager(ErebusObject):
@@ -131,188 +188,272 @@ class TileManager(ErebusObject):
     ROOM_MULT: list[float] = [1, 1.25, 1.5, 2]
     SWAMP_TIME_MULT: float = 5.0
 
-    def __init__(self, erebus: Erebus):
+    def __init__(self, erebus: Erebus, bundle: Optional[WorldBundle] = None):
         """Creates a new TileManager object. Initialises start tile, checkpoint
         and swamp objects from the Webots world.
 
         Args:
             erebus (Erebus): Erebus supervisor game object
+            bundle (Optional[WorldBundle], optional): Compiled world bundle to
+            load tile bounds from, instead of reading them from the Webots
+            world. Defaults to None.
         """
         super().__init__(erebus)
         self.num_swamps: int = 0
         self.num_checkpoints: int = 0
 
-        self.start_tile: StartTile = self._get_start_tile()
-        self.checkpoints: list[Checkpoint] = self._get_checkpoints()
-        self.swamps: list[Swamp] = self._get_swamps()
-
-    def _get_swamps(self) -> list[Swamp]:
-        """Get all swamps in simulation. Stores boundary information
-        within a list of Swamp objects
+        # Special tile bounds, as rows of min x,z, max x,z and center x,y,z.
+        # TRAPBOUNDS isn't loaded, since black holes are detected by the
+        # robot's height rather than by tile
+        if bundle is not None:
+            start_bounds: npt.NDArray = bundle.start_bounds[np.newaxis]
+            checkpoint_bounds: npt.NDArray = bundle.checkpoint_bounds
+            swamp_bounds: npt.NDArray = bundle.swamp_bounds
+        else:
+            start_bounds = self._get_bounds("STARTBOUNDS")
+            checkpoint_bounds = self._get_bounds("CHECKPOINTBOUNDS")
+            swamp_bounds = self._get_bounds("SWAMPBOUNDS")
+
+        start_tile_node: Node = self._erebus.getFromDef("START_TILE")
+        start_min, start_max, start_center = self._split_bounds(
+            start_bounds)[0]
+        self.start_tile: StartTile = StartTile(
+            start_min, start_max, start_tile_node, center=start_center)
+        self.checkpoints: list[Checkpoint] = [
+            Checkpoint(*b) for b in self._split_bounds(checkpoint_bounds)]
+        self.swamps: list[Swamp] = [
+            Swamp(*b) for b in self._split_bounds(swamp_bounds)]
+        self.num_checkpoints = len(self.checkpoints)
+        self.num_swamps = len(self.swamps)
+
+        # World geometry, cached so grid and room lookups during the match
+        # don't need any Webots API calls
+        self._side: float
+        self._width: float
+        self._height: float
+        if bundle is not None:
+            self._side, self._width, self._height = bundle.start_geometry
+        else:
+            self._side = (
+                0.3 * start_tile_node.getField("xScale").getSFFloat())
+            self._width = start_tile_node.getField("width").getSFFloat()
+            self._height = start_tile_node.getField("height").getSFFloat()
+        self._rooms: npt.NDArray = (
+            np.asarray(bundle.rooms, dtype=np.int8) if bundle is not None
+            else self._get_rooms()
+        )
 
-        Returns:
-            list[Swamp]: List of swamp objects
+        # Spatial index of the special tiles, by the world tile indices they
+        # cover, so finding the special tile at a position is a single lookup
+        # however many there are. Checked when the robot moves onto a new tile
+        self._checkpoint_tiles: dict[int, Checkpoint] = self._index_tiles(
+            self.checkpoints)
+        self._swamp_tiles: dict[int, Swamp] = self._index_tiles(self.swamps)
+        self._start_tiles: dict[int, StartTile] = self._index_tiles(
+            [self.start_tile])
+        self.transitions: TileTransitions = TileTransitions()
+        self.transitions.subscribe(self._on_tile_transition)
+
+    @property
+    def rooms(self) -> npt.NDArray:
+        """Room number of every world tile, indexed by world tile node index
         """
-        
-        swamps: list[Swamp] = []
+        return self._rooms
 
-        self.num_swamps = (
-            self._erebus.getFromDef('SWAMPBOUNDS')
-            .getField('children')
-            .getCount()
-        )
+    @property
+    def start_geometry(self) -> tuple[float, float, float]:
+        """World tile side length, and world width and height in tiles
+        """
+        return self._side, self._width, self._height
 
-        # Iterate for each swamp
-        for i in range(self.num_swamps):
-            # Get swamp min and max bounds positions
-            min_pos: list[float] = (
-                self._erebus.getFromDef(f"swamp{i}min")
-                .getField("translation")
-                .getSFVec3f()
-            )
-            max_pos: list[float] = (
-                self._erebus.getFromDef(f"swamp{i}max")
-                .getField("translation")
-                .getSFVec3f()
-            )
-
-            center_pos: tuple = ((max_pos[0]+min_pos[0])/2,
-                                 max_pos[1],
-                                 (max_pos[2]+min_pos[2])/2)
-
-            # Create a swamp object using the min and max (x,z)
-            swamp: Swamp = Swamp((min_pos[0], min_pos[2]),
-                                 (max_pos[0], max_pos[2]),
-                                 center_pos)
-
-            swamps.append(swamp)
-            
-        return swamps
-
-    def _get_checkpoints(self) -> list[Checkpoint]:
-        """Get all checkpoints in simulation. Stores boundary information
-        within a list of Checkpoint objects
+    def _get_rooms(self) -> npt.NDArray:
+        """Gets the room number of every world tile
 
         Returns:
-            list[Checkpoint]: List of checkpoint objects
+            npt.NDArray: Room number of each world tile, indexed by world
+            tile node index. Nodes without a room are given room 0.
         """
+        tile_nodes = self._erebus.getFromDef("WALLTILES").getField("children")
+        rooms: npt.NDArray = np.zeros(tile_nodes.getCount(), dtype=np.int8)
+        for i in range(len(rooms)):
+            room_field = tile_nodes.getMFNode(i).getField("room")
+            if room_field is not None:
+                rooms[i] = room_field.getSFInt32()
+        return rooms
+
+    def _get_bounds(self, group_def: str) -> npt.NDArray:
+        """Gets the bounds of all special tiles within a bounds group (e.g.
+        `SWAMPBOUNDS`), walking the group's children once rather than looking
+        up each min/max node by DEF name
 
-        checkpoints: list[Checkpoint] = []
+        Args:
+            group_def (str): DEF name of the bounds group
 
-        self.num_checkpoints = (
-            self._erebus.getFromDef('CHECKPOINTBOUNDS')
-            .getField('children')
-            .getCount()
-        )
+        Returns:
+            npt.NDArray: (n, 7) tile bounds, each row holding min x,z, max x,z
+            and center x,y,z
+        """
+        children = self._erebus.getFromDef(group_def).getField("children")
+        # Each child is a group holding the tile's min and max nodes
+        positions: npt.NDArray = np.zeros((children.getCount(), 2, 3))
+        for i in range(len(positions)):
+            pair = children.getMFNode(i).getField("children")
+            for j in range(2):
+                positions[i, j] = (
+                    pair.getMFNode(j).getField("translation").getSFVec3f())
+
+        min_pos: npt.NDArray = positions.min(axis=1)
+        max_pos: npt.NDArray = positions.max(axis=1)
+        center_pos: npt.NDArray = (min_pos + max_pos) / 2
+        center_pos[:, 1] = max_pos[:, 1]
+
+        return np.column_stack([min_pos[:, [0, 2]], max_pos[:, [0, 2]],
+                                center_pos])
 
-        # Iterate for each checkpoint
-        for i in range(self.num_checkpoints):
-            # Get the checkpoint min and max bounds positions
-            min_pos: list[float] = (
-                self._erebus.getFromDef(f"checkpoint{i}min")
-                .getField("translation")
-                .getSFVec3f()
-            )
-            max_pos: list[float] = (
-                self._erebus.getFromDef(f"checkpoint{i}max")
-                .getField("translation")
-                .getSFVec3f()
-            )
-
-            centerPos = ((max_pos[0]+min_pos[0])/2,
-                         max_pos[1],
-                         (max_pos[2]+min_pos[2])/2)
-
-            # Create a checkpoint object using the min and max (x,z)
-            checkpoint = Checkpoint((min_pos[0], min_pos[2]),
-                                    (max_pos[0], max_pos[2]),
-                                    centerPos)
-
-            checkpoints.append(checkpoint)
-            
-        return checkpoints
-            
-    def _get_start_tile(self) -> StartTile:
-        """Gets the world's start tile as a StartTile object, holding boundary
-        information
+    @staticmethod
+    def _split_bounds(
+        bounds: npt.NDArray
+    ) -> list[tuple[tuple[float, float], tuple[float, float],
+                    tuple[float, float, float]]]:
+        """Splits tile bound rows into the min, max and center positions used
+        to create Tile objects
+
+        Args:
+            bounds (npt.NDArray): (n, 7) tile bounds, each row holding min
+            x,z, max x,z and center x,y,z
 
         Returns:
-            StartTile: StartTile object
+            list[tuple[tuple[float, float], tuple[float, float], 
+            tuple[float, float, float]]]: min, max and center of each tile
         """
-        start_tile_node = self._erebus.getFromDef("START_TILE")
+        return [((b[0], b[1]), (b[2], b[3]), (b[4], b[5], b[6]))
+                for b in np.asarray(bounds).tolist()]
 
-        # Get the vector positions
-        start_min_pos: list[float] = (
-            self._erebus.getFromDef("start0min")
-            .getField("translation")
-            .getSFVec3f()
-        )
-        start_max_pos: list[float] = (
-            self._erebus.getFromDef("start0max")
-            .getField("translation")
-            .getSFVec3f()
-        )
-        
-        start_center_pos: tuple = ((start_max_pos[0]+start_min_pos[0])/2,
-                                   start_max_pos[1],
-                                   (start_max_pos[2]+start_min_pos[2])/2)
+    def _index_tiles(self, tiles: list[TileT]) -> dict[int, TileT]:
+        """Maps the world tile indices covered by special tiles to the special
+        tile covering them. A world tile is covered if its center is within
+        the special tile's bounds. If multiple special tiles cover a world
+        tile, the first in the list is used.
 
-        return StartTile((start_min_pos[0], start_min_pos[2]),
-                         (start_max_pos[0], start_max_pos[2]),
-                         start_tile_node, 
-                         center=start_center_pos,)
+        Args:
+            tiles (list[TileT]): Special tiles to index
 
-    @staticmethod
-    def coord2grid(
-        coord: list[float] | tuple[float, float, float],
-        supervisor: Supervisor
-    ) -> int:
+        Returns:
+            dict[int, TileT]: Special tile covering each world tile index
+        """
+        index: dict[int, TileT] = {}
+        x_offset: float = self._width / 2 * self._side
+        z_offset: float = self._height / 2 * self._side
+        for tile in tiles:
+            x0: int = max(math.ceil((tile.min[0] + x_offset) / self._side), 0)
+            x1: int = min(math.floor((tile.max[0] + x_offset) / self._side),
+                          int(self._width) - 1)
+            z0: int = max(math.ceil((tile.min[1] + z_offset) / self._side), 0)
+            z1: int = min(math.floor((tile.max[1] + z_offset) / self._side),
+                          int(self._height) - 1)
+            for x in range(x0, x1 + 1):
+                for z in range(z0, z1 + 1):
+                    index.setdefault(x * int(self._height) + z, tile)
+        return index
+
+    def get_tile(
+        self,
+        coord: list[float] | tuple[float, float, float]
+    ) -> Optional[int]:
+        """Gets the world tile index at a world coordinate (only uses x,z
+        components), like `get_grid`, but None outside of the world grid
+
+        Args:
+            coord (list[float] | tuple[float, float, float]): Webots world 
+            coordinate 
+
+        Returns:
+            Optional[int]: Index of world tile within Webots node hierarchy,
+            or None if the coordinate is outside of the world
+        """
+        x: float = round((coord[0] + (self._width / 2 * self._side)) /
+                         self._side, 0)
+        z: float = round((coord[2] + (self._height / 2 * self._side)) /
+                         self._side, 0)
+        if not (0 <= x < self._width and 0 <= z < self._height):
+            return None
+        return int(x * self._height + z)
+
+    def get_grid(self, coord: list[float] | tuple[float, float, float]) -> int:
         """Converts a world coordinate to the corresponding world tile node 
-        index (only uses x,z components) 
+        index (only uses x,z components), using the cached world geometry.
 
         Args:
             coord (list[float] | tuple[float, float, float]): Webots world 
             coordinate 
-            supervisor (Supervisor): Erebus supervisor object
 
         Returns:
             int: Index of world tile within Webots node hierarchy
         """
-        side: float = 0.3 * (supervisor.getFromDef("START_TILE")
-                             .getField("xScale")
-                             .getSFFloat())
-        height: float = (
-            supervisor.getFromDef("START_TILE")
-            .getField("height")
-            .getSFFloat()
-        )
-        width: float = (
-            supervisor.getFromDef("START_TILE")
-            .getField("width")
-            .getSFFloat()
-        )
         return int(
-            round((coord[0] + (width / 2 * side)) / side, 0) * height +
-            round((coord[2] + (height / 2 * side)) / side, 0)
+            round((coord[0] + (self._width / 2 * self._side)) / self._side, 0)
+            * self._height +
+            round((coord[2] + (self._height / 2 * self._side)) / self._side, 0)
         )
-        
-    def check_swamps(self) -> None: 
-        """Check if the simulation robot is in any swamps. Slows down the robot
-        accordingly
+
+    def get_room(self, coord: list[float] | tuple[float, float, float]) -> int:
+        """Gets the room number of the world tile at a world coordinate
+
+        Args:
+            coord (list[float] | tuple[float, float, float]): Webots world 
+            coordinate 
+
+        Returns:
+            int: Room number (1-4)
         """
-        # Check if the robot is in a swamps
-        in_swamp: bool = any([s.check_position(self._erebus.robot_obj.position) 
-                              for s in self.swamps])
-        self._erebus.robot_obj.update_in_swamp(in_swamp, 
-                                               self._erebus.DEFAULT_MAX_MULT)
-    
-    def check_checkpoints(self) -> None: 
-        """Check if the simulation robot is in any checkpoints. Awards points
-        accordingly
+        return int(self._rooms[self.get_grid(coord)])
+
+    def get_room_multiplier(
+        self,
+        coord: list[float] | tuple[float, float, float]
+    ) -> float:
+        """Gets the score multiplier of the room at a world coordinate
+
+        Args:
+            coord (list[float] | tuple[float, float, float]): Webots world 
+            coordinate 
+
+        Returns:
+            float: Room score multiplier
+        """
+        return self.ROOM_MULT[self.get_room(coord) - 1]
+
+    def is_start_tile(
+        self,
+        coord: list[float] | tuple[float, float, float]
+    ) -> bool:
+        """Checks if a world coordinate (only uses x,z components) is on the
+        start tile, using the special tile index
+
+        Args:
+            coord (list[float] | tuple[float, float, float]): Webots world 
+            coordinate 
+
+        Returns:
+            bool: True if the coordinate's world tile is the start tile
+        """
+        return self.get_tile(coord) in self._start_tiles
+
+    def _on_tile_transition(
+        self,
+        exited: Optional[int],
+        entered: Optional[int]
+    ) -> None:
+        """Checks if the simulation robot has moved onto a checkpoint or swamp,
+        awarding points and slowing the robot down accordingly
+
+        Args:
+            exited (Optional[int]): World tile index the robot was on
+            entered (Optional[int]): World tile index the robot is now on
         """
-        # Test if the robots are in checkpoints
-        checkpoint = [c for c in self.checkpoints 
-                      if c.check_position(self._erebus.robot_obj.position)]
-        # If any checkpoints
-        if len(checkpoint) > 0:
-            self._erebus.robot_obj.update_checkpoints(checkpoint[0])
+        checkpoint: Optional[Checkpoint] = self._checkpoint_tiles.get(entered)
+        if checkpoint is not None:
+            self._erebus.robot_obj.update_checkpoints(checkpoint)
+
+        self._erebus.robot_obj.update_in_swamp(entered in self._swamp_tiles,
+                                               self._erebus.DEFAULT_MAX_MULT)
@@ -0,0 +1,181 @@
+"""Fixed size history of the robot's motion, sampled once per simulation step"""
+
+from __future__ import annotations
+
+import math
+
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+
+
+class Trajectory:
+    """Ring buffer of robot motion samples, each holding the simulation time,
+    robot position and speed.
+
+    The distance travelled is accumulated as samples are pushed, and the
+    time the robot stopped is tracked, so stop duration and distance queries
+    don't need to scan the history.
+    """
+
+    # Sample columns
+    TIME: int = 0
+    X: int = 1
+    Y: int = 2
+    Z: int = 3
+    SPEED: int = 4
+    # Distance travelled since the first sample
+    DISTANCE: int = 5
+
+    def __init__(self, capacity: int = 4096):
+        """Creates a new empty trajectory
+
+        Args:
+            capacity (int, optional): Maximum number of samples kept. Older
+            samples are overwritten. Defaults to 4096 (~65s of 16ms steps).
+        """
+        self._samples: npt.NDArray = np.zeros((capacity, 6))
+        self._next: int = 0
+        self._count: int = 0
+
+        # Whether the next sample continues the path from the last one, False
+        # after the robot is moved (e.g. relocated)
+        self._connected: bool = False
+        self._stopped_since: Optional[float] = None
+        self.tile: Optional[int] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def clear(self) -> None:
+        """Removes all samples
+        """
+        self._next = 0
+        self._count = 0
+        self._connected = False
+        self._stopped_since = None
+        self.tile = None
+
+    def push(
+        self,
+        time: float,
+        position: list[float],
+        velocity: list[float],
+        stopped: bool,
+        tile: Optional[int] = None
+    ) -> bool:
+        """Adds a motion sample, overwriting the oldest sample if full.
+        Samples no later than the latest sample (e.g. while the simulation is
+        paused) are ignored, so they don't push real history out.
+
+        Args:
+            time (float): Simulation time, in seconds
+            position (list[float]): Robot position
+            velocity (list[float]): Robot linear and angular velocity
+            stopped (bool): Whether the robot is stopped
+            tile (Optional[int], optional): World tile index the robot is on.
+            Defaults to None.
+
+        Returns:
+            bool: True if the sample was added
+        """
+        distance: float = 0.0
+        if self._count > 0:
+            last: npt.NDArray = self._samples[self._next - 1]
+            if time <= last[Trajectory.TIME]:
+                return False
+            distance = last[Trajectory.DISTANCE]
+            if self._connected:
+                distance += math.dist(position[:3],
+                                      last[Trajectory.X:Trajectory.Z + 1])
+
+        speed: float = float(np.linalg.norm(velocity[:3]))
+        self._samples[self._next] = (time, *position[:3], speed, distance)
+        self._next = (self._next + 1) % len(self._samples)
+        self._count = min(self._count + 1, len(self._samples))
+        self._connected = True
+
+        if not stopped:
+            self._stopped_since = None
+        elif self._stopped_since is None:
+            self._stopped_since = time
+        self.tile = tile
+        return True
+
+    def break_path(self) -> None:
+        """Marks the robot as moved by the supervisor (e.g. relocated), so the
+        jump to its next position isn't counted as distance travelled
+        """
+        self._connected = False
+
+    def reset_stopped(self) -> None:
+        """Restarts the stop timer, as if the robot has only just stopped
+        """
+        self._stopped_since = None
+
+    def time_stopped(self) -> float:
+        """Gets how long the robot has been stopped for, as of the latest
+        sample
+
+        Returns:
+            float: Time stopped, in seconds
+        """
+        if self._stopped_since is None:
+            return 0.0
+        return float(self._samples[self._next - 1][Trajectory.TIME] -
+                     self._stopped_since)
+
+    def stopped_for(self, seconds: float) -> bool:
+        """Checks if the robot has been stopped for at least some time
+
+        Args:
+            seconds (float): Time, in seconds
+
+        Returns:
+            bool: True if stopped for at least the given time
+        """
+        return self._stopped_since is not None and (
+            self.time_stopped() >= seconds)
+
+    def _index_at(self, time: float) -> int:
+        """Gets the ring index of the oldest sample at or after a time.
+
+        Samples are pushed once per step, so are close to evenly spaced in
+        time. The index is estimated from the average sample spacing, then
+        stepped to the exact sample, which only takes a step or two.
+        """
+        capacity: int = len(self._samples)
+        oldest: int = (self._next - self._count) % capacity
+        first: float = self._samples[oldest][Trajectory.TIME]
+        last: float = self._samples[self._next - 1][Trajectory.TIME]
+        if time <= first:
+            return oldest
+        if time >= last:
+            return (self._next - 1) % capacity
+
+        # Offset from the oldest sample
+        k: int = int((time - first) / (last - first) * (self._count - 1))
+        while (k > 0 and self._samples[(oldest + k - 1) % capacity]
+                [Trajectory.TIME] >= time):
+            k -= 1
+        while self._samples[(oldest + k) % capacity][Trajectory.TIME] < time:
+            k += 1
+        return (oldest + k) % capacity
+
+    def distance_travelled(self, seconds: float) -> float:
+        """Gets the distance the robot travelled within the last amount of
+        time. Limited to the kept samples.
+
+        Args:
+            seconds (float): Time, in seconds
+
+        Returns:
+            float: Distance travelled, in meters
+        """
+        if self._count == 0:
+            return 0.0
+        latest: npt.NDArray = self._samples[self._next - 1]
+        start: int = self._index_at(latest[Trajectory.TIME] - seconds)
+        return float(latest[Trajectory.DISTANCE] -
+                     self._samples[start][Trajectory.DISTANCE])
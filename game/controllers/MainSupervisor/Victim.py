@@ -5,7 +5,7 @@ from abc import ABC, abstractmethod
 from overrides import override
 import numpy.typing as npt
 import numpy as np
-from typing import TYPE_CHECKING
+from typing import Optional, Sequence, TYPE_CHECKING
 
 from controller import Node
 from controller import Field
@@ -13,9 +13,11 @@ from controller import Field
 from Robot import Robot
 from Camera import FollowSide
 from ErebusObject import ErebusObject
+from FieldCache import FieldCache
 
 if TYPE_CHECKING:
     from MainSupervisor import Erebus
+    from WorldBundle import WorldBundle
 
 def rotate_2d_vector(v: npt.NDArray, theta: float) -> npt.NDArray:
     """Rotate 2D vector by angle (in radians)
@@ -48,7 +50,14 @@ class VictimObject(ABC):
     """Abstract object holding data about Victim/Hazard maps within the world
     """
 
-    def __init__(self, node: Node, victim_type: str, score: int):
+    def __init__(
+        self,
+        node: Node,
+        victim_type: str,
+        score: int,
+        normal: Optional[npt.NDArray] = None,
+        position: Optional[list[float]] = None
+    ):
         """Initialises a new VictimObject, representing a Victim or Hazard
         within the world.
     
@@ -57,52 +66,63 @@ class VictimObject(ABC):
             victim_type (str): Victim type (e.g. Harmed, F, etc.)
             score (int): Score worth of the victim on identification
             (e.g. 10 or 20)
+            normal (Optional[npt.NDArray], optional): Precomputed surface 
+            normal of the victim (e.g. from a world bundle). Calculated from 
+            the node's orientation if None. Defaults to None.
+            position (Optional[list[float]], optional): Known position of the
+            victim (e.g. from a world bundle). Read from the node on first
+            use if None. Defaults to None.
         """
         
         self.wb_node: Node = node
 
-        self.orientation = node.getOrientation()
+        if normal is None:
+            orientation: list[float] = node.getOrientation()
+            normal = np.array([-orientation[2], 0, -orientation[8]])
+        self._normal: npt.NDArray = np.array(normal, dtype=float)
 
         self.score_worth: int = score
         self._victim_type: str = victim_type
         self.simple_victim_type: str = self.get_simple_type()
 
-        self.wb_translation_field: Field = self.wb_node.getField('translation')
-        self._wb_rotation_field: Field = self.wb_node.getField('rotation')
-        self._wb_type_field: Field = self.wb_node.getField('type')
-        self._wb_found_field: Field = self.wb_node.getField('found')
+        # Victims don't move during a match, and their type/found fields are
+        # only changed by the supervisor, so field values are shadowed
+        self._fields: FieldCache = FieldCache(self.wb_node)
+        self.wb_translation_field: Field = self._fields.field('translation')
+        if position is not None:
+            self._fields.seed('translation', position)
 
     @property
     def position(self) -> list[float]:
-        return self.wb_translation_field.getSFVec3f()
+        return self._fields.get('translation', 'SFVec3f')
 
     @position.setter
     def position(self, pos: list[float]) -> None:
-        self.wb_translation_field.setSFVec3f(pos)
+        self._fields.set('translation', 'SFVec3f', pos)
 
     @property
     def rotation(self) -> list[float]:
-        return self._wb_rotation_field.getSFRotation()
+        return self._fields.get('rotation', 'SFRotation')
 
     @rotation.setter
     def rotation(self, pos: list[float]) -> None:
-        self._wb_rotation_field.setSFRotation(pos)
+        self._fields.set('rotation', 'SFRotation', pos)
 
     @property
     def victim_type(self) -> str:
-        return self._wb_type_field.getSFString()
+        return self._fields.get('type', 'SFString')
 
     @victim_type.setter
     def victim_type(self, v_type: str):
-        self._wb_type_field.setSFString(v_type)
+        self._fields.set('type', 'SFString', v_type)
 
     @property
     def identified(self) -> bool:
-        return self._wb_found_field.getSFBool()
+        return self._fields.get('found', 'SFBool')
 
     @identified.setter
     def identified(self, found: bool):
-        self._wb_found_field.setSFBool(found)
+        self._fields.set('found', 'SFBool', found)
 
     @abstractmethod
     def get_simple_type(self) -> str:
@@ -124,12 +144,7 @@ class VictimObject(ABC):
             bool: Whether the given position is within the specified range of 
             the victim 
         """
-        # Get distance from the object to the passed position
-        distance = math.sqrt(
-            ((self.position[0] - pos[0])**2) +
-            ((self.position[2] - pos[2])**2)
-        )
-        return distance <= radius
+        return self.get_distance(pos) <= radius
 
     def get_distance(self, pos: list[float]) -> float:
         """Gets the distance of a specific position from the victim
@@ -140,9 +155,10 @@ class VictimObject(ABC):
         Returns:
             float: Distance from victim, in meters
         """
+        position: list[float] = self.position
         return math.sqrt(
-            ((self.position[0] - pos[0])**2) +
-            ((self.position[2] - pos[2])**2)
+            ((position[0] - pos[0])**2) +
+            ((position[2] - pos[2])**2)
         )
 
     def get_surface_normal(self) -> npt.NDArray:
@@ -151,7 +167,7 @@ class VictimObject(ABC):
         Returns:
             npt.NDArray: Normalised surface normal vector
         """
-        return np.array([-self.orientation[2], 0, -self.orientation[8]])
+        return self._normal
 
     def _get_vec_to_robot(self, robot: Robot) -> npt.NDArray:
         """Get normalised direction vector from victim to robot
@@ -236,31 +252,120 @@ class HazardMap(VictimObject):
         return self._victim_type
 
 
+class SignGeometry:
+    """Static geometry of a group of victims/hazards, snapshotted into arrays
+    so proximity checks against every sign run as a single vectorised query
+    """
+
+    def __init__(self, signs: Sequence[VictimObject]):
+        """Snapshots the positions and surface normals of a group of signs
+
+        Args:
+            signs (Sequence[VictimObject]): Victims/hazards to snapshot
+        """
+        self.signs: list[VictimObject] = list(signs)
+        self.positions: npt.NDArray = np.array(
+            [s.position for s in self.signs], dtype=float).reshape(-1, 3)
+        self.normals: npt.NDArray = np.array(
+            [s.get_surface_normal() for s in self.signs],
+            dtype=float).reshape(-1, 3)
+
+    def get_distances(self, pos: list[float]) -> npt.NDArray:
+        """Gets the distance of a specific position from every sign. Same as
+        `VictimObject.get_distance`.
+
+        Args:
+            pos (list[float]): Position to check
+
+        Returns:
+            npt.NDArray: Distance from each sign, in meters
+        """
+        return np.sqrt((self.positions[:, 0] - pos[0])**2 +
+                       (self.positions[:, 2] - pos[2])**2)
+
+    def check_position(
+        self,
+        pos: list[float],
+        radius: float = 0.09
+    ) -> npt.NDArray:
+        """Checks which signs a position is within a specified radius of. Same
+        as `VictimObject.check_position`.
+
+        Args:
+            pos (list[float]): Position to check
+            radius (float, optional): Radius of search. Defaults to 0.09.
+
+        Returns:
+            npt.NDArray: Boolean mask of the signs in range of the position
+        """
+        return self.get_distances(pos) <= radius
+
+    def on_same_side(self, pos: list[float]) -> npt.NDArray:
+        """Checks which signs a position is on the same side of. Same as
+        `VictimObject.on_same_side`.
+
+        Args:
+            pos (list[float]): Position to check (e.g. the robot's)
+
+        Returns:
+            npt.NDArray: Boolean mask of the signs facing the position
+        """
+        to_pos: npt.NDArray = np.asarray(pos, dtype=float) - self.positions
+        with np.errstate(invalid='ignore', divide='ignore'):
+            to_pos /= np.linalg.norm(to_pos, axis=1, keepdims=True)
+            dots: npt.NDArray = np.einsum('ij,ij->i', self.normals, to_pos)
+            angles: npt.NDArray = np.arccos(np.clip(dots, -1.0, 1.0))
+        # Angle between the two vectors is less than 90 degrees
+        return angles < math.pi/2
+
+
 class VictimManager(ErebusObject):
     """VictimManager Object for managing Hazards and Victims actions within the
     simulation
     """
     
-    def __init__(self, erebus: Erebus):
+    def __init__(self, erebus: Erebus, bundle: Optional[WorldBundle] = None):
         """Initialises a new VictimManager object to manage both Hazards and 
         Victims, initialising HazardMap and Victim object lists from the Webots
         world
 
         Args:
             erebus (Erebus): Erebus supervisor game object
+            bundle (Optional[WorldBundle], optional): Compiled world bundle to
+            load victim and hazard positions and surface normals from.
+            Defaults to None.
         """
         super().__init__(erebus)
         
         self._num_victims: int = 0
         self._num_hazards: int = 0
 
-        self.victims: list[Victim] = self._get_victims()
-        self.hazards: list[HazardMap] = self._get_hazards()
+        victim_signs: Optional[npt.NDArray] = None
+        hazard_signs: Optional[npt.NDArray] = None
+        if bundle is not None:
+            victim_signs = bundle.victim_signs
+            hazard_signs = bundle.hazard_signs
+
+        self.victims: list[Victim] = self._get_victims(victim_signs)
+        self.hazards: list[HazardMap] = self._get_hazards(hazard_signs)
+
+        self.victim_geometry: SignGeometry = SignGeometry(self.victims)
+        self.hazard_geometry: SignGeometry = SignGeometry(self.hazards)
+        self.sign_geometry: SignGeometry = SignGeometry(self.victims +
+                                                        self.hazards)
 
-    def _get_victims(self) -> list[Victim]:
+    def _get_victims(
+        self,
+        signs: Optional[npt.NDArray] = None
+    ) -> list[Victim]:
         """Gets and initialises all Victims as Victim objects from nodes in the
         simulation world
 
+        Args:
+            signs (Optional[npt.NDArray], optional): Precomputed victim
+            positions and surface normals, as (n, 6) rows in node order.
+            Defaults to None.
+
         Returns:
             list[Victim]: List of Victim Objects
         """
@@ -287,15 +392,27 @@ class VictimManager(ErebusObject):
             score_worth: int = victim_node.getField('scoreWorth').getSFInt32()
 
             # Create victim Object from node info
-            victim: Victim = Victim(victim_node, victim_type, score_worth)
+            victim: Victim = Victim(
+                victim_node, victim_type, score_worth,
+                signs[i, 3:] if signs is not None else None,
+                signs[i, :3].tolist() if signs is not None else None
+            )
             victims.append(victim)
         
         return victims
 
-    def _get_hazards(self) -> list[HazardMap]:
+    def _get_hazards(
+        self,
+        signs: Optional[npt.NDArray] = None
+    ) -> list[HazardMap]:
         """Gets and initialises all Hazards as HazardMap objects from nodes in 
         the simulation world
 
+        Args:
+            signs (Optional[npt.NDArray], optional): Precomputed hazard
+            positions and surface normals, as (n, 6) rows in node order.
+            Defaults to None.
+
         Returns:
             list[HazardMap]: List of HazardMap Objects
         """
@@ -323,7 +440,11 @@ class VictimManager(ErebusObject):
             score_worth: int = hazard_node.getField('scoreWorth').getSFInt32()
 
             # Create hazard Object from node info
-            hazard: HazardMap = HazardMap(hazard_node, hazard_type, score_worth)
+            hazard: HazardMap = HazardMap(
+                hazard_node, hazard_type, score_worth,
+                signs[i, 3:] if signs is not None else None,
+                signs[i, :3].tolist() if signs is not None else None
+            )
             hazards.append(hazard)
 
         return hazards
@@ -0,0 +1,258 @@
+"""Compiled world bundles, caching the world data the supervisor derives from
+a .wbt file so it doesn't have to be rebuilt every time the world loads"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import numpy.typing as npt
+
+from typing import Optional, TYPE_CHECKING
+
+from ConsoleLog import Console
+
+if TYPE_CHECKING:
+    from Tile import Tile, TileManager
+    from Victim import VictimManager
+
+
+class WorldBundle:
+    """World data compiled from a .wbt file: the map answer matrix, special
+    tile bounds, world tile geometry and room numbers, victim/hazard
+    positions and surface normals, and the world thumbnail.
+
+    Bundles are stored in `worlds/.bundles/<world name>/`, next to the world
+    file, and are keyed by the world file's content hash. Any edit to the
+    world (or a new bundle version) invalidates the bundle. Arrays are memory
+    mapped when a bundle is loaded.
+    """
+
+    # Increment when the bundle layout, or how its data is generated, changes
+    VERSION: int = 2
+
+    _MANIFEST: str = "manifest.json"
+    _ANSWER: str = "answer.npy"
+    _BOUNDS: str = "bounds.npy"
+    _ROOMS: str = "rooms.npy"
+    _SIGNS: str = "signs.npy"
+    _THUMBNAIL: str = "thumbnail.png"
+
+    def __init__(
+        self,
+        path: str,
+        answer: npt.NDArray,
+        bounds: npt.NDArray,
+        rooms: npt.NDArray,
+        signs: npt.NDArray,
+        num_checkpoints: int,
+        num_victims: int,
+        start_geometry: tuple[float, float, float],
+    ):
+        """Creates a new WorldBundle. Use `WorldBundle.load` or
+        `WorldBundle.compile` instead.
+
+        Args:
+            path (str): Bundle directory path
+            answer (npt.NDArray): Map answer matrix
+            bounds (npt.NDArray): (n, 7) special tile bounds, each row holding
+            min x,z, max x,z and center x,y,z. Ordered as the start tile,
+            then checkpoints, then swamps.
+            rooms (npt.NDArray): Room number of each world tile, indexed by
+            world tile node index
+            signs (npt.NDArray): (n, 6) victim and hazard positions and
+            surface normals. Ordered as victims, then hazards.
+            num_checkpoints (int): Number of checkpoints within `bounds`
+            num_victims (int): Number of victims within `signs`
+            start_geometry (tuple[float, float, float]): World tile side
+            length, and world width and height in tiles, from the start tile
+        """
+        self.path: str = path
+        self.answer: npt.NDArray = answer
+        self.rooms: npt.NDArray = rooms
+        self._bounds: npt.NDArray = bounds
+        self._signs: npt.NDArray = signs
+        self._num_checkpoints: int = num_checkpoints
+        self._num_victims: int = num_victims
+        self.start_geometry: tuple[float, float, float] = start_geometry
+
+    @property
+    def start_bounds(self) -> npt.NDArray:
+        return self._bounds[0]
+
+    @property
+    def checkpoint_bounds(self) -> npt.NDArray:
+        return self._bounds[1:1 + self._num_checkpoints]
+
+    @property
+    def swamp_bounds(self) -> npt.NDArray:
+        return self._bounds[1 + self._num_checkpoints:]
+
+    @property
+    def victim_signs(self) -> npt.NDArray:
+        return self._signs[:self._num_victims]
+
+    @property
+    def hazard_signs(self) -> npt.NDArray:
+        return self._signs[self._num_victims:]
+
+    @staticmethod
+    def get_bundle_path(world_path: str) -> str:
+        """Gets the bundle directory of a world
+
+        Args:
+            world_path (str): Path to the world .wbt file
+
+        Returns:
+            str: Path to the world's bundle directory
+        """
+        world_name: str = os.path.splitext(os.path.basename(world_path))[0]
+        return os.path.join(os.path.dirname(world_path), ".bundles", world_name)
+
+    @staticmethod
+    def hash_world(world_path: str) -> str:
+        """Gets the content hash of a world file
+
+        Args:
+            world_path (str): Path to the world .wbt file
+
+        Returns:
+            str: SHA-256 hex digest of the world file
+        """
+        sha = hashlib.sha256()
+        with open(world_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                sha.update(chunk)
+        return sha.hexdigest()
+
+    @staticmethod
+    def _manifest(world_path: str, erebus_version: str) -> dict:
+        return {
+            "version": WorldBundle.VERSION,
+            "erebus": erebus_version,
+            "hash": WorldBundle.hash_world(world_path),
+        }
+
+    @classmethod
+    def load(
+        cls,
+        world_path: str,
+        erebus_version: str
+    ) -> Optional[WorldBundle]:
+        """Loads a world's compiled bundle, memory mapping its arrays
+
+        Args:
+            world_path (str): Path to the world .wbt file
+            erebus_version (str): Current Erebus version. Bundles compiled by
+            a different version are ignored.
+
+        Returns:
+            Optional[WorldBundle]: The world bundle, or None if there is no
+            bundle matching the current world file
+        """
+        path: str = cls.get_bundle_path(world_path)
+        try:
+            with open(os.path.join(path, cls._MANIFEST), 'r') as f:
+                manifest: dict = json.load(f)
+            expected: dict = cls._manifest(world_path, erebus_version)
+            if any(manifest.get(k) != v for k, v in expected.items()):
+                Console.log_debug("World bundle out of date, recompiling")
+                return None
+
+            load = lambda name: np.load(os.path.join(path, name),
+                                        mmap_mode='r')
+            return cls(path, load(cls._ANSWER), load(cls._BOUNDS),
+                       load(cls._ROOMS), load(cls._SIGNS),
+                       manifest["checkpoints"], manifest["victims"],
+                       tuple(manifest["start_geometry"]))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            Console.log_warn(f"Unable to load world bundle: {e}")
+            return None
+
+    @classmethod
+    def compile(
+        cls,
+        world_path: str,
+        erebus_version: str,
+        answer: list[list[str]],
+        tile_manager: TileManager,
+        victim_manager: VictimManager,
+        thumbnail_path: str,
+    ) -> WorldBundle:
+        """Compiles world data into a bundle, and writes it next to the world
+        file. If the bundle can't be written (e.g. a read only file system),
+        the in memory bundle is still returned.
+
+        Args:
+            world_path (str): Path to the world .wbt file
+            erebus_version (str): Current Erebus version
+            answer (list[list[str]]): Map answer matrix
+            tile_manager (TileManager): Tile manager initialised from the
+            world
+            victim_manager (VictimManager): Victim manager initialised from
+            the world
+            thumbnail_path (str): Path to the world's exported thumbnail
+
+        Returns:
+            WorldBundle: Compiled world bundle
+        """
+        tiles: list[Tile] = ([tile_manager.start_tile] +
+                             tile_manager.checkpoints +
+                             tile_manager.swamps)
+        bounds: npt.NDArray = np.array(
+            [[*t.min, *t.max, *t.center] for t in tiles], dtype=np.float64)
+
+        signs: npt.NDArray = np.array(
+            [[*s.position, *s.get_surface_normal()]
+             for s in victim_manager.victims + victim_manager.hazards],
+            dtype=np.float64).reshape(-1, 6)
+
+        path: str = cls.get_bundle_path(world_path)
+        bundle: WorldBundle = cls(
+            path, np.array(answer), bounds,
+            np.array(tile_manager.rooms, dtype=np.int32), signs,
+            len(tile_manager.checkpoints), len(victim_manager.victims),
+            tile_manager.start_geometry)
+
+        manifest: dict = cls._manifest(world_path, erebus_version)
+        manifest["checkpoints"] = len(tile_manager.checkpoints)
+        manifest["victims"] = len(victim_manager.victims)
+        manifest["start_geometry"] = list(bundle.start_geometry)
+        try:
+            os.makedirs(path, exist_ok=True)
+            # Remove the old manifest first, so a partially written bundle is
+            # never seen as valid
+            manifest_path: str = os.path.join(path, cls._MANIFEST)
+            if os.path.exists(manifest_path):
+                os.remove(manifest_path)
+
+            np.save(os.path.join(path, cls._ANSWER), bundle.answer)
+            np.save(os.path.join(path, cls._BOUNDS), bounds)
+            np.save(os.path.join(path, cls._ROOMS), bundle.rooms)
+            np.save(os.path.join(path, cls._SIGNS), signs)
+            shutil.copyfile(thumbnail_path,
+                            os.path.join(path, cls._THUMBNAIL))
+
+            with open(manifest_path, 'w') as f:
+                json.dump(manifest, f, indent=4)
+        except OSError as e:
+            Console.log_warn(f"Unable to write world bundle: {e}")
+
+        return bundle
+
+    def export_thumbnail(self, thumbnail_path: str) -> None:
+        """Exports the bundled world thumbnail
+
+        Args:
+            thumbnail_path (str): Path to write the world thumbnail to
+        """
+        try:
+            shutil.copyfile(os.path.join(self.path, self._THUMBNAIL),
+                            thumbnail_path)
+        except OSError as e:
+            Console.log_warn(f"Unable to export world thumbnail: {e}")
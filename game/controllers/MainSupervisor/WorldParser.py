@@ -0,0 +1,431 @@
+"""Offline parser for Erebus Webots world (.wbt) files, used to build map
+answers for worlds without launching Webots"""
+
+from __future__ import annotations
+
+import math
+import os
+import re
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterable, Iterator, Optional
+
+from MapAnswer import MapAnswer, Sign, Tile
+
+_TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|[\[\]{}]|[^\s\[\]{},"]+')
+_NUMBER_RE = re.compile(r'^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$')
+
+_FIELD_KEYWORDS = ("field", "vrmlField", "hiddenField", "unconnectedField",
+                   "deprecatedField")
+
+# Number of values held by each single field type
+_SF_SIZES: dict[str, int] = {
+    "SFBool": 1,
+    "SFInt32": 1,
+    "SFFloat": 1,
+    "SFString": 1,
+    "SFVec2f": 2,
+    "SFVec3f": 3,
+    "SFColor": 3,
+    "SFRotation": 4,
+}
+
+
+class WbtNode:
+    """Generic node parsed from a world or proto file"""
+
+    def __init__(self, type_name: str, def_name: Optional[str] = None):
+        self.type_name: str = type_name
+        self.def_name: Optional[str] = def_name
+        self.fields: dict[str, Any] = {}
+
+    def children(self) -> list[WbtNode]:
+        """Gets the nodes in the node's `children` field
+
+        Returns:
+            list[WbtNode]: Child nodes, an empty list if there are none
+        """
+        children = self.fields.get("children", [])
+        return [c for c in children if isinstance(c, WbtNode)]
+
+
+def _strip_comment(line: str) -> str:
+    """Removes a trailing '#' comment from a line, ignoring any '#' characters
+    within strings
+    """
+    if '#' not in line:
+        return line
+    in_str: bool = False
+    escaped: bool = False
+    for i, c in enumerate(line):
+        if escaped:
+            escaped = False
+        elif c == '\\':
+            escaped = True
+        elif c == '"':
+            in_str = not in_str
+        elif c == '#' and not in_str:
+            return line[:i]
+    return line
+
+
+def _tokenize(lines: Iterable[str]) -> Iterator[str]:
+    """Lazily splits .wbt/.proto lines into tokens. Commas are treated as
+    whitespace, as in VRML.
+    """
+    for line in lines:
+        yield from _TOKEN_RE.findall(_strip_comment(line))
+
+
+def _is_scalar(token: str) -> bool:
+    return (token[0] == '"' or token in ("TRUE", "FALSE") or
+            _NUMBER_RE.match(token) is not None)
+
+
+class _Parser:
+    """Recursive descent parser over a token stream"""
+
+    def __init__(self, tokens: Iterator[str]):
+        self._tokens: Iterator[str] = tokens
+        self._buffer: list[str] = []
+
+    def peek(self, offset: int = 0) -> Optional[str]:
+        while len(self._buffer) <= offset:
+            token = next(self._tokens, None)
+            if token is None:
+                return None
+            self._buffer.append(token)
+        return self._buffer[offset]
+
+    def next(self) -> str:
+        token = self.peek()
+        if token is None:
+            raise ValueError("Unexpected end of world file")
+        return self._buffer.pop(0)
+
+    def expect(self, expected: str) -> None:
+        token = self.next()
+        if token != expected:
+            raise ValueError(f"Expected '{expected}' but found '{token}'")
+
+    def at_node(self) -> bool:
+        token = self.peek()
+        return token is not None and (
+            token in ("DEF", "USE") or
+            (not _is_scalar(token) and self.peek(1) == '{'))
+
+    def node(self) -> Optional[WbtNode]:
+        def_name: Optional[str] = None
+        if self.peek() == "USE":
+            self.next()
+            self.next()
+            return None
+        if self.peek() == "DEF":
+            self.next()
+            def_name = self.next()
+        node = WbtNode(self.next(), def_name)
+        self.expect('{')
+        while self.peek() != '}':
+            name = self.next()
+            node.fields[name] = self.value()
+        self.expect('}')
+        return node
+
+    def value(self) -> Any:
+        token = self.peek()
+        if token == '[':
+            self.next()
+            items: list[Any] = []
+            while self.peek() != ']':
+                if self.at_node():
+                    items.append(self.node())
+                else:
+                    items.append(self.next())
+            self.next()
+            return items
+        if token == "NULL":
+            self.next()
+            return None
+        if self.at_node():
+            return self.node()
+        scalars: list[str] = []
+        while self.peek() is not None and _is_scalar(self.peek()):  # type: ignore
+            scalars.append(self.next())
+        return scalars
+
+
+def _convert(field_type: str, raw: Any) -> Any:
+    """Converts raw field tokens to a python value, using the proto field
+    type
+    """
+    if raw is None or isinstance(raw, WbtNode):
+        return raw
+    tokens = [t for t in raw if isinstance(t, str)]
+    base: str = "SF" + field_type[2:]
+    values: list[Any] = []
+    for token in tokens:
+        if base == "SFBool":
+            values.append(token == "TRUE")
+        elif base == "SFInt32":
+            # Webots stores integers as signed 32 bit values, so out of range
+            # values wrap around
+            values.append((int(token) + 2**31) % 2**32 - 2**31)
+        elif base == "SFString":
+            values.append(token[1:-1])
+        else:
+            values.append(float(token))
+    if field_type.startswith("MF"):
+        return values
+    if _SF_SIZES.get(field_type, 1) == 1:
+        return values[0] if len(values) > 0 else None
+    return values
+
+
+def _parse_proto_interface(path: str) -> dict[str, tuple[str, Any]]:
+    """Parses the interface of a proto file, returning each field's type and
+    default value
+    """
+    fields: dict[str, tuple[str, Any]] = {}
+    with open(path, 'r', encoding="utf-8") as f:
+        parser = _Parser(_tokenize(f))
+        while parser.peek() not in (None, "PROTO"):
+            parser.next()
+        if parser.peek() is None:
+            return fields
+        parser.next()
+        parser.next()
+        parser.expect('[')
+        while parser.peek() != ']':
+            keyword = parser.next()
+            if keyword not in _FIELD_KEYWORDS:
+                continue
+            field_type = parser.next()
+            # Skip value restrictions e.g. field SFString{"a", "b"} name
+            if parser.peek() == '{':
+                while parser.next() != '}':
+                    pass
+            name = parser.next()
+            if field_type.startswith("MF") or field_type == "SFNode":
+                raw = parser.value()
+            else:
+                raw = [parser.next() for _ in range(_SF_SIZES[field_type])]
+            fields[name] = (field_type, _convert(field_type, raw))
+    return fields
+
+
+def _rotation_to_orientation(rotation: list[float]) -> list[float]:
+    """Converts an axis-angle rotation to a row-major 3x3 rotation matrix, in
+    the same form as Webots' `Node.getOrientation`
+    """
+    x, y, z, angle = rotation
+    norm = math.sqrt(x * x + y * y + z * z)
+    if norm == 0:
+        return [1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0]
+    x, y, z = x / norm, y / norm, z / norm
+    c = math.cos(angle)
+    s = math.sin(angle)
+    t = 1 - c
+    return [
+        t * x * x + c,     t * x * y - s * z, t * x * z + s * y,
+        t * x * y + s * z, t * y * y + c,     t * y * z - s * x,
+        t * x * z - s * y, t * y * z + s * x, t * z * z + c,
+    ]
+
+
+class World:
+    """Erebus world data parsed from a .wbt file. The world file is tokenized
+    lazily line by line, and field defaults are read from the interfaces of
+    the local protos it references.
+    """
+
+    # Prefixes of the special tile bound DEF names (e.g. `checkpoint0min`)
+    BOUND_TYPES: tuple[str, ...] = ("checkpoint", "swamp", "start", "trap")
+
+    def __init__(self, path: str):
+        """Parses a world file
+
+        Args:
+            path (str): Path to the world .wbt file
+
+        Raises:
+            ValueError: Raised if the world file is malformed
+        """
+        self.path: str = path
+        self.nodes: list[WbtNode] = []
+        self._protos: dict[str, dict[str, tuple[str, Any]]] = {}
+
+        with open(path, 'r', encoding="utf-8") as f:
+            parser = _Parser(_tokenize(f))
+            while parser.peek() is not None:
+                if parser.peek() == "IMPORTABLE":
+                    parser.next()
+                if parser.peek() == "EXTERNPROTO":
+                    parser.next()
+                    self._load_proto(parser.next()[1:-1])
+                    continue
+                node = parser.node()
+                if node is not None:
+                    self.nodes.append(node)
+
+        self.defs: dict[str, WbtNode] = {}
+        self._index_defs(self.nodes)
+
+    def _load_proto(self, url: str) -> None:
+        if "://" in url:
+            return
+        proto_path = os.path.normpath(
+            os.path.join(os.path.dirname(self.path), url))
+        if not os.path.isfile(proto_path):
+            return
+        name = os.path.basename(proto_path)[:-len(".proto")]
+        self._protos[name] = _parse_proto_interface(proto_path)
+
+    def _index_defs(self, nodes: list[WbtNode]) -> None:
+        for node in nodes:
+            if node.def_name is not None:
+                self.defs.setdefault(node.def_name, node)
+            self._index_defs(node.children())
+
+    def get_field(self, node: WbtNode, name: str) -> Any:
+        """Gets a node field value, falling back on the proto default if the
+        field isn't set within the world file
+
+        Args:
+            node (WbtNode): Parsed node
+            name (str): Field name
+
+        Returns:
+            Any: Field value, converted using the proto field type if known
+        """
+        interface = self._protos.get(node.type_name, {})
+        if name in interface:
+            field_type, default = interface[name]
+            if name in node.fields:
+                return _convert(field_type, node.fields[name])
+            return default
+        return node.fields.get(name)
+
+    def _tile(self, node: WbtNode) -> Tile:
+        get = lambda name: self.get_field(node, name)
+        colour = get("tileColor")
+        tile_color = [round(colour[0], 1), round(colour[1], 1),
+                      round(colour[2], 1)]
+        half: bool = node.type_name == "halfTile"
+        return Tile(
+            node.type_name, get("xPos"), get("zPos"), get("room"),
+            get("width"), get("height"), get("xScale"), get("zScale"),
+            get("topWall"), get("bottomWall"), get("leftWall"),
+            get("rightWall"), get("trap"), get("swamp"), get("checkpoint"),
+            get("start"), tile_color,
+            get("tile1Walls") if half else None,
+            get("tile2Walls") if half else None,
+            get("tile3Walls") if half else None,
+            get("tile4Walls") if half else None,
+            get("curve") if half else None,
+        )
+
+    def _sign(self, node: WbtNode) -> Sign:
+        rotation = list(self.get_field(node, "rotation"))
+        return Sign(self.get_field(node, "type"),
+                    list(self.get_field(node, "translation")),
+                    rotation,
+                    _rotation_to_orientation(rotation))
+
+    def get_tiles(self) -> list[Tile]:
+        """Gets all world tiles within the WALLTILES group, in the same way as
+        `MapAnswer.from_supervisor`
+
+        Returns:
+            list[Tile]: Map answer tiles
+        """
+        nodes = self.defs["WALLTILES"].children()
+        if len(nodes) > 0 and nodes[-1].def_name not in ("TILE", "START_TILE"):
+            nodes = nodes[:-1]
+        return [self._tile(n) for n in nodes]
+
+    def get_victims(self) -> list[Sign]:
+        """Gets all victims within the HUMANGROUP group
+
+        Returns:
+            list[Sign]: Map answer victim signs
+        """
+        return [self._sign(n) for n in self.defs["HUMANGROUP"].children()]
+
+    def get_hazards(self) -> list[Sign]:
+        """Gets all hazards within the HAZARDGROUP group
+
+        Returns:
+            list[Sign]: Map answer hazard signs
+        """
+        return [self._sign(n) for n in self.defs["HAZARDGROUP"].children()]
+
+    def get_bounds(
+        self,
+        bound_type: str
+    ) -> list[tuple[list[float], list[float]]]:
+        """Gets the min/max bound positions of a special tile type, in the same
+        way as the `TileManager`
+
+        Args:
+            bound_type (str): Special tile type, one of `World.BOUND_TYPES`
+
+        Returns:
+            list[tuple[list[float], list[float]]]: Min and max x,y,z position
+            of each tile
+        """
+        group: Optional[WbtNode] = self.defs.get(f"{bound_type.upper()}BOUNDS")
+        count: int = len(group.children()) if group is not None else 0
+
+        bounds: list[tuple[list[float], list[float]]] = []
+        for i in range(count):
+            min_node = self.defs.get(f"{bound_type}{i}min")
+            max_node = self.defs.get(f"{bound_type}{i}max")
+            if min_node is None or max_node is None:
+                continue
+            bounds.append((self._translation(min_node),
+                           self._translation(max_node)))
+        return bounds
+
+    @staticmethod
+    def _translation(node: WbtNode) -> list[float]:
+        # Bounds are plain Transform nodes, so there is no proto interface to
+        # give the field type
+        raw = node.fields.get("translation")
+        return _convert("SFVec3f", raw) if raw else [0.0, 0.0, 0.0]
+
+    def to_map_answer(self) -> MapAnswer:
+        """Builds the world's map answer
+
+        Returns:
+            MapAnswer: Map answer for the world
+        """
+        return MapAnswer(self.get_tiles(), self.get_victims(),
+                         self.get_hazards())
+
+
+def _generate_answer(path: str) -> Optional[list[list[str]]]:
+    return World(path).to_map_answer().generateAnswer()
+
+
+def generate_answers(
+    worlds_dir: str,
+    max_workers: Optional[int] = None
+) -> dict[str, Optional[list[list[str]]]]:
+    """Generates the map answer for every world within a directory, parsing
+    the worlds in a process pool
+
+    Args:
+        worlds_dir (str): Directory containing .wbt world files
+        max_workers (Optional[int], optional): Maximum number of worker
+        processes. Defaults to the number of processors.
+
+    Returns:
+        dict[str, Optional[list[list[str]]]]: Map answer matrix for each
+        world, keyed by world file path
+    """
+    paths: list[str] = sorted(
+        os.path.join(worlds_dir, name) for name in os.listdir(worlds_dir)
+        if name.endswith(".wbt")
+    )
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(paths, executor.map(_generate_answer, paths)))
@@ -0,0 +1,156 @@
+"""Benchmark of map completeness scoring: the original per cell nested loop
+against the vectorised `MapScorer._calculate_completeness`.
+
+Answers are generated from every world in `game/worlds`, plus larger maps
+tiled from them. Submissions are the answers with a share of their cells
+changed. Both implementations must give the same completeness and correct
+matrix for every map, or the benchmark fails.
+
+Example:
+    python tests/bench_completeness.py --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+import numpy.typing as npt
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir, "game", "controllers",
+                                "MainSupervisor"))
+
+from CellCodec import CellCodec  # noqa: E402
+from MapAnswer import MapAnswer  # noqa: E402
+from MapScorer import _calculate_completeness  # noqa: E402
+
+WORLDS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          os.pardir, "game", "worlds")
+
+# Cell values submissions are perturbed with
+CELLS = ['0', '1', '2', '3', '4', '5', 'b', 'y', 'g', 'p', 'o', 'r', '*',
+         'H', 'U', 'S', 'F', 'P', 'C', 'O', 'HU', 'UH', 'SF']
+
+
+def loop_completeness(
+    answer_matrix: npt.NDArray,
+    sub_matrix: npt.NDArray,
+) -> tuple[float, npt.NDArray]:
+    """The original nested loop `_calculate_completeness`, over string
+    matrices
+    """
+    correct: int = 0
+    incorrect: int = 0
+
+    if answer_matrix.shape != sub_matrix.shape:
+        return 0, np.array([])
+
+    correct_matrix: npt.NDArray = np.full(sub_matrix.shape, 0)
+
+    for i in range(len(answer_matrix)):
+        for j in range(len(answer_matrix[0])):
+            if not ((sub_matrix[i][j] == '0' and answer_matrix[i][j] == '0') or
+                    answer_matrix[i][j] == '20'):
+                if sub_matrix[i][j] == answer_matrix[i][j]:
+                    correct += 1
+                    correct_matrix[i][j] = 1
+                elif len(answer_matrix[i][j]) == 2:
+                    if (sub_matrix[i][j] == answer_matrix[i][j] or
+                            sub_matrix[i][j] == answer_matrix[i][j][::-1]):
+                        correct += 1
+                        correct_matrix[i][j] = 1
+                    else:
+                        incorrect += 1
+                else:
+                    incorrect += 1
+            else:
+                correct_matrix[i][j] = 2
+
+    return (correct / (correct + incorrect)), correct_matrix
+
+
+def generate_maps(
+    rng: np.random.Generator,
+    error_rate: float,
+) -> list[tuple[str, npt.NDArray, npt.NDArray]]:
+    """Generates answer and submission pairs from the repo's worlds
+
+    Args:
+        rng (np.random.Generator): Random generator for submission errors
+        error_rate (float): Share of submission cells changed
+
+    Returns:
+        list[tuple[str, npt.NDArray, npt.NDArray]]: Map name, answer matrix
+        and submission matrix
+    """
+    maps: list[tuple[str, npt.NDArray, npt.NDArray]] = []
+    for file_name in sorted(os.listdir(WORLDS_DIR)):
+        if not file_name.endswith(".wbt"):
+            continue
+        answer = MapAnswer.from_world(os.path.join(WORLDS_DIR, file_name))
+        matrix: npt.NDArray = np.array(answer.generateAnswer(), dtype=object)
+        name: str = file_name[:-len(".wbt")]
+        maps.append((name, matrix))
+        maps.append((f"{name} x4", np.tile(matrix, (4, 4))))
+
+    pairs: list[tuple[str, npt.NDArray, npt.NDArray]] = []
+    for name, matrix in maps:
+        sub: npt.NDArray = matrix.copy()
+        changed: npt.NDArray = rng.random(sub.shape) < error_rate
+        sub[changed] = rng.choice(CELLS, size=int(changed.sum()))
+        # Victims given in the other order still count as correct
+        for i, j in zip(*np.nonzero(np.vectorize(len)(sub) == 2)):
+            if rng.random() < 0.5:
+                sub[i, j] = sub[i, j][::-1]
+        pairs.append((name, matrix, sub))
+    return pairs
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark map completeness scoring")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Timing repeats, the best is reported")
+    parser.add_argument("--error-rate", type=float, default=0.2,
+                        help="Share of submission cells changed")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng: np.random.Generator = np.random.default_rng(args.seed)
+    # numpy times are given including encoding the string matrices, and for
+    # scoring pre-encoded matrices alone
+    print(f"{'map':18s} {'shape':>10s} {'loop ms':>9s} {'numpy ms':>9s} "
+          f"{'speedup':>8s} {'encoded ms':>11s} {'speedup':>8s}")
+    for name, answer, sub in generate_maps(rng, args.error_rate):
+        codec: CellCodec = CellCodec()
+
+        def vectorised() -> tuple[float, npt.NDArray]:
+            return _calculate_completeness(codec.encode(answer),
+                                           codec.encode(sub))
+
+        loop_score, loop_correct = loop_completeness(answer, sub)
+        score, correct = vectorised()
+        assert score == loop_score, (name, score, loop_score)
+        assert np.array_equal(correct, loop_correct), name
+
+        t_loop: float = min(timeit.repeat(
+            lambda: loop_completeness(answer, sub), number=1,
+            repeat=args.repeat))
+        t_vec: float = min(timeit.repeat(vectorised, number=1,
+                                         repeat=args.repeat))
+        encoded: tuple[npt.NDArray, npt.NDArray] = (codec.encode(answer),
+                                                    codec.encode(sub))
+        t_enc: float = min(timeit.repeat(
+            lambda: _calculate_completeness(*encoded), number=1,
+            repeat=args.repeat))
+        shape: str = f"{answer.shape[0]}x{answer.shape[1]}"
+        print(f"{name:18s} {shape:>10s} {t_loop * 1e3:9.2f} "
+              f"{t_vec * 1e3:9.2f} {t_loop / t_vec:7.0f}x "
+              f"{t_enc * 1e3:11.3f} {t_loop / t_enc:7.0f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
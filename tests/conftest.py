@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Supervisor modules import each other as top level modules, the same as when
+# Webots runs the controller
+SUPERVISOR_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "game",
+                              "controllers", "MainSupervisor")
+sys.path.insert(0, os.path.abspath(SUPERVISOR_DIR))
@@ -0,0 +1,142 @@
+"""Tests for the map matrix cell codec"""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from CellCodec import CellCodec
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "answers")
+WORLDS = sorted(f[:-len(".json")] for f in os.listdir(FIXTURES_DIR))
+
+SINGLE_CELLS = ['0', '1', '2', '3', '4', '5', 'b', 'y', 'g', 'p', 'o', 'r',
+                '*', 'H', 'U', 'S', 'F', 'P', 'C', 'O']
+
+
+@pytest.mark.parametrize("cell", SINGLE_CELLS)
+def test_single_cell_round_trip(cell):
+    codec = CellCodec()
+    assert codec.decode_cell(codec.encode_cell(cell)) == cell
+
+
+def test_feature_bits():
+    codec = CellCodec()
+    assert codec.encode_cell('0') == CellCodec.EMPTY
+    assert codec.encode_cell('1') == CellCodec.WALL
+    assert codec.encode_cell('2') == CellCodec.HOLE
+    assert codec.encode_cell('3') == CellCodec.SWAMP
+    assert codec.encode_cell('4') == CellCodec.CHECKPOINT
+    assert codec.encode_cell('5') == CellCodec.START
+    assert codec.encode_cell('b') == CellCodec.ROOM_1 | CellCodec.ROOM_2
+    assert codec.encode_cell('r') == CellCodec.ROOM_3 | CellCodec.ROOM_4
+    assert codec.encode_cell('*') == CellCodec.ROOM_4
+    assert codec.encode_cell('O') == CellCodec.HAZARD_O
+
+    # Every feature is a distinct bit
+    bits = [codec.encode_cell(c) for c in '12345HUSFPCO']
+    assert all(bit & (bit - 1) == 0 for bit in bits)
+    assert len(set(bits)) == len(bits)
+
+
+def test_pairs_are_or_of_features_in_either_order():
+    codec = CellCodec()
+    assert codec.encode_cell('HU') == CellCodec.VICTIM_H | CellCodec.VICTIM_U
+    assert codec.encode_cell('HU') == codec.encode_cell('UH')
+    assert codec.encode_cell('FS') == codec.encode_cell('SF')
+    # Decoded in a canonical order
+    assert codec.decode_cell(codec.encode_cell('UH')) == 'HU'
+    # A room connection with a sign keeps its room bits
+    assert codec.encode_cell('bH') == (CellCodec.ROOM_1 | CellCodec.ROOM_2 |
+                                       CellCodec.VICTIM_H)
+    assert codec.decode_cell(codec.encode_cell('Hb')) == 'bH'
+
+
+def test_legacy_room_4():
+    codec = CellCodec()
+    assert codec.encode_cell('20') == CellCodec.LEGACY_ROOM_4
+    assert codec.encode_cell('02') == CellCodec.LEGACY_ROOM_4
+    assert codec.decode_cell(CellCodec.LEGACY_ROOM_4) == '20'
+    assert codec.features(np.array([CellCodec.LEGACY_ROOM_4]))[0] == 0
+    assert codec.isdigit(np.array([CellCodec.LEGACY_ROOM_4]))[0]
+
+
+def test_escape_codes():
+    codec = CellCodec()
+    # Repeated signs, two room cells and unknown values can't be OR'd
+    hh = codec.encode_cell('HH')
+    by = codec.encode_cell('by')
+    unknown = codec.encode_cell('xyz')
+    assert hh == CellCodec._ESCAPE_START
+    assert by == CellCodec._ESCAPE_START - 1
+    assert unknown == CellCodec._ESCAPE_START - 2
+    assert codec.encode_cell('HH') == hh
+    assert codec.encode_cell('yb') == by
+
+    assert codec.decode_cell(hh) == 'HH'
+    assert codec.decode_cell(by) == 'by'
+    assert codec.decode_cell(unknown) == 'xyz'
+    # Escaped cells hold the features of their known chars
+    assert codec.features(np.array([hh]))[0] == CellCodec.VICTIM_H
+    assert codec.features(np.array([unknown]))[0] == CellCodec.ROOM_1 | (
+        CellCodec.ROOM_3)
+
+
+def test_escape_codes_are_per_instance():
+    a = CellCodec()
+    b = CellCodec()
+    a.encode_cell('HH')
+    assert a.encode_cell('SS') == CellCodec._ESCAPE_START - 1
+    assert b.encode_cell('SS') == CellCodec._ESCAPE_START
+    assert b.decode_cell(CellCodec._ESCAPE_START) == 'SS'
+
+
+def test_unmatched():
+    codec = CellCodec()
+    count = CellCodec._ESCAPE_START - CellCodec.UNMATCHED
+    codes = [codec.encode_cell(f"x{i}") for i in range(count + 2)]
+    assert len(set(codes[:count])) == count
+    assert min(codes[:count]) > CellCodec.UNMATCHED
+    assert codes[count:] == [CellCodec.UNMATCHED] * 2
+    assert codec.decode_cell(CellCodec.UNMATCHED) == '?'
+    assert codec.features(np.array([CellCodec.UNMATCHED]))[0] == 0
+
+
+def test_isdigit():
+    codec = CellCodec()
+    cells = np.array(['0', '1', '5', '20', 'b', 'H', '*', '11'])
+    expected = [cell.isdigit() for cell in cells]
+    assert codec.isdigit(codec.encode(cells)).tolist() == expected
+
+
+def test_matrix_encode_matches_cells():
+    codec = CellCodec()
+    matrix = np.array([['0', '1', 'HU'], ['UH', '20', 'HH'], ['*', 'b', '']])
+    codes = codec.encode(matrix)
+    assert codes.dtype == np.uint16
+    assert codes.shape == matrix.shape
+    # Escape codes may be allocated in a different order, so compare by
+    # decoded value
+    assert [[codec.decode_cell(c) for c in row] for row in codes] == [
+        ['0', '1', 'HU'], ['HU', '20', 'HH'], ['*', 'b', '']]
+    assert codes[0, 2] == codes[1, 0]
+    assert codes[0, 1] == codec.encode_cell('1')
+
+
+def test_empty_matrix():
+    codec = CellCodec()
+    assert codec.encode(np.empty((0, 0), dtype=str)).shape == (0, 0)
+
+
+@pytest.mark.parametrize("world", WORLDS)
+def test_answer_round_trip(world):
+    with open(os.path.join(FIXTURES_DIR, f"{world}.json"), 'r') as f:
+        answer = np.array(json.load(f))
+    codec = CellCodec()
+    decoded = codec.decode(codec.encode(answer))
+    # Two sign cells decode in canonical order
+    canonical = np.vectorize(
+        lambda c: codec.decode_cell(codec.encode_cell(c)))(answer)
+    assert decoded.tolist() == canonical.tolist()
+    assert codec.encode(decoded).tolist() == codec.encode(answer).tolist()
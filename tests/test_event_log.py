@@ -0,0 +1,131 @@
+"""Tests for match event log summaries and aggregation"""
+
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+import EventLog
+from Logger import Logger
+
+
+def _record(kind, points, score, sim_time=1.0):
+    return {"kind": kind, "points": points, "score": score,
+            "sim_time": sim_time, "real_time": sim_time / 2}
+
+
+def _write_match(log_dir, name, world, records, complete, robot="team"):
+    summary = EventLog.create_summary(world, robot, 480, "2024-01-01T00:00")
+    for record in records:
+        EventLog.update_summary(summary, record)
+    if not complete:
+        # As written when the match starts
+        summary = EventLog.create_summary(world, robot, 480,
+                                          "2024-01-01T00:00")
+    summary["complete"] = complete
+    with open(os.path.join(log_dir, name + EventLog.SUMMARY_EXT), 'w') as f:
+        json.dump(summary, f)
+    if records:
+        with open(os.path.join(log_dir, name + EventLog.EVENTS_EXT), 'w') as f:
+            f.writelines(json.dumps(r) + '\n' for r in records)
+
+
+def test_update_summary():
+    summary = EventLog.create_summary("world1", "team", 480, "")
+    EventLog.update_summary(summary, _record("victim", 15, 15, 10.0))
+    EventLog.update_summary(summary, _record("victim", 10, 25, 20.0))
+    EventLog.update_summary(summary, _record("checkpoint", 10, 35, 30.0))
+    assert summary["events"] == 3
+    assert summary["counts"] == {"victim": 2, "checkpoint": 1}
+    assert summary["points"] == {"victim": 25, "checkpoint": 10}
+    assert summary["score"] == 35
+    assert summary["sim_time"] == 30.0
+    assert summary["real_time"] == 15.0
+
+
+def test_iter_events_skips_partial_line(tmp_path):
+    path = tmp_path / "match.jsonl"
+    path.write_text(json.dumps(_record("victim", 15, 15)) + '\n{"kind": "vi')
+    assert [r["kind"] for r in EventLog.iter_events(str(path))] == ["victim"]
+
+
+def test_killed_match_keeps_header(tmp_path):
+    records = [_record("victim", 15, 15), _record("hazard", 10, 25)]
+    _write_match(str(tmp_path), "a", "world1", records, complete=False)
+
+    (match,) = EventLog.iter_matches(str(tmp_path))
+    assert match["name"] == "a"
+    assert match["world"] == "world1"
+    assert match["robot"] == "team"
+    assert match["max_time"] == 480
+    assert not match["complete"]
+    assert match["score"] == 25
+    assert match["counts"] == {"victim": 1, "hazard": 1}
+
+
+def test_match_without_summary(tmp_path):
+    with open(tmp_path / ("a" + EventLog.EVENTS_EXT), 'w') as f:
+        f.write(json.dumps(_record("victim", 15, 15)) + '\n')
+    (match,) = EventLog.iter_matches(str(tmp_path))
+    assert match["world"] == ""
+    assert match["score"] == 15
+
+
+def test_aggregate(tmp_path):
+    log_dir = str(tmp_path)
+    _write_match(log_dir, "a", "world1",
+                 [_record("victim", 15, 15), _record("checkpoint", 10, 25)],
+                 complete=True)
+    _write_match(log_dir, "b", "world1",
+                 [_record("victim", 30, 30)], complete=True)
+    _write_match(log_dir, "c", "world2",
+                 [_record("hazard", 20, 20)], complete=False)
+    # A finished match without any scoring events
+    _write_match(log_dir, "d", "world2", [], complete=True)
+
+    result = EventLog.aggregate(EventLog.iter_matches(log_dir))
+
+    assert result["matches"] == 4
+    assert result["complete"] == 3
+    assert result["total_score"] == 75
+    assert result["max_score"] == 30
+    assert result["mean_score"] == pytest.approx(18.75)
+    assert result["counts"] == {"victim": 2, "checkpoint": 1, "hazard": 1}
+    assert result["points"] == {"victim": 45, "checkpoint": 10, "hazard": 20}
+
+    assert set(result["worlds"]) == {"world1", "world2"}
+    world1 = result["worlds"]["world1"]
+    assert world1["matches"] == 2
+    assert world1["total_score"] == 55
+    assert world1["mean_score"] == 27.5
+    world2 = result["worlds"]["world2"]
+    assert world2["matches"] == 2
+    assert world2["max_score"] == 20
+    assert world2["counts"] == {"hazard": 1}
+
+
+def test_logger_writes_summary_on_start(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        Logger, "_get_log_path",
+        lambda dir_path, dir_rel_path, prefix, file_date, ext=".txt":
+            os.path.join(str(tmp_path), f"{prefix}{dir_path.count('/')}{ext}"))
+    # Restored when the test ends, as if the supervisor was killed before
+    # write_log
+    for name in ("_game_log_path", "_rws_log_path", "_events_path",
+                 "_summary_path", "_summary"):
+        monkeypatch.setattr(Logger, name, None)
+    robot = SimpleNamespace(name="team",
+                            history=SimpleNamespace(master_history=[]))
+    rws = SimpleNamespace(log_history=[])
+
+    Logger.start_log(robot, rws, 480, "world1")
+    Logger.log_match_event(_record("victim", 15, 15))
+    assert Logger.flush(5.0)
+
+    (match,) = EventLog.iter_matches(str(tmp_path))
+    assert match["world"] == "world1"
+    assert match["robot"] == "team"
+    assert match["max_time"] == 480
+    assert not match["complete"]
+    assert match["score"] == 15
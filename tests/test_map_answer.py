@@ -0,0 +1,53 @@
+"""Regression tests for map answer generation.
+
+The fixtures in `fixtures/answers` are the answer matrices of each world in
+`game/worlds`, generated by `generateAnswer` before it was rewritten to use
+precompiled tile stamps (i.e. with one `setAnswer` call per cell). Answers
+must stay identical to them, cell for cell.
+"""
+
+import json
+import os
+
+import pytest
+
+from MapAnswer import MapAnswer
+
+WORLDS_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "game",
+                          "worlds")
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "answers")
+
+WORLDS = sorted(f[:-len(".wbt")] for f in os.listdir(WORLDS_DIR)
+                if f.endswith(".wbt"))
+
+
+def _load_fixture(world: str) -> list[list[str]]:
+    with open(os.path.join(FIXTURES_DIR, f"{world}.json"), 'r') as f:
+        return json.load(f)
+
+
+def test_every_world_has_fixture():
+    missing = [world for world in WORLDS
+               if not os.path.isfile(os.path.join(FIXTURES_DIR,
+                                                  f"{world}.json"))]
+    assert missing == []
+
+
+@pytest.mark.parametrize("world", WORLDS)
+def test_generate_answer_matches_fixture(world: str):
+    answer = MapAnswer.from_world(os.path.join(WORLDS_DIR, f"{world}.wbt"))
+    expected = _load_fixture(world)
+
+    generated = answer.generateAnswer()
+
+    assert json.dumps(generated) == json.dumps(expected)
+
+
+@pytest.mark.parametrize("world", WORLDS)
+def test_generate_answer_from_dict_matches_fixture(world: str):
+    # Answers built from an exported world (e.g. a world bundle) must match
+    # those built from the world file
+    answer = MapAnswer.from_world(os.path.join(WORLDS_DIR, f"{world}.wbt"))
+    answer = MapAnswer.from_dict(json.loads(json.dumps(answer.to_dict())))
+
+    assert answer.generateAnswer() == _load_fixture(world)
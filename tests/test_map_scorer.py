@@ -0,0 +1,225 @@
+"""Tests for map scoring. Scores are checked against a copy of the original
+string based scorer (start tile alignment, 3n x 3m shift window and nested
+loop comparison), so changes to the scoring engine can't silently change
+competition scores.
+"""
+
+import json
+import os
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+import pytest
+
+import MapScorer
+from MapScorer import (ALIGN_BEST, ALIGN_FALLBACK, ALIGN_START,
+                       calculateScore, calculateScoreBreakdown)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "answers")
+WORLDS = sorted(f[:-len(".json")] for f in os.listdir(FIXTURES_DIR))
+
+# Cells used to perturb submissions, never '5' so the start tile is kept
+CELLS = ['0', '1', '2', '3', '4', 'b', 'y', 'g', 'p', 'o', 'r', '*', 'H', 'U',
+         'S', 'F', 'P', 'C', 'O', 'HU']
+
+
+def _load_answer(world: str) -> npt.NDArray:
+    with open(os.path.join(FIXTURES_DIR, f"{world}.json"), 'r') as f:
+        return np.array(json.load(f))
+
+
+def _baseline_start(matrix: npt.NDArray) -> Optional[npt.NDArray]:
+    starts = np.argwhere(matrix == '5')
+    return starts[0] if len(starts) > 0 else None
+
+
+def _baseline_completeness(answer: npt.NDArray, sub: npt.NDArray) -> float:
+    if answer.shape != sub.shape:
+        return 0
+    correct = incorrect = 0
+    for i in range(len(answer)):
+        for j in range(len(answer[0])):
+            if not ((sub[i][j] == '0' and answer[i][j] == '0') or
+                    answer[i][j] == '20'):
+                if sub[i][j] == answer[i][j]:
+                    correct += 1
+                elif len(answer[i][j]) == 2:
+                    if sub[i][j] == answer[i][j][::-1]:
+                        correct += 1
+                    else:
+                        incorrect += 1
+                else:
+                    incorrect += 1
+    return correct / (correct + incorrect)
+
+
+def _baseline_score(answer: npt.NDArray, sub: npt.NDArray) -> float:
+    """The original scorer: the best of the 4 rotations, each aligned by the
+    first start cell, with the submission shifted within a 3n x 3m window"""
+    scores = []
+    for k in range(4):
+        rotated = np.rot90(answer, k=k, axes=(1, 0))
+        dy, dx = _baseline_start(rotated) - _baseline_start(sub)
+        n, m = sub.shape
+        an, am = rotated.shape
+        big = np.full((n * 3, m * 3), '0', dtype=sub.dtype)
+        big[n:2*n, m:2*m] = sub
+        y, x = n - dy, m - dx
+        scores.append(_baseline_completeness(rotated, big[y:y+an, x:x+am]))
+    return max(scores)
+
+
+def _perturb(
+    answer: npt.NDArray,
+    rng: np.random.Generator,
+    rate: float
+) -> npt.NDArray:
+    sub = answer.astype('<U2')
+    changed = (rng.random(sub.shape) < rate) & (sub != '5')
+    sub[changed] = rng.choice(CELLS, size=int(changed.sum()))
+    return sub
+
+
+def _submissions(world: str) -> list[npt.NDArray]:
+    """Perturbed submissions with one start tile: rotated, padded and cropped
+    """
+    rng = np.random.default_rng(sum(map(ord, world)))
+    answer = _load_answer(world)
+    subs = []
+    for rate in (0.0, 0.05, 0.3):
+        sub = _perturb(answer, rng, rate)
+        subs.append(sub)
+        subs.append(np.rot90(sub, k=int(rng.integers(1, 4))))
+        subs.append(np.pad(sub, ((3, 1), (0, 5)), constant_values='0'))
+        subs.append(sub[2:, :-3])
+    return subs
+
+
+@pytest.mark.parametrize("world", WORLDS)
+@pytest.mark.parametrize("align", [ALIGN_START, ALIGN_FALLBACK])
+def test_score_matches_baseline(world: str, align: str):
+    answer = _load_answer(world)
+    for sub in _submissions(world):
+        assert calculateScore(answer, sub, align=align) == pytest.approx(
+            _baseline_score(answer, sub), abs=1e-12)
+
+
+@pytest.mark.parametrize("world", WORLDS)
+def test_best_score_at_least_baseline(world: str):
+    answer = _load_answer(world)
+    for sub in _submissions(world):
+        assert (calculateScore(answer, sub, align=ALIGN_BEST) >=
+                _baseline_score(answer, sub) - 1e-12)
+
+
+@pytest.mark.parametrize("world", WORLDS)
+def test_exact_submission_scores_full(world: str):
+    answer = _load_answer(world)
+    for align in (ALIGN_START, ALIGN_FALLBACK, ALIGN_BEST):
+        assert calculateScore(answer, answer, align=align) == 1.0
+
+
+def test_start_tiles_counted_by_tile():
+    answer = MapScorer.CellCodec().encode(_load_answer("world2"))
+    assert np.count_nonzero(answer == MapScorer.CellCodec.START) == 4
+    assert MapScorer._count_start_tiles(answer) == 1
+
+    # A second start tile elsewhere on the map
+    answer[0, 0] = MapScorer.CellCodec.START
+    assert MapScorer._count_start_tiles(answer) == 2
+
+
+def test_fallback_aligns_without_start_tile():
+    answer = _load_answer("world1")
+    sub = np.where(answer == '5', '0', answer)
+    shifted = np.pad(sub, ((4, 0), (0, 8)), constant_values='0')
+
+    # Only the 4 start cells are wrong, wherever the map is
+    expected = _baseline_completeness(answer, sub)
+    assert calculateScore(answer, shifted, align=ALIGN_FALLBACK) == (
+        pytest.approx(expected))
+    with pytest.raises(Exception):
+        calculateScore(answer, shifted, align=ALIGN_START)
+
+
+def test_fallback_aligns_duplicate_start_tile():
+    answer = _load_answer("world2")
+    sub = answer.copy()
+    # A misplaced extra start tile, found first by the row major scan
+    sub[1, 1] = sub[1, 3] = sub[3, 1] = sub[3, 3] = '5'
+
+    fallback = calculateScore(answer, sub, align=ALIGN_FALLBACK)
+    assert fallback > calculateScore(answer, sub, align=ALIGN_START)
+    assert fallback == pytest.approx(_baseline_completeness(answer, sub))
+
+
+def test_shift_outside_window_scores_zero():
+    answer = _load_answer("world1")
+    # A tiny submission whose start cell would put the answer outside the
+    # 3n x 3m window around it
+    sub = np.array([['5', '1'], ['1', '1']])
+    assert _baseline_score(answer, sub) == 0
+    assert calculateScore(answer, sub, align=ALIGN_START) == 0
+    assert calculateScore(answer, sub, align=ALIGN_FALLBACK) == 0
+
+
+def test_breakdown_counts():
+    answer = _load_answer("world1")
+    sub = answer.copy()
+    walls = np.argwhere(answer == '1')
+    sub[tuple(walls[:5].T)] = '0'
+    sub[0, 0] = sub[0, 0] if answer[0, 0] != '0' else '1'
+    extra_wall = int(answer[0, 0] == '0')
+
+    score, breakdown = calculateScoreBreakdown(answer, sub)
+
+    assert score == pytest.approx(_baseline_score(answer, sub))
+    assert breakdown["wall"]["missed"] == 5
+    assert breakdown["wall"]["correct"] == np.count_nonzero(answer == '1') - 5
+    assert breakdown["wall"]["extra"] == extra_wall
+    assert breakdown["start"] == {"correct": 4, "missed": 0, "extra": 0}
+    for name in MapScorer.MAP_CATEGORIES:
+        assert set(breakdown[name]) == {"correct", "missed", "extra"}
+
+
+def test_breakdown_values():
+    answer = np.array([['5', '1', 'HU'],
+                       ['b', '*', '0'],
+                       ['2', '3', '20']])
+    sub = np.array([['5', '1', 'UH'],
+                    ['0', '*', '1'],
+                    ['2', '4', '20']])
+
+    score, breakdown = calculateScoreBreakdown(answer, sub)
+
+    # The legacy room 4 marker is ignored, as are cells empty in both
+    assert score == pytest.approx(5 / 8)
+    assert score == pytest.approx(calculateScore(answer, sub))
+    assert breakdown["start"] == {"correct": 1, "missed": 0, "extra": 0}
+    assert breakdown["wall"] == {"correct": 1, "missed": 0, "extra": 1}
+    assert breakdown["hole"] == {"correct": 1, "missed": 0, "extra": 0}
+    assert breakdown["swamp"] == {"correct": 0, "missed": 1, "extra": 0}
+    assert breakdown["checkpoint"] == {"correct": 0, "missed": 0, "extra": 1}
+    # Victims given in either order are correct
+    assert breakdown["victim H"] == {"correct": 1, "missed": 0, "extra": 0}
+    assert breakdown["victim U"] == {"correct": 1, "missed": 0, "extra": 0}
+    assert breakdown["victim S"] == {"correct": 0, "missed": 0, "extra": 0}
+    assert breakdown["connection"] == {"correct": 0, "missed": 1, "extra": 0}
+    assert breakdown["room 4"] == {"correct": 1, "missed": 0, "extra": 0}
+
+    assert MapScorer.format_breakdown(breakdown) == (
+        "wall 1/1 (+1 extra) | hole 1/1 | swamp 0/1 | "
+        "checkpoint 0/0 (+1 extra) | start 1/1 | victim H 1/1 | "
+        "victim U 1/1 | connection 0/1 | room 4 1/1")
+
+
+def test_breakdown_of_exact_submission():
+    answer = _load_answer("room4")
+    score, breakdown = calculateScoreBreakdown(answer, answer.copy())
+    assert score == 1.0
+    assert all(counts["missed"] == 0 and counts["extra"] == 0
+               for counts in breakdown.values())
+    assert breakdown["room 4"]["correct"] == np.count_nonzero(answer == '*')
+    assert breakdown["wall"]["correct"] == np.count_nonzero(
+        np.char.find(answer, '1') >= 0)
@@ -0,0 +1,114 @@
+"""Tests for draining and dispatching robot packets"""
+
+import struct
+
+import pytest
+
+from ReceiverPump import ReceiverPump
+
+
+class FakeReceiver:
+    """Stand in for a Webots receiver, holding a queue of packets"""
+
+    def __init__(self, packets):
+        self.packets = list(packets)
+
+    def getQueueLength(self):
+        return len(self.packets)
+
+    def getBytes(self):
+        return self.packets[0]
+
+    def nextPacket(self):
+        self.packets.pop(0)
+
+
+VICTIM = struct.pack('i i c', 12, -30, b'H')
+MAP_DATA = struct.pack('2i', 2, 2) + b'5,1,1,0'
+STAGE = struct.pack('c i', b'T', 3)
+
+
+@pytest.mark.parametrize("data, kind", [
+    (b'E', ReceiverPump.EXIT),
+    (b'M', ReceiverPump.MAP),
+    (b'L', ReceiverPump.LOP),
+    (b'G', ReceiverPump.GAME_INFO),
+    (b'X', ReceiverPump.UNKNOWN),
+    (VICTIM, ReceiverPump.VICTIM),
+    (MAP_DATA, ReceiverPump.MAP_DATA),
+    (STAGE, ReceiverPump.MAP_DATA),
+])
+def test_classify(data, kind):
+    assert ReceiverPump(FakeReceiver([])).classify(data) == kind
+
+
+def test_classify_test_stage():
+    pump = ReceiverPump(FakeReceiver([]), test_stages=True)
+    assert pump.classify(STAGE) == ReceiverPump.TEST_STAGE
+    assert pump.classify(VICTIM) == ReceiverPump.VICTIM
+
+
+def test_pump_dispatches_every_packet_in_order():
+    receiver = FakeReceiver([VICTIM, b'G', MAP_DATA, b'M', b'X'])
+    pump = ReceiverPump(receiver)
+    handled = []
+    for kind in (ReceiverPump.VICTIM, ReceiverPump.GAME_INFO,
+                 ReceiverPump.MAP_DATA, ReceiverPump.MAP):
+        pump.register(kind, lambda data, kind=kind: handled.append((kind,
+                                                                    data)))
+
+    assert pump.pump() == 5
+    assert handled == [(ReceiverPump.VICTIM, VICTIM),
+                       (ReceiverPump.GAME_INFO, b'G'),
+                       (ReceiverPump.MAP_DATA, MAP_DATA),
+                       (ReceiverPump.MAP, b'M')]
+    assert receiver.packets == []
+    # Packets without a handler are still counted
+    assert pump.counts == {ReceiverPump.VICTIM: 1, ReceiverPump.GAME_INFO: 1,
+                           ReceiverPump.MAP_DATA: 1, ReceiverPump.MAP: 1,
+                           ReceiverPump.UNKNOWN: 1}
+    assert pump.high_water == 5
+
+
+def test_pump_stops_and_drops_after_match_ends():
+    receiver = FakeReceiver([b'G', b'E', VICTIM, b'M'])
+    pump = ReceiverPump(receiver)
+    running = [True]
+    handled = []
+    pump.register(ReceiverPump.GAME_INFO, handled.append)
+    pump.register(ReceiverPump.EXIT,
+                  lambda data: (handled.append(data), running.clear()))
+    pump.register(ReceiverPump.VICTIM, handled.append)
+
+    assert pump.pump(lambda: bool(running)) == 2
+    assert handled == [b'G', b'E']
+    assert receiver.packets == []
+    assert pump.counts[ReceiverPump.DROPPED] == 2
+    assert ReceiverPump.VICTIM not in pump.counts
+
+
+def test_high_water_is_max_queue_length():
+    receiver = FakeReceiver([b'G'] * 3)
+    pump = ReceiverPump(receiver)
+    pump.pump()
+    receiver.packets = [b'G']
+    pump.pump()
+    assert pump.high_water == 3
+    assert pump.counts[ReceiverPump.GAME_INFO] == 4
+    assert pump.get_stats() == (
+        "Receiver: game info: 4 (max queue length 3)")
+
+
+def test_drop():
+    receiver = FakeReceiver([b'G', b'M'])
+    pump = ReceiverPump(receiver)
+    assert pump.drop() == 2
+    assert pump.drop() == 0
+    assert receiver.packets == []
+    assert pump.counts == {ReceiverPump.DROPPED: 2}
+
+
+def test_empty_stats():
+    pump = ReceiverPump(FakeReceiver([]))
+    assert pump.pump() == 0
+    assert pump.get_stats() == "Receiver: no packets (max queue length 0)"
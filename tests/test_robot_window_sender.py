@@ -0,0 +1,97 @@
+"""Tests for the robot window message history"""
+
+from RobotWindowSender import RWSender
+
+
+class FakeErebus:
+    """Stand in for the supervisor, recording robot window messages"""
+
+    def __init__(self):
+        self.sent = []
+
+    def wwiSendText(self, text):
+        self.sent.append(text)
+
+
+def _sender(**kwargs):
+    erebus = FakeErebus()
+    return RWSender(erebus, **kwargs), erebus
+
+
+def test_state_commands_keep_latest():
+    rws, erebus = _sender()
+    rws.send("startup")
+    for i in range(100):
+        rws.send("update", f"{i},{i * 2}")
+    rws.send("config", "1,0")
+    rws.send("config", "0,1")
+
+    assert rws.history == [["startup", ""], ["update", "99,198"],
+                           ["config", "0,1"]]
+    assert len(erebus.sent) == 103
+
+
+def test_merged_state_commands():
+    rws, _ = _sender()
+    rws.send("loaded0", "robot")
+    rws.send("version", "24.0.0")
+    rws.send("outdated", "24.0.0,25.0.0")
+    rws.send("unloaded0")
+    rws.send("remoteEnabled")
+    rws.send("remoteDisabled")
+
+    assert rws.history == [["outdated", "24.0.0,25.0.0"], ["unloaded0", ""],
+                           ["remoteDisabled", ""]]
+
+
+def test_docker_run_keeps_both_states():
+    rws, _ = _sender()
+    rws.update_history("runDockerPressed")
+    rws.send("dockerSuccess")
+    assert rws.history == [["runDockerPressed", ""], ["dockerSuccess", ""]]
+
+
+def test_robot_state_kept_per_robot():
+    rws, _ = _sender()
+    rws.send("loadControllerPressed,", "0")
+    rws.send("loadControllerPressed,", "1")
+    rws.send("unloadControllerPressed,", "0")
+
+    assert rws.history == [["loadControllerPressed,", "1"],
+                           ["unloadControllerPressed,", "0"]]
+
+
+def test_events_bounded():
+    rws, _ = _sender(max_events=3)
+    rws.send("update", "0")
+    for i in range(5):
+        rws.send("historyUpdate", str(i))
+    rws.send("update", "1")
+
+    assert rws.history == [["historyUpdate", "2"], ["historyUpdate", "3"],
+                           ["historyUpdate", "4"], ["update", "1"]]
+
+
+def test_send_all_replays_history():
+    rws, erebus = _sender()
+    rws.send("startup")
+    rws.send("historyUpdate", "a")
+    rws.send("update", "1")
+    rws.send("update", "2")
+    erebus.sent.clear()
+
+    rws.send_all()
+    assert erebus.sent == ["startup,", "historyUpdate,a", "update,2"]
+    # Replaying doesn't add to the history
+    assert len(rws.history) == 3
+
+
+def test_log_history_bounded():
+    rws, _ = _sender(max_log_records=2)
+    rws.send("update", "1")
+    rws.update_received_history("run", "[]")
+    rws.send("update", "2")
+
+    assert list(rws.log_history) == ["run\t[]", "update\t2"]
+    # Received messages aren't re-sent
+    assert rws.history == [["update", "2"]]
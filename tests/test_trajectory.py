@@ -0,0 +1,114 @@
+"""Tests for the robot motion trajectory"""
+
+import math
+
+import pytest
+
+from Trajectory import Trajectory
+
+STEP = 0.016
+STILL = [0.0] * 6
+
+
+def _walk(trajectory, steps, start=0.0, x0=0.0, dx=0.01, stopped=False):
+    """Pushes samples of the robot moving along x at a constant speed"""
+    for i in range(steps):
+        trajectory.push(start + i * STEP, [x0 + i * dx, 0.0, 0.0],
+                        [dx / STEP, 0.0, 0.0, 0.0, 0.0, 0.0], stopped)
+    return start + steps * STEP, x0 + steps * dx
+
+
+def test_empty():
+    trajectory = Trajectory()
+    assert len(trajectory) == 0
+    assert trajectory.time_stopped() == 0.0
+    assert not trajectory.stopped_for(0.0)
+    assert trajectory.distance_travelled(10) == 0.0
+    assert trajectory.tile is None
+
+
+def test_paused_samples_ignored():
+    trajectory = Trajectory()
+    assert trajectory.push(1.0, [0, 0, 0], STILL, False, tile=3)
+    assert not trajectory.push(1.0, [1, 0, 0], STILL, False, tile=4)
+    assert not trajectory.push(0.5, [1, 0, 0], STILL, False, tile=4)
+    assert len(trajectory) == 1
+    assert trajectory.tile == 3
+    assert trajectory.distance_travelled(10) == 0.0
+
+
+def test_time_stopped():
+    trajectory = Trajectory()
+    time, _ = _walk(trajectory, 10)
+    assert not trajectory.stopped_for(0.0)
+
+    for i in range(100):
+        trajectory.push(time + i * STEP, [0.1, 0, 0], STILL, True)
+    assert trajectory.time_stopped() == pytest.approx(99 * STEP)
+    assert trajectory.stopped_for(1.0)
+    assert not trajectory.stopped_for(2.0)
+
+    trajectory.reset_stopped()
+    assert trajectory.time_stopped() == 0.0
+    trajectory.push(time + 100 * STEP, [0.1, 0, 0], STILL, True)
+    trajectory.push(time + 101 * STEP, [0.1, 0, 0], STILL, True)
+    assert trajectory.time_stopped() == pytest.approx(STEP)
+
+    # Moving resets the stop timer
+    trajectory.push(time + 102 * STEP, [0.2, 0, 0], STILL, False)
+    assert trajectory.time_stopped() == 0.0
+
+
+def test_distance_travelled():
+    trajectory = Trajectory()
+    _walk(trajectory, 200)
+    # Each step moves 0.01m, and the window includes its first sample
+    assert trajectory.distance_travelled(1.0) == pytest.approx(
+        0.01 * math.floor(1.0 / STEP + 1e-9))
+    assert trajectory.distance_travelled(0.0) == 0.0
+    assert trajectory.distance_travelled(100.0) == pytest.approx(1.99)
+
+
+def test_distance_limited_to_capacity():
+    trajectory = Trajectory(capacity=50)
+    _walk(trajectory, 200)
+    assert len(trajectory) == 50
+    assert trajectory.distance_travelled(100.0) == pytest.approx(0.49)
+    assert trajectory.distance_travelled(10 * STEP) == pytest.approx(0.1)
+
+
+def test_distance_with_uneven_steps():
+    trajectory = Trajectory(capacity=16)
+    times = [0.0, 0.016, 0.032, 0.5, 0.516, 0.532, 2.0, 2.016, 2.032]
+    for i, time in enumerate(times):
+        trajectory.push(time, [i * 0.1, 0, 0], STILL, False)
+    assert trajectory.distance_travelled(0.032) == pytest.approx(0.2)
+    assert trajectory.distance_travelled(0.04) == pytest.approx(0.2)
+    assert trajectory.distance_travelled(1.5) == pytest.approx(0.3)
+    assert trajectory.distance_travelled(1.6) == pytest.approx(0.5)
+    assert trajectory.distance_travelled(1.9) == pytest.approx(0.5)
+
+
+def test_break_path_skips_jump():
+    trajectory = Trajectory()
+    time, x = _walk(trajectory, 10)
+    trajectory.break_path()
+    # Relocated 5m away
+    _walk(trajectory, 10, start=time, x0=x + 5.0)
+    assert trajectory.distance_travelled(100.0) == pytest.approx(0.18)
+
+
+def test_clear():
+    trajectory = Trajectory()
+    time, _ = _walk(trajectory, 10, stopped=True)
+    trajectory.push(time, [0, 0, 0], STILL, True, tile=7)
+    trajectory.clear()
+    assert len(trajectory) == 0
+    assert trajectory.tile is None
+    assert trajectory.time_stopped() == 0.0
+    assert trajectory.distance_travelled(100.0) == 0.0
+
+    # Samples earlier than those before clearing are accepted again
+    assert trajectory.push(0.0, [0, 0, 0], STILL, False)
+    assert trajectory.push(STEP, [1, 0, 0], STILL, False)
+    assert trajectory.distance_travelled(100.0) == pytest.approx(1.0)
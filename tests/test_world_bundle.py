@@ -0,0 +1,143 @@
+"""Tests for compiling and loading world bundles"""
+
+import json
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from WorldBundle import WorldBundle
+
+ANSWER = [['5', '1', '0'], ['1', 'HU', '*']]
+
+
+def _tile(x0, z0, x1, z1):
+    return SimpleNamespace(min=(x0, z0), max=(x1, z1),
+                           center=((x0 + x1) / 2, -0.03, (z0 + z1) / 2))
+
+
+def _sign(position, normal):
+    return SimpleNamespace(position=position,
+                           get_surface_normal=lambda: normal)
+
+
+def _managers():
+    tile_manager = SimpleNamespace(
+        start_tile=_tile(-0.54, -0.54, -0.42, -0.42),
+        checkpoints=[_tile(0.0, 0.0, 0.12, 0.12),
+                     _tile(0.3, 0.0, 0.42, 0.12)],
+        swamps=[_tile(0.6, 0.6, 0.72, 0.72)],
+        rooms=np.array([1, 1, 2, 0, 3], dtype=np.int8),
+        start_geometry=(0.12, 10.0, 8.0),
+    )
+    victim_manager = SimpleNamespace(
+        victims=[_sign([0.1, 0.05, 0.2], [1.0, 0.0, 0.0])],
+        hazards=[_sign([0.3, 0.05, 0.4], [0.0, 0.0, -1.0]),
+                 _sign([0.5, 0.05, 0.6], [-1.0, 0.0, 0.0])],
+    )
+    return tile_manager, victim_manager
+
+
+@pytest.fixture
+def world(tmp_path):
+    world_path = tmp_path / "test_world.wbt"
+    world_path.write_text("#VRML_SIM R2023b utf8\nWorldInfo {}\n")
+    thumbnail_path = tmp_path / "thumbnail.png"
+    thumbnail_path.write_bytes(b"png")
+    return str(world_path), str(thumbnail_path)
+
+
+def _compile(world_path, thumbnail_path, version="1.0"):
+    tile_manager, victim_manager = _managers()
+    return WorldBundle.compile(world_path, version, ANSWER, tile_manager,
+                               victim_manager, thumbnail_path)
+
+
+def test_bundle_path(world):
+    world_path, _ = world
+    assert WorldBundle.get_bundle_path(world_path) == os.path.join(
+        os.path.dirname(world_path), ".bundles", "test_world")
+
+
+def test_compile_and_load_round_trip(world):
+    world_path, thumbnail_path = world
+    compiled = _compile(world_path, thumbnail_path)
+    bundle = WorldBundle.load(world_path, "1.0")
+    assert bundle is not None
+
+    tile_manager, victim_manager = _managers()
+    for b in (compiled, bundle):
+        assert b.answer.tolist() == ANSWER
+        assert b.rooms.tolist() == tile_manager.rooms.tolist()
+        assert b.start_geometry == tile_manager.start_geometry
+        assert b.start_bounds.tolist() == pytest.approx(
+            [-0.54, -0.54, -0.42, -0.42, -0.48, -0.03, -0.48])
+        assert len(b.checkpoint_bounds) == 2
+        assert b.checkpoint_bounds[1].tolist()[:4] == [0.3, 0.0, 0.42, 0.12]
+        assert len(b.swamp_bounds) == 1
+        assert b.swamp_bounds[0].tolist() == pytest.approx(
+            [0.6, 0.6, 0.72, 0.72, 0.66, -0.03, 0.66])
+        assert b.victim_signs.tolist() == [[0.1, 0.05, 0.2, 1.0, 0.0, 0.0]]
+        assert b.hazard_signs[:, :3].tolist() == [[0.3, 0.05, 0.4],
+                                                  [0.5, 0.05, 0.6]]
+
+    exported = os.path.join(os.path.dirname(world_path), "exported.png")
+    bundle.export_thumbnail(exported)
+    with open(exported, 'rb') as f:
+        assert f.read() == b"png"
+
+
+def test_load_without_bundle(world):
+    world_path, _ = world
+    assert WorldBundle.load(world_path, "1.0") is None
+
+
+def test_world_edit_invalidates_bundle(world):
+    world_path, thumbnail_path = world
+    _compile(world_path, thumbnail_path)
+    with open(world_path, 'a') as f:
+        f.write("Viewpoint {}\n")
+    assert WorldBundle.load(world_path, "1.0") is None
+
+    # Recompiling makes it valid again
+    _compile(world_path, thumbnail_path)
+    assert WorldBundle.load(world_path, "1.0") is not None
+
+
+def test_erebus_version_invalidates_bundle(world):
+    world_path, thumbnail_path = world
+    _compile(world_path, thumbnail_path, version="1.0")
+    assert WorldBundle.load(world_path, "1.1") is None
+
+
+def test_bundle_version_invalidates_bundle(world, monkeypatch):
+    world_path, thumbnail_path = world
+    _compile(world_path, thumbnail_path)
+    monkeypatch.setattr(WorldBundle, "VERSION", WorldBundle.VERSION + 1)
+    assert WorldBundle.load(world_path, "1.0") is None
+
+
+def test_incomplete_manifest_is_ignored(world):
+    world_path, thumbnail_path = world
+    _compile(world_path, thumbnail_path)
+    manifest_path = os.path.join(WorldBundle.get_bundle_path(world_path),
+                                 WorldBundle._MANIFEST)
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+    del manifest["start_geometry"]
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f)
+    assert WorldBundle.load(world_path, "1.0") is None
+
+
+def test_unwritable_bundle_still_compiles(world, monkeypatch):
+    world_path, thumbnail_path = world
+
+    def fail(*args, **kwargs):
+        raise OSError("read only")
+
+    monkeypatch.setattr(os, "makedirs", fail)
+    bundle = _compile(world_path, thumbnail_path)
+    assert bundle.answer.tolist() == ANSWER
+    assert WorldBundle.load(world_path, "1.0") is None
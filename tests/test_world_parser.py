@@ -0,0 +1,115 @@
+"""Tests for the offline .wbt world parser's special tile bounds"""
+
+import os
+
+import pytest
+
+from WorldParser import World
+
+WORLDS_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "game",
+                          "worlds")
+
+WORLD = """#VRML_SIM R2023b utf8
+WorldInfo {
+}
+DEF CHECKPOINTBOUNDS Group {
+  children [
+    DEF boundary Group {
+      children [
+        DEF checkpoint0min Transform {
+          translation 0.1 -0.03 0.2
+        }
+        DEF checkpoint0max Transform {
+          translation 0.22 -0.03 0.32 # bounds max
+        }
+      ]
+    }
+    DEF boundary Group {
+      children [
+        DEF checkpoint1min Transform {
+          translation -1e-1 -0.03 -0.5
+        }
+        DEF checkpoint1max Transform {
+          translation 0.02 -0.03 -0.38
+        }
+      ]
+    }
+  ]
+}
+DEF SWAMPBOUNDS Group {
+  children [
+    DEF boundary Group {
+      children [
+        DEF swamp0min Transform {
+          translation 0.3 -0.03 0.3
+        }
+      ]
+    }
+  ]
+}
+DEF TRAPBOUNDS Group {
+  children [
+    DEF boundary Group {
+      children [
+        DEF trap0min Transform {
+        }
+        DEF trap0max Transform {
+          translation 0.12 -0.03 0.12
+        }
+      ]
+    }
+  ]
+}
+"""
+
+
+@pytest.fixture
+def world(tmp_path):
+    path = tmp_path / "bounds.wbt"
+    path.write_text(WORLD)
+    return World(str(path))
+
+
+def test_bounds(world):
+    assert world.get_bounds("checkpoint") == [
+        ([0.1, -0.03, 0.2], [0.22, -0.03, 0.32]),
+        ([-0.1, -0.03, -0.5], [0.02, -0.03, -0.38]),
+    ]
+
+
+def test_bounds_missing_node_skipped(world):
+    # swamp0max doesn't exist
+    assert world.get_bounds("swamp") == []
+
+
+def test_bounds_default_translation(world):
+    assert world.get_bounds("trap") == [
+        ([0.0, 0.0, 0.0], [0.12, -0.03, 0.12])]
+
+
+def test_bounds_missing_group(world):
+    assert world.get_bounds("start") == []
+
+
+def test_world_bounds():
+    world = World(os.path.join(WORLDS_DIR, "world1.wbt"))
+    assert world.get_bounds("start") == [
+        ([-0.54, -0.03, -0.54], [-0.42, -0.03, -0.42])]
+    assert world.get_bounds("trap") == [
+        ([-0.18, -0.03, -0.54], [-0.06, -0.03, -0.42])]
+    assert len(world.get_bounds("checkpoint")) == 1
+    assert len(world.get_bounds("swamp")) == 1
+
+
+@pytest.mark.parametrize("world_file", sorted(
+    f for f in os.listdir(WORLDS_DIR) if f.endswith(".wbt")))
+def test_every_bound_has_min_and_max(world_file):
+    path = os.path.join(WORLDS_DIR, world_file)
+    world = World(path)
+    with open(path, 'r', encoding="utf-8") as f:
+        text = f.read()
+    for bound_type in World.BOUND_TYPES:
+        bounds = world.get_bounds(bound_type)
+        assert len(bounds) == text.count(f"DEF {bound_type}") // 2
+        for low, high in bounds:
+            assert len(low) == len(high) == 3